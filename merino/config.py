@@ -5,22 +5,50 @@ from dynaconf import Dynaconf, Validator
 _validators = [
     Validator("logging.level", is_in=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]),
     Validator("logging.format", is_in=["mozlog", "pretty"]),
+    Validator("logging.queue_size", is_type_of=int, gte=0),
+    Validator("logging.suggest_sample_rate", gte=0, lte=1),
+    Validator(
+        "logging.suggest_sample_rates",
+        is_type_of=dict,
+        condition=lambda rates: all(0 <= rate <= 1 for rate in rates.values()),
+    ),
     Validator("metrics.host", is_type_of=str),
     Validator("metrics.port", gte=0, is_type_of=int),
     Validator("metrics.dev_logger", is_type_of=bool),
+    Validator("metrics.record_calls", is_type_of=bool),
+    Validator("metrics.max_datagram_size", is_type_of=int, gte=0),
+    Validator("metrics.flush_interval_sec", gte=0),
+    Validator("metrics.flush_threshold", is_type_of=int, gt=0),
+    Validator("metrics.aggregate_counters", is_type_of=bool),
+    Validator(
+        "metrics.sample_rates",
+        is_type_of=dict,
+        condition=lambda rates: all(0 < rate <= 1 for rate in rates.values()),
+    ),
     Validator("deployment.canary", is_type_of=bool),
+    Validator("location.cache_max_size", is_type_of=int, gte=0),
+    Validator("location.cache_ttl_sec", gte=0),
+    Validator("user_agent.cache_max_size", is_type_of=int, gte=0),
     Validator("providers.accuweather.enabled_by_default", is_type_of=bool),
     # Set the upper bound of query timeout to 5 seconds as we don't want Merino
     # to wait for responses from Accuweather indefinitely.
     Validator(
         "providers.accuweather.query_timeout_sec", is_type_of=float, gte=0, lte=5.0
     ),
+    Validator("providers.accuweather.max_connections", is_type_of=int, gt=0),
+    Validator("providers.accuweather.max_keepalive_connections", is_type_of=int, gte=0),
+    Validator("providers.accuweather.cache_max_size", is_type_of=int, gte=0),
+    Validator("providers.accuweather.cache_ttl_location_sec", gte=0),
+    Validator("providers.accuweather.cache_ttl_current_conditions_sec", gte=0),
+    Validator("providers.accuweather.cache_ttl_forecast_sec", gte=0),
     Validator("providers.adm.enabled_by_default", is_type_of=bool),
     Validator("providers.adm.cron_interval_sec", gt=0),
     Validator("providers.adm.resync_interval_sec", gt=0),
     Validator("providers.adm.score", gte=0, lte=1),
     Validator("providers.adm.backend", is_in=["remote-settings", "test"]),
     Validator("providers.adm.score_wikipedia", gte=0, lte=1),
+    Validator("providers.adm.snapshot_path", is_type_of=str),
+    Validator("providers.top_picks.snapshot_path", is_type_of=str),
     Validator("providers.wikifruit.enabled_by_default", is_type_of=bool),
     # Since Firefox will time out the request to Merino if it takes longer than 200ms,
     # the default query timeout of Merino should not be greater than that 200ms.
@@ -39,6 +67,18 @@ _validators = [
         lte=1.0,
         env=["testing", "development"],
     ),
+    Validator("runtime.query_budget_sec", is_type_of=float, gte=0),
+    Validator("runtime.max_data_age_sec", gte=0),
+    Validator("runtime.batch_max_queries", is_type_of=int, gte=0),
+    Validator("runtime.batch_max_concurrency", is_type_of=int, gte=1),
+    Validator("runtime.response_cache_max_size", is_type_of=int, gte=0),
+    Validator("runtime.response_cache_ttl_sec", gte=0),
+    Validator("remote_settings.http2", is_type_of=bool),
+    Validator("remote_settings.max_connections", is_type_of=int, gt=0),
+    Validator("remote_settings.max_keepalive_connections", is_type_of=int, gte=0),
+    Validator("remote_settings.max_concurrent_fetches", is_type_of=int, gt=0),
+    Validator("runtime.fused_middleware", is_type_of=bool),
+    Validator("runtime.workers", is_type_of=int, gte=1),
     Validator("sentry.mode", is_in=["disabled", "release", "debug"]),
     Validator("sentry.env", is_in=["prod", "stage", "dev"]),
     Validator("sentry.traces_sample_rate", gte=0, lte=1),
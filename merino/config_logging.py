@@ -3,15 +3,32 @@ import sys
 from logging.config import dictConfig
 
 from merino.config import settings
+from merino.utils.queue_logging import start_queue_logging, stop_queue_logging
+
+# The loggers configured with the console handler.
+LOGGERS: list[str] = ["merino", "request.summary", "web.suggest.request"]
 
 
 def configure_logging() -> None:
     """Configure logging with MozLog."""
+    # Only the selected console handler is declared, as `dictConfig()` builds all
+    # the declared ones, e.g. it'd import `rich.logging` even for MozLog.
     match settings.logging.format:
         case "mozlog":
             handler = ["console-mozlog"]
+            console_handler = {
+                "level": settings.logging.level,
+                "class": "logging.StreamHandler",
+                "formatter": "json",
+                "stream": sys.stdout,
+            }
         case "pretty":
             handler = ["console-pretty"]
+            console_handler = {
+                "level": settings.logging.level,
+                "class": "rich.logging.RichHandler",
+                "formatter": "json",
+            }
         case _:
             raise ValueError(
                 f"Invalid log format: {settings.logging.format}."
@@ -21,6 +38,8 @@ def configure_logging() -> None:
     if settings.current_env.lower() == "production" and handler != ["console-mozlog"]:
         raise ValueError("Log format must be 'mozlog' in production")
 
+    # Stop the background thread (if any) writing to the handlers being replaced.
+    stop_queue_logging()
     dictConfig(
         {
             "version": 1,
@@ -34,17 +53,7 @@ def configure_logging() -> None:
                 },
             },
             "handlers": {
-                "console-mozlog": {
-                    "level": settings.logging.level,
-                    "class": "logging.StreamHandler",
-                    "formatter": "json",
-                    "stream": sys.stdout,
-                },
-                "console-pretty": {
-                    "level": settings.logging.level,
-                    "class": "rich.logging.RichHandler",
-                    "formatter": "json",
-                },
+                handler[0]: console_handler,
                 "uvicorn-error-handler": {
                     "level": "ERROR",
                     "class": "logging.StreamHandler",
@@ -73,3 +82,5 @@ def configure_logging() -> None:
             },
         }
     )
+    if settings.logging.queue_size > 0:
+        start_queue_logging(LOGGERS, settings.logging.queue_size)
@@ -1,17 +1,20 @@
 """Sentry Configuration"""
 
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
-from sentry_sdk.integrations.starlette import StarletteIntegration
-
 from merino.config import settings
 
 
 def configure_sentry() -> None:  # pragma: no cover
-    """Configure and initialize Sentry integration."""
+    """Configure and initialize Sentry integration.
+
+    The Sentry SDK is only imported when it's enabled.
+    """
     if settings.sentry.mode == "disabled":
         return
 
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+    from sentry_sdk.integrations.starlette import StarletteIntegration
+
     sentry_sdk.init(
         dsn=settings.sentry.dsn,
         integrations=[
@@ -5,3 +5,9 @@ class InvalidProviderError(Exception):
     """Raised when an unknown provider encountered."""
 
     pass
+
+
+class InvalidSnapshotError(Exception):
+    """Raised when a snapshot file is malformed or incompatible."""
+
+    pass
@@ -3,6 +3,7 @@ import hashlib
 import logging
 from contextvars import ContextVar
 from enum import Enum
+from functools import cache
 from random import randbytes
 from typing import Any, Callable
 
@@ -53,9 +54,14 @@ class FeatureFlag(BaseModel):
 FeatureFlagsConfigurations = dict[str, FeatureFlag]
 FeatureFlagsDecisions = dict[str, bool]
 
-# Load the dynaconf configuration and parse it into pydantic models once and
-# then use it as the default value for `flags` in `FeatureFlags`.
-_DYNACONF_FLAGS = parse_obj_as(FeatureFlagsConfigurations, _dynaconf_loader())
+
+@cache
+def get_dynaconf_flags() -> FeatureFlagsConfigurations:
+    """Load the dynaconf configuration and parse it into pydantic models once, upon
+    the first call rather than at import time, then use it as the default value for
+    `flags` in `FeatureFlags`.
+    """
+    return parse_obj_as(FeatureFlagsConfigurations, _dynaconf_loader())
 
 
 @decorator
@@ -123,7 +129,7 @@ class FeatureFlags:
     def __init__(self, flags: dict | None = None) -> None:
         """Initialize feature flags."""
         if flags is None:
-            self.flags = _DYNACONF_FLAGS
+            self.flags = get_dynaconf_flags()
         else:
             self.flags = parse_obj_as(FeatureFlagsConfigurations, flags)
 
@@ -1,4 +1,6 @@
 """App startup point"""
+import asyncio
+
 from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI, status
 from fastapi.encoders import jsonable_encoder
@@ -7,10 +9,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from merino import providers
+from merino.config import settings
 from merino.config_logging import configure_logging
 from merino.config_sentry import configure_sentry
+from merino.featureflags import get_dynaconf_flags
 from merino.metrics import configure_metrics, get_metrics_client
-from merino.middleware import featureflags, geolocation, logging, metrics, user_agent
+from merino.middleware import (
+    featureflags,
+    fused,
+    geolocation,
+    logging,
+    metrics,
+    user_agent,
+)
+from merino.utils import user_agent_parsing
+from merino.utils.queue_logging import stop_queue_logging
 from merino.web import api_v1, dockerflow
 
 app = FastAPI()
@@ -24,16 +37,32 @@ async def startup_configuration() -> None:
     await configure_metrics()
 
 
+def preload() -> None:
+    """Load what's deferred at import time but needed by requests, so that the first
+    requests don't pay for it.
+    """
+    get_dynaconf_flags()
+    geolocation.get_reader()
+    user_agent_parsing.get_parser()
+
+
 @app.on_event("startup")
 async def startup_providers() -> None:
     """Run tasks at application startup."""
-    await providers.init_providers()
+    if providers.preloaded:
+        # Forked by `merino.prefork`, which already loaded the data.
+        await providers.resume_providers()
+        return
+    # Preload in a thread while providers are waiting for their data.
+    await asyncio.gather(providers.init_providers(), asyncio.to_thread(preload))
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
     """Clean up for the application shutdown."""
+    await providers.shutdown_providers()
     await get_metrics_client().close()
+    stop_queue_logging()
 
 
 @app.exception_handler(RequestValidationError)
@@ -47,19 +76,23 @@ async def validation_exception_handler(_, exc) -> JSONResponse:
 
 # Note: the order of the following middleware registration matters.
 # Specifically, `LoggingMiddleware` should be added after `CorrelationIdMiddleware` and
-# `GeolocationMiddleware`.
+# `GeolocationMiddleware`. `FusedMiddleware` does the work of all the others but
+# `CORSMiddleware` in one pass.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=False,
     allow_methods=["GET", "OPTIONS", "HEAD"],
 )
-app.add_middleware(metrics.MetricsMiddleware)
-app.add_middleware(CorrelationIdMiddleware)
-app.add_middleware(featureflags.FeatureFlagsMiddleware)
-app.add_middleware(geolocation.GeolocationMiddleware)
-app.add_middleware(user_agent.UserAgentMiddleware)
-app.add_middleware(logging.LoggingMiddleware)
+if settings.runtime.fused_middleware:
+    app.add_middleware(fused.FusedMiddleware)
+else:
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.add_middleware(CorrelationIdMiddleware)
+    app.add_middleware(featureflags.FeatureFlagsMiddleware)
+    app.add_middleware(geolocation.GeolocationMiddleware)
+    app.add_middleware(user_agent.UserAgentMiddleware)
+    app.add_middleware(logging.LoggingMiddleware)
 
 app.include_router(dockerflow.router)
 app.include_router(api_v1.router, prefix="/api/v1")
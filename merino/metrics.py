@@ -1,10 +1,23 @@
 """Client class for recording and sending StatsD metrics."""
 
+import asyncio
 import logging
 from functools import cache
-from typing import Any, Callable, Concatenate, Final, Mapping, ParamSpec, TypeVar
+from random import random
+from typing import (
+    Any,
+    Callable,
+    Concatenate,
+    Final,
+    Iterator,
+    Mapping,
+    Optional,
+    ParamSpec,
+    TypeVar,
+)
 
 import aiodogstatsd
+from aiodogstatsd import protocol, typedefs
 from wrapt import decorator
 
 from merino.config import settings
@@ -45,6 +58,10 @@ SUPPORTED_METHODS: Final[list[str]] = [
 # Prefix for the tags for feature flags
 FLAGS_PREFIX: Final[str] = "feature_flag"
 
+# Whether to keep track of all calls made to metrics clients in `Client.calls`.
+# It's only meant for introspection in tests and development.
+RECORD_CALLS: bool = settings.metrics.record_calls
+
 
 def feature_flags_as_tags(feature_flags: FeatureFlags) -> MetricTags:
     """Return a representation of feature flags decisions."""
@@ -60,14 +77,14 @@ def add_feature_flags(
 ) -> Any:
     """Add feature flag decisions as tags when recording metrics."""
     # Tags added manually to the metrics client call
-    tags = kwargs.pop("tags", {})
+    tags = kwargs.pop("tags", None)
 
-    # Generate tags based on the recorded feature flag decisions
-    feature_flags_tags = feature_flags_as_tags(instance.feature_flags)
+    # Tags based on the recorded feature flag decisions
+    feature_flags_tags = instance.feature_flags_tags()
 
     # The order is important here. Feature flag tags added manually take
     # precedence over the auto-generated ones.
-    kwargs["tags"] = {**feature_flags_tags, **tags}
+    kwargs["tags"] = {**feature_flags_tags, **tags} if tags else feature_flags_tags
 
     return wrapped_method(*args, **kwargs)
 
@@ -94,12 +111,13 @@ class ClientMeta(type):
             ) -> R:
                 """Look up the correct method of the StatsD client call it."""
                 # Keep track of all calls made to the metrics client
-                call: MetricCall = {
-                    "method_name": method_name,
-                    "args": method_args,
-                    "kwargs": method_kwargs,
-                }
-                instance.calls.append(call)
+                if RECORD_CALLS:
+                    call: MetricCall = {
+                        "method_name": method_name,
+                        "args": method_args,
+                        "kwargs": method_kwargs,
+                    }
+                    instance.calls.append(call)
 
                 # Look up the method on the StatsD client on the instance
                 method: Callable[..., R] = getattr(instance.statsd_client, method_name)
@@ -121,6 +139,8 @@ class Client(metaclass=ClientMeta):
     statsd_client: aiodogstatsd.Client
     feature_flags: FeatureFlags
     calls: MetricCalls
+    _feature_flags_tags: MetricTags
+    _tagged_decisions: int
 
     def __init__(
         self, statsd_client: aiodogstatsd.Client, feature_flags: FeatureFlags
@@ -129,6 +149,20 @@ class Client(metaclass=ClientMeta):
         self.statsd_client = statsd_client
         self.feature_flags = feature_flags
         self.calls = []
+        self._feature_flags_tags = {}
+        self._tagged_decisions = 0
+
+    def feature_flags_tags(self) -> MetricTags:
+        """Return the feature flag decisions as tags.
+
+        Decisions are only ever added to `FeatureFlags.decisions`, so the tags are
+        built once and only rebuilt after a new decision is recorded, rather than
+        on every metric call. Callers must not mutate the returned tags.
+        """
+        if len(self.feature_flags.decisions) != self._tagged_decisions:
+            self._feature_flags_tags = feature_flags_as_tags(self.feature_flags)
+            self._tagged_decisions = len(self.feature_flags.decisions)
+        return self._feature_flags_tags
 
     def __getattr__(self, attr_name: str):
         """Raise an exception when an unsupported attribute is requested."""
@@ -138,6 +172,158 @@ class Client(metaclass=ClientMeta):
         )
 
 
+class BufferedStatsdClient(aiodogstatsd.Client):
+    """A StatsD client that buffers metrics and sends them in batches.
+
+    On top of `aiodogstatsd.Client`, it:
+      - Packs the buffered metrics into as few datagrams as possible, i.e. lines
+        separated by newlines, up to `max_datagram_size` bytes per datagram.
+      - Flushes the buffer every `flush_interval_sec` seconds, or as soon as it
+        holds `flush_threshold` metrics, rather than upon every metric.
+      - Optionally aggregates counters in memory, so that all the increments of a
+        counter with the same tags are sent as a single metric per flush.
+      - Applies per-metric sample rates to the metrics recorded without an
+        explicit sample rate.
+
+    Metrics other than aggregated counters still go through
+    `aiodogstatsd.Client._report()` when they're recorded.
+
+    Note that it overrides internals of `aiodogstatsd.Client`, i.e. `_report()`,
+    `_listen_and_send()` and `_pending_queue`, so aiodogstatsd is pinned to an
+    exact version, and `test_buffered_client_udp` checks the flushes end to end.
+    """
+
+    _max_datagram_size: int
+    _flush_interval_sec: float
+    _flush_threshold: int
+    _aggregate_counters: bool
+    _sample_rates: Mapping[str, float]
+    _counters: dict[tuple[str, tuple, float], typedefs.MValue]
+    _flush_event: Optional[asyncio.Event]
+
+    def __init__(
+        self,
+        *,
+        max_datagram_size: int = 1432,
+        flush_interval_sec: float = 0,
+        flush_threshold: int = 1,
+        aggregate_counters: bool = False,
+        sample_rates: Optional[Mapping[str, float]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+          - `max_datagram_size`: the maximum size (in bytes) of a datagram packing
+            multiple metrics, 0 to send each metric in its own datagram
+          - `flush_interval_sec`: the maximum time (in seconds) metrics are buffered
+          - `flush_threshold`: the number of buffered metrics triggering a flush
+            before the interval elapses
+          - `aggregate_counters`: whether to aggregate counters between flushes
+          - `sample_rates`: sample rates keyed by metric name
+          - `kwargs`: the arguments of `aiodogstatsd.Client`
+        """
+        super().__init__(**kwargs)
+        self._max_datagram_size = max_datagram_size
+        self._flush_interval_sec = flush_interval_sec
+        self._flush_threshold = flush_threshold
+        self._aggregate_counters = aggregate_counters
+        self._sample_rates = sample_rates or {}
+        self._counters = {}
+        self._flush_event = None
+
+    async def connect(self) -> None:
+        """Connect the client and start flushing metrics."""
+        await super().connect()
+        self._flush_event = asyncio.Event()
+
+    async def close(self) -> None:
+        """Flush the buffered metrics and close the client."""
+        if self.connected:
+            self._flush_counters()
+            if self._flush_event is not None:
+                self._flush_event.set()
+        await super().close()
+
+    def _report(
+        self,
+        name: typedefs.MName,
+        type_: typedefs.MType,
+        value: typedefs.MValue,
+        tags: Optional[typedefs.MTags] = None,
+        sample_rate: Optional[typedefs.MSampleRate] = None,
+    ) -> None:
+        sample_rate = sample_rate or self._sample_rates.get(name)
+        if not (self._aggregate_counters and type_ is typedefs.MType.COUNTER):
+            super()._report(name, type_, value, tags, sample_rate)
+        elif self.connected:
+            sample_rate = sample_rate or self._sample_rate
+            if sample_rate != 1 and random() > sample_rate:
+                return
+            key = (name, tuple(tags.items()) if tags else (), sample_rate)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+        if self._flush_event is not None and (
+            self._pending_queue.qsize() + len(self._counters) >= self._flush_threshold
+        ):
+            self._flush_event.set()
+
+    def _flush_counters(self) -> None:
+        """Move the aggregated counters to the queue of metrics to send."""
+        counters, self._counters = self._counters, {}
+        for (name, tags, sample_rate), value in counters.items():
+            metric = protocol.build(
+                name=name,
+                namespace=self._namespace,
+                value=value,
+                type_=typedefs.MType.COUNTER,
+                tags=dict(self._constant_tags, **dict(tags)),
+                sample_rate=sample_rate,
+            )
+            try:
+                self._pending_queue.put_nowait(metric)
+            except asyncio.QueueFull:
+                pass
+
+    def _pack(self, first: bytes) -> Iterator[bytes]:
+        """Pack the given metric and all the queued ones into datagrams."""
+        batch, size = [first], len(first)
+        while not self._pending_queue.empty():
+            metric = self._pending_queue.get_nowait()
+            if size + 1 + len(metric) > self._max_datagram_size:
+                yield b"\n".join(batch)
+                batch, size = [], -1
+            batch.append(metric)
+            size += 1 + len(metric)
+        yield b"\n".join(batch)
+
+    async def _listen_and_send(self) -> None:
+        # Wait for the flush interval unless the buffer fills up first. Upon
+        # closing, send whatever is left right away.
+        if self.connected and self._flush_interval_sec > 0 and self._flush_event:
+            try:
+                await asyncio.wait_for(
+                    self._flush_event.wait(), timeout=self._flush_interval_sec
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+        self._flush_counters()
+
+        try:
+            first = await asyncio.wait_for(
+                self._pending_queue.get(), timeout=self._read_timeout
+            )
+        except asyncio.TimeoutError:
+            return
+
+        if self._max_datagram_size <= 0:
+            self._protocol.send(first)
+            return
+        for datagram in self._pack(first):
+            self._protocol.send(datagram)
+
+
 @cache
 def get_metrics_client() -> aiodogstatsd.Client:
     """Instantiate and memoize the StatsD client."""
@@ -146,11 +332,16 @@ def get_metrics_client() -> aiodogstatsd.Client:
         "deployment.canary": int(settings.deployment.canary),
     }
 
-    return aiodogstatsd.Client(
+    return BufferedStatsdClient(
         host=settings.metrics.host,
         port=settings.metrics.port,
         namespace="merino",
         constant_tags=constant_tags,
+        max_datagram_size=settings.metrics.max_datagram_size,
+        flush_interval_sec=settings.metrics.flush_interval_sec,
+        flush_threshold=settings.metrics.flush_threshold,
+        aggregate_counters=settings.metrics.aggregate_counters,
+        sample_rates=settings.metrics.sample_rates,
     )
 
 
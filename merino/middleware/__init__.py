@@ -1,5 +1,14 @@
 """Merino middlewares"""
+import re
 from enum import Enum, unique
+from typing import Pattern
+
+from starlette.types import Scope
+
+# The path pattern of the endpoints that consume the request enrichments, i.e.
+# `ScopeKey.USER_AGENT`, `ScopeKey.GEOLOCATION`, and the session ID used by feature
+# flags. Other endpoints, such as the Dockerflow probes, skip the enrichment steps.
+ENRICHED_PATH_PATTERN: Pattern = re.compile(r"/api/v[1-9]\d*/suggest(/batch)?$")
 
 
 @unique
@@ -10,3 +19,11 @@ class ScopeKey(str, Enum):
     USER_AGENT = "merino_user_agent"
     FEATURE_FLAGS: str = "merino_feature_flags"
     METRICS_CLIENT: str = "merino_metrics_client"
+
+
+def needs_enrichment(scope: Scope) -> bool:
+    """Return whether the enrichment middlewares should process a request."""
+    return (
+        scope["type"] == "http"
+        and ENRICHED_PATH_PATTERN.match(scope.get("path", "")) is not None
+    )
@@ -3,11 +3,15 @@ from starlette.requests import Request
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 from merino.featureflags import session_id_context
+from merino.middleware import needs_enrichment
 
 
 class FeatureFlagsMiddleware:
     """Sets a ContextVar for session_id so that it can be used
     to consistently bucket flags within a search session.
+
+    Only requests to the endpoints consuming it are processed, see
+    `needs_enrichment()`.
     """
 
     def __init__(self, app: ASGIApp) -> None:
@@ -16,7 +20,7 @@ class FeatureFlagsMiddleware:
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Insert session id before handing request"""
-        if scope["type"] != "http":
+        if not needs_enrichment(scope):
             await self.app(scope, receive, send)
             return
 
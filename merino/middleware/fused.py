@@ -0,0 +1,133 @@
+"""A middleware that does the work of all the Merino middlewares in a single pass.
+
+It's a drop-in replacement for the following middleware stack and populates the
+same `ScopeKey` entries, context variables, response headers, metrics, and logs:
+
+  - `LoggingMiddleware`
+  - `UserAgentMiddleware`
+  - `GeolocationMiddleware`
+  - `FeatureFlagsMiddleware`
+  - `CorrelationIdMiddleware` (with its default settings)
+  - `MetricsMiddleware`
+
+Unlike the stack, it parses the headers and the query string of a request only
+once and it doesn't add a coroutine frame per middleware to each request. Like the
+stack, it only populates the user agent, the geolocation, and the session ID for the
+endpoints consuming them, see `needs_enrichment()`.
+"""
+import logging
+from asyncio import get_event_loop
+from http import HTTPStatus
+from typing import Final
+from uuid import uuid4
+
+from asgi_correlation_id.context import correlation_id
+from asgi_correlation_id.extensions.sentry import get_sentry_extension
+from asgi_correlation_id.middleware import FAILED_VALIDATION_MESSAGE, is_valid_uuid4
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from merino.config import settings
+from merino.featureflags import FeatureFlags, session_id_context
+from merino.metrics import Client, get_metrics_client
+from merino.middleware import ScopeKey, needs_enrichment
+from merino.middleware.geolocation import locate
+from merino.middleware.logging import log_request
+from merino.middleware.metrics import record_response_metrics
+from merino.middleware.user_agent import get_user_agent
+
+# The header of the request ID, see `CorrelationIdMiddleware`.
+REQUEST_ID_HEADER: Final[str] = "X-Request-ID"
+
+# Log through the logger of `CorrelationIdMiddleware` for the same outputs.
+correlation_id_logger = logging.getLogger("asgi_correlation_id")
+
+
+def _no_sentry_extension(correlation_id: str) -> None:
+    """Do nothing with the correlation ID."""
+
+
+class FusedMiddleware:
+    """An ASGI middleware that replaces the Merino middleware stack."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware and store the ASGI app instance."""
+        self.app = app
+        # Setting the transaction ID of Sentry is a no-op when it's disabled, in
+        # which case the Sentry SDK isn't imported at all.
+        self.sentry_extension = (
+            _no_sentry_extension
+            if settings.sentry.mode == "disabled"
+            else get_sentry_extension()
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Populate the request scope and context, then record metrics and logs
+        upon the response.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # `Request` caches the parsed headers and query string, so that they're
+        # shared by all the steps below.
+        request = Request(scope=scope)
+        headers = request.headers
+
+        if needs_enrichment(scope):
+            scope[ScopeKey.USER_AGENT] = get_user_agent(headers.get("User-Agent", ""))
+            scope[ScopeKey.GEOLOCATION] = locate(request)
+            session_id_context.set(request.query_params.get("sid"))
+
+        request_id = headers.get(REQUEST_ID_HEADER)
+        if not request_id:
+            request_id = uuid4().hex
+        elif not is_valid_uuid4(request_id):
+            correlation_id_logger.warning(FAILED_VALIDATION_MESSAGE, request_id)
+            request_id = uuid4().hex
+        correlation_id.set(request_id)
+        self.sentry_extension(request_id)
+
+        feature_flags = FeatureFlags()
+        client = Client(statsd_client=get_metrics_client(), feature_flags=feature_flags)
+        scope[ScopeKey.FEATURE_FLAGS] = feature_flags
+        scope[ScopeKey.METRICS_CLIENT] = client
+
+        loop = get_event_loop()
+        started_at = loop.time()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration = (loop.time() - started_at) * 1000
+                record_response_metrics(
+                    client,
+                    request.method,
+                    request.url.path,
+                    message["status"],
+                    duration,
+                )
+
+                if rid := correlation_id.get():
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers.append(REQUEST_ID_HEADER, rid)
+                    response_headers.append(
+                        "Access-Control-Expose-Headers", REQUEST_ID_HEADER
+                    )
+
+                log_request(request, message)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            duration = (loop.time() - started_at) * 1000
+            record_response_metrics(
+                client,
+                request.method,
+                request.url.path,
+                HTTPStatus.INTERNAL_SERVER_ERROR.value,
+                duration,
+            )
+            raise
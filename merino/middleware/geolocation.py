@@ -1,5 +1,6 @@
 """The middleware that parses geolocation from the client IP address."""
 import logging
+from functools import cache
 from typing import Optional
 
 import geoip2.database
@@ -9,15 +10,23 @@ from starlette.requests import Request
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 from merino.config import settings
-from merino.middleware import ScopeKey
+from merino.metrics import get_metrics_client
+from merino.middleware import ScopeKey, needs_enrichment
+from merino.utils.cache import TTLCache
 
 CLIENT_IP_OVERRIDE: str = settings.location.client_ip_override
-
-reader = geoip2.database.Reader(settings.location.maxmind_database)
+CACHE_MAX_SIZE: int = settings.location.cache_max_size
+CACHE_TTL_SEC: float = settings.location.cache_ttl_sec
 
 logger = logging.getLogger(__name__)
 
 
+@cache
+def get_reader() -> geoip2.database.Reader:
+    """Open the MaxMind database upon the first call rather than at import time."""
+    return geoip2.database.Reader(settings.location.maxmind_database)
+
+
 class Location(BaseModel):
     """Data model for geolocation."""
 
@@ -28,12 +37,51 @@ class Location(BaseModel):
     postal_code: Optional[str] = None
 
 
+# Locations looked up by IP address. Firefox sends a request per keystroke, so the
+# same addresses repeat a lot within a search session. Cached `Location`s are
+# shared across requests and must not be mutated.
+location_cache: TTLCache[str, Location] = TTLCache(CACHE_MAX_SIZE, CACHE_TTL_SEC)
+
+
+def locate(request: Request) -> Location:
+    """Look up the geolocation of the client of an HTTP request."""
+    ip_address = CLIENT_IP_OVERRIDE or (
+        request.client.host or "" if request.client else ""
+    )
+    if (location := location_cache.get(ip_address)) is not None:
+        get_metrics_client().increment("geolocation.cache.hit")
+        return location
+
+    try:
+        record = get_reader().city(ip_address)
+    except ValueError:
+        logger.warning("Invalid IP address for geolocation parsing")
+        # Invalid addresses bypass the cache, so that they're always logged.
+        return Location()
+    except AddressNotFoundError:
+        location = Location()
+    else:
+        location = Location(
+            country=record.country.iso_code,
+            region=record.subdivisions[0].iso_code if record.subdivisions else None,
+            city=record.city.names.get("en"),
+            dma=record.location.metro_code,
+            postal_code=record.postal.code if record.postal else None,
+        )
+
+    if location_cache.max_size > 0:
+        get_metrics_client().increment("geolocation.cache.miss")
+        location_cache.set(ip_address, location)
+    return location
+
+
 class GeolocationMiddleware:
     """An ASGI middleware to parse and populate geolocation from client's IP
     address.
 
     The geolocation result `Location` (if any) is stored in
-    `scope[ScopeKey.GEOLOCATION]`.
+    `scope[ScopeKey.GEOLOCATION]`. Only requests to the endpoints consuming it are
+    processed, see `needs_enrichment()`.
     """
 
     def __init__(self, app: ASGIApp) -> None:
@@ -44,33 +92,11 @@ class GeolocationMiddleware:
         """Parse geolocation through client's IP address and store the result
         to `scope`.
         """
-        if scope["type"] != "http":
+        if not needs_enrichment(scope):
             await self.app(scope, receive, send)
             return
 
-        request = Request(scope=scope)
-        record = None
-        ip_address = CLIENT_IP_OVERRIDE or (
-            request.client.host or "" if request.client else ""
-        )
-        try:
-            record = reader.city(ip_address)
-        except ValueError:
-            logger.warning("Invalid IP address for geolocation parsing")
-        except AddressNotFoundError:
-            pass
-
-        scope[ScopeKey.GEOLOCATION] = (
-            Location(
-                country=record.country.iso_code,
-                region=record.subdivisions[0].iso_code if record.subdivisions else None,
-                city=record.city.names.get("en"),
-                dma=record.location.metro_code,
-                postal_code=record.postal.code if record.postal else None,
-            )
-            if record
-            else Location()
-        )
+        scope[ScopeKey.GEOLOCATION] = locate(Request(scope=scope))
 
         await self.app(scope, receive, send)
         return
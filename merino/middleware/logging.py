@@ -1,16 +1,17 @@
 """The middleware that records various access logs for Merino."""
+import hashlib
 import logging
 import re
 import time
 from datetime import datetime
-from typing import Pattern
+from random import random
+from typing import Any, Optional, Pattern
 
 from starlette.requests import Request
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from merino.config import settings
 from merino.utils.log_data_creators import (
-    RequestSummaryLogDataModel,
-    SuggestLogDataModel,
     create_request_summary_log_data,
     create_suggest_log_data,
 )
@@ -23,6 +24,66 @@ logger = logging.getLogger("request.summary")
 # The path pattern for the suggest API
 PATTERN: Pattern = re.compile(r"/api/v[1-9]\d*/suggest$")
 
+# The sample rate of suggest request logs and its overrides by status code or class
+SUGGEST_SAMPLE_RATE: float = settings.logging.suggest_sample_rate
+SUGGEST_SAMPLE_RATES: dict[str, float] = {
+    str(status).lower(): rate
+    for status, rate in settings.logging.suggest_sample_rates.items()
+}
+
+
+def get_suggest_sample_rate(status: int) -> float:
+    """Return the sample rate of the suggest request logs for a response status,
+    looking up its code, then its class (e.g. "4xx"), then the default rate.
+    """
+    if (rate := SUGGEST_SAMPLE_RATES.get(str(status))) is not None:
+        return rate
+    return SUGGEST_SAMPLE_RATES.get(f"{status // 100}xx", SUGGEST_SAMPLE_RATE)
+
+
+def is_sampled(session_id: Optional[str], sample_rate: float) -> bool:
+    """Decide whether to log a suggest request.
+
+    The decision is deterministic on the session ID, so that all the requests of a
+    session are either logged or skipped for a given rate.
+
+    Args:
+      - `session_id`: the session ID of the request, if any
+      - `sample_rate`: the sample rate between 0 and 1
+    """
+    if sample_rate >= 1:
+        return True
+    if sample_rate <= 0:
+        return False
+    if session_id is None:
+        return random() < sample_rate
+    digest: bytes = hashlib.sha256(session_id.encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64 < sample_rate
+
+
+def log_request(request: Request, message: Message) -> None:
+    """Log a request upon the start of its response.
+
+    Args:
+      - `request`: the request
+      - `message`: the "http.response.start" message of the response
+    """
+    dt: datetime = datetime.fromtimestamp(time.time())
+    if PATTERN.match(request.url.path):
+        sample_rate: float = get_suggest_sample_rate(message["status"])
+        # Decide before building the log data, which is the costly part.
+        if not is_sampled(request.query_params.get("sid"), sample_rate):
+            return
+        suggest_log_data: dict[str, Any] = create_suggest_log_data(
+            request, message, dt, sample_rate
+        )
+        suggest_request_logger.info("", extra=suggest_log_data)
+    else:
+        request_log_data: dict[str, Any] = create_request_summary_log_data(
+            request, message, dt
+        )
+        logger.info("", extra=request_log_data)
+
 
 class LoggingMiddleware:
     """An ASGI middleware for logging."""
@@ -39,18 +100,7 @@ class LoggingMiddleware:
 
         async def send_wrapper(message: Message) -> None:
             if message["type"] == "http.response.start":
-                request = Request(scope=scope)
-                dt: datetime = datetime.fromtimestamp(time.time())
-                if PATTERN.match(request.url.path):
-                    suggest_log_data: SuggestLogDataModel = create_suggest_log_data(
-                        request, message, dt
-                    )
-                    suggest_request_logger.info("", extra=suggest_log_data.dict())
-                else:
-                    request_log_data: RequestSummaryLogDataModel = (
-                        create_request_summary_log_data(request, message, dt)
-                    )
-                    logger.info("", extra=request_log_data.dict())
+                log_request(Request(scope=scope), message)
 
             await send(message)
 
@@ -14,6 +14,35 @@ from merino.middleware import ScopeKey
 logger = logging.getLogger(__name__)
 
 
+@cache
+def build_metric_name(method: str, path: str) -> str:
+    """Build the metric name prefix of an endpoint, e.g. "get.api.v1.suggest"."""
+    return "{}.{}".format(method, path.lower().lstrip("/").replace("/", ".")).lower()
+
+
+def record_response_metrics(
+    client: Client, method: str, path: str, status_code: int, duration: float
+) -> None:
+    """Record the timing and the status code of a response.
+
+    Args:
+      - `client`: the metrics client of the request
+      - `method`: the HTTP method of the request
+      - `path`: the URL path of the request
+      - `status_code`: the status code of the response
+      - `duration`: the time (in milliseconds) taken to start the response
+    """
+    # don't track NOT_FOUND statuses by path.
+    # Instead we will track those within a general `response.status_codes` metric.
+    if status_code != HTTPStatus.NOT_FOUND.value:
+        metric_name = build_metric_name(method, path)
+        client.timing(f"{metric_name}.timing", value=duration)
+        client.increment(f"{metric_name}.status_codes.{status_code}")
+
+    # track all status codes here.
+    client.increment(f"response.status_codes.{status_code}")
+
+
 class MetricsMiddleware:
     """Middleware for instrumenting request level metrics. We currently collect timing
     and status codes for all known paths as well as status codes for all paths (known and unknown).
@@ -53,40 +82,25 @@ class MetricsMiddleware:
         async def send_wrapper(message: Message) -> None:
             if message["type"] == "http.response.start":
                 duration = (loop.time() - started_at) * 1000
-
-                status_code = message["status"]
-                # don't track NOT_FOUND statuses by path.
-                # Instead we will track those within a general `response.status_codes` metric.
-                if status_code != HTTPStatus.NOT_FOUND.value:
-                    metric_name = self._build_metric_name(
-                        request.method, request.url.path
-                    )
-                    client.timing(
-                        f"{metric_name}.timing",
-                        value=duration,
-                    )
-                    client.increment(
-                        f"{metric_name}.status_codes.{status_code}",
-                    )
-
-                # track all status codes here.
-                client.increment(f"response.status_codes.{status_code}")
+                record_response_metrics(
+                    client,
+                    request.method,
+                    request.url.path,
+                    message["status"],
+                    duration,
+                )
 
             await send(message)
 
         try:
             await self.app(scope, receive, send_wrapper)
         except Exception:
-            status_code = HTTPStatus.INTERNAL_SERVER_ERROR.value
             duration = (loop.time() - started_at) * 1000
-            metric_name = self._build_metric_name(request.method, request.url.path)
-            client.timing(f"{metric_name}.timing", value=duration)
-            client.increment(f"{metric_name}.status_codes.{status_code}")
-            client.increment(f"response.status_codes.{status_code}")
+            record_response_metrics(
+                client,
+                request.method,
+                request.url.path,
+                HTTPStatus.INTERNAL_SERVER_ERROR.value,
+                duration,
+            )
             raise
-
-    @cache
-    def _build_metric_name(self, method: str, path: str) -> str:
-        return "{}.{}".format(
-            method, path.lower().lstrip("/").replace("/", ".")
-        ).lower()
@@ -3,13 +3,24 @@
 Note that Merino is a service made for Firefox users, this middleware only
 focuses on Firefox related user agents.
 """
+import math
+from typing import Final
+
 from pydantic import BaseModel
 from starlette.datastructures import Headers
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from merino.middleware import ScopeKey
+from merino.config import settings
+from merino.metrics import get_metrics_client
+from merino.middleware import ScopeKey, needs_enrichment
+from merino.utils.cache import TTLCache
 from merino.utils.user_agent_parsing import parse
 
+CACHE_MAX_SIZE: int = settings.user_agent.cache_max_size
+# Longer "User-Agent" strings are parsed but not cached, so that arbitrary
+# headers can't bloat the cache.
+CACHE_MAX_KEY_LENGTH: Final[int] = 512
+
 
 class UserAgent(BaseModel):
     """Data model for user agent information.
@@ -26,12 +37,32 @@ class UserAgent(BaseModel):
     form_factor: str
 
 
+# Parsed user agents keyed by "User-Agent" string. There are only a few thousand
+# distinct strings in practice and parsing is deterministic, so entries never
+# expire. Cached `UserAgent`s are shared across requests and must not be mutated.
+user_agent_cache: TTLCache[str, UserAgent] = TTLCache(CACHE_MAX_SIZE, math.inf)
+
+
+def get_user_agent(user_agent: str) -> UserAgent:
+    """Parse the value of a "User-Agent" header."""
+    if (parsed := user_agent_cache.get(user_agent)) is not None:
+        get_metrics_client().increment("user_agent.cache.hit")
+        return parsed
+
+    parsed = UserAgent(**parse(user_agent))
+    if user_agent_cache.max_size > 0 and len(user_agent) <= CACHE_MAX_KEY_LENGTH:
+        get_metrics_client().increment("user_agent.cache.miss")
+        user_agent_cache.set(user_agent, parsed)
+    return parsed
+
+
 class UserAgentMiddleware:
     """An ASGI middleware to parse and populate user agent information from
     `User-Agent` header.
 
     The user agent result `UserAgent` (if any) is stored in
-    `scope[ScopeKey.USER_AGENT]`.
+    `scope[ScopeKey.USER_AGENT]`. Only requests to the endpoints consuming it are
+    processed, see `needs_enrichment()`.
     """
 
     def __init__(self, app: ASGIApp) -> None:
@@ -42,13 +73,13 @@ class UserAgentMiddleware:
         """Parse user agent information through "User-Agent" and store the result
         to `scope`.
         """
-        if scope["type"] != "http":
+        if not needs_enrichment(scope):
             await self.app(scope, receive, send)
             return
 
-        ua = parse(Headers(scope=scope).get("User-Agent", ""))
-
-        scope[ScopeKey.USER_AGENT] = UserAgent(**ua)
+        scope[ScopeKey.USER_AGENT] = get_user_agent(
+            Headers(scope=scope).get("User-Agent", "")
+        )
 
         await self.app(scope, receive, send)
         return
@@ -0,0 +1,200 @@
+"""A pre-fork server running Merino in multiple Uvicorn worker processes.
+
+Usage:
+    $ python -m merino.prefork [--host HOST] [--port PORT] [--workers N]
+
+Unlike `uvicorn --workers N`, which spawns fresh interpreters that each load all
+the provider data, the parent process initializes the providers once (e.g. builds
+the adM and Top Picks indexes) and then forks the workers, which share the memory
+pages of the data copy-on-write. As recommended by the `gc` module, garbage
+collection is disabled in the parent and the inherited objects are frozen right
+before forking, so that collections in the workers don't write to (and hence copy)
+those pages.
+
+The workers accept connections on a socket bound by the parent, which replaces
+the workers that exit unexpectedly and forwards termination signals to them. See
+`BaseProvider.resume()` for how providers restart their background work in the
+workers. Unless configured otherwise, the adM snapshot is kept in a temporary
+runtime directory, so that a single worker resyncs adM data for all of them.
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+from typing import Any, Final, NoReturn, Optional
+
+import uvicorn
+
+from merino import providers
+from merino.config import settings
+from merino.config_logging import configure_logging
+from merino.main import app, preload
+from merino.providers.adm import Provider as AdmProvider
+from merino.utils.queue_logging import stop_queue_logging
+
+# The exit status of Uvicorn when the application fails to start up.
+STARTUP_FAILURE: Final[int] = 3
+# The signals forwarded to the workers.
+SIGNALS: Final[set[signal.Signals]] = {signal.SIGINT, signal.SIGTERM}
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(config: uvicorn.Config, sock: socket.socket) -> NoReturn:
+    """Serve requests in a forked worker process until it's signaled to exit.
+
+    Args:
+      - `config`: the Uvicorn configuration
+      - `sock`: the listening socket bound by the parent process
+    """
+    status = 0
+    try:
+        for signum in SIGNALS:
+            signal.signal(signum, signal.SIG_DFL)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, SIGNALS)
+        gc.enable()
+
+        server = uvicorn.Server(config)
+        server.run(sockets=[sock])
+        if not server.started:
+            status = STARTUP_FAILURE
+    except BaseException:
+        logger.exception("Worker process failed")
+        status = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Skip the clean-ups registered by the parent process, e.g. `atexit`.
+        os._exit(status)
+
+
+def fork_worker(config: uvicorn.Config, sock: socket.socket, workers: set[int]) -> None:
+    """Fork a worker process and add it to the given worker process IDs.
+
+    Signals are blocked while forking, so that a worker is either signaled by the
+    parent process or has yet to be forked.
+    """
+    signal.pthread_sigmask(signal.SIG_BLOCK, SIGNALS)
+    try:
+        pid = os.fork()
+        if pid == 0:
+            run_worker(config, sock)
+        workers.add(pid)
+    finally:
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, SIGNALS)
+
+
+def default_snapshot_path(runtime_dir: str) -> None:
+    """Set the adM snapshot path to the runtime directory, unless it's configured.
+
+    Without a snapshot path, every worker would resync adM data from Remote
+    Settings on its own, rebuilding its own copy of the data rather than sharing
+    the one loaded by the parent process.
+
+    Args:
+      - `runtime_dir`: the directory of the files shared by the workers, which is
+        removed upon exit
+    """
+    if not AdmProvider.snapshot_path:
+        AdmProvider.snapshot_path = os.path.join(runtime_dir, "adm.snapshot")
+        logger.info(
+            "Keeping the adM snapshot in the runtime directory",
+            extra={"snapshot_path": AdmProvider.snapshot_path},
+        )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m merino.prefork")
+    parser.add_argument("--host", default="127.0.0.1", help="the address to bind")
+    parser.add_argument("--port", type=int, default=8000, help="the port to bind")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.runtime.workers,
+        help="the number of worker processes (default: runtime.workers)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the pre-fork server with a temporary runtime directory."""
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="merino-") as runtime_dir:
+        exit_status = serve(args, runtime_dir)
+    sys.exit(exit_status)
+
+
+def serve(args: argparse.Namespace, runtime_dir: str) -> int:
+    """Load the provider data, fork the workers, and supervise them until they're
+    all signaled to exit.
+
+    Returns:
+      The exit status of the server.
+    """
+    gc.disable()
+    configure_logging()
+    default_snapshot_path(runtime_dir)
+
+    asyncio.run(providers.preload_providers())
+    preload()
+    # Threads aren't inherited by forked processes, so stop the one writing logs.
+    # Each worker starts its own upon startup.
+    stop_queue_logging()
+
+    config = uvicorn.Config(app, host=args.host, port=args.port, proxy_headers=True)
+    sock = config.bind_socket()
+    workers: set[int] = set()
+    stopping = False
+
+    def stop(signum: int, frame: Any = None) -> None:
+        nonlocal stopping
+
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    for signum in SIGNALS:
+        signal.signal(signum, stop)
+
+    gc.freeze()
+    for _ in range(args.workers):
+        fork_worker(config, sock, workers)
+    logger.info(
+        "Forked worker processes",
+        extra={"workers": sorted(workers), "pid": os.getpid()},
+    )
+
+    exit_status = 0
+    while workers:
+        pid, status = os.wait()
+        workers.discard(pid)
+        if stopping:
+            continue
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        if exit_code == STARTUP_FAILURE:
+            logger.error("Worker process failed to start up, shutting down")
+            exit_status = STARTUP_FAILURE
+            stop(signal.SIGTERM)
+        else:
+            logger.warning(
+                "Worker process exited unexpectedly, replacing it",
+                extra={"pid": pid, "exit code": exit_code},
+            )
+            fork_worker(config, sock, workers)
+
+    sock.close()
+    return exit_status
+
+
+if __name__ == "__main__":
+    main()
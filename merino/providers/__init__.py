@@ -9,14 +9,16 @@ from merino.config import settings
 from merino.exceptions import InvalidProviderError
 from merino.providers.accuweather import Provider as AccuWeatherProvider
 from merino.providers.adm import Provider as AdmProvider
-from merino.providers.adm import TestBackend
+from merino.providers.adm import RemoteSettingsBackend, TestBackend
 from merino.providers.base import BaseProvider
 from merino.providers.top_picks import Provider as TopPicksProvider
 from merino.providers.wiki_fruit import WikiFruitProvider
-from merino.remotesettings import LiveBackend
 
 providers: dict[str, BaseProvider] = {}
 default_providers: list[BaseProvider] = []
+# Whether the providers were initialized by the parent of this worker process, see
+# `preload_providers()`.
+preloaded: bool = False
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,20 @@ class ProviderType(str, Enum):
     WIKI_FRUIT = "wiki_fruit"
 
 
+def create_adm_backend(backend: str) -> RemoteSettingsBackend:
+    """Create the Remote Settings backend of the adM provider.
+
+    Args:
+      - `backend`: either "remote-settings" or "test"
+    """
+    if backend == "remote-settings":
+        # Only import the Remote Settings client (and `kinto_http`) when it's used.
+        from merino.remotesettings import LiveBackend
+
+        return LiveBackend()
+    return TestBackend()
+
+
 async def init_providers() -> None:
     """Initialize all suggestion providers.
 
@@ -49,11 +65,7 @@ async def init_providers() -> None:
                 )
             case ProviderType.ADM:
                 providers["adm"] = AdmProvider(
-                    backend=(
-                        LiveBackend()  # type: ignore [arg-type]
-                        if setting.backend == "remote-settings"
-                        else TestBackend()
-                    ),
+                    backend=create_adm_backend(setting.backend),
                     name=provider_type,
                     enabled_by_default=setting.enabled_by_default,
                 )
@@ -87,6 +99,45 @@ async def init_providers() -> None:
         )
 
 
+async def preload_providers() -> None:
+    """Initialize all suggestion providers in the parent of pre-forked worker
+    processes, see `merino.prefork`.
+
+    The providers are shut down right away, so that the workers inherit their data
+    but no background tasks or connections bound to the event loop of the parent.
+    Workers call `resume_providers()` instead of `init_providers()` at startup.
+    """
+    global preloaded
+
+    await init_providers()
+    await shutdown_providers()
+    preloaded = True
+
+
+async def resume_providers() -> None:
+    """Resume the suggestion providers preloaded by the parent process.
+
+    This should only be called once at the startup of a forked worker process.
+    """
+    for provider_type, provider in providers.items():
+        if isinstance(provider, AdmProvider):
+            provider.backend = create_adm_backend(
+                settings.providers[provider_type].backend
+            )
+    await asyncio.gather(*[p.resume() for p in providers.values()])
+    logger.info(
+        "Provider resumption complete", extra={"providers": [*providers.keys()]}
+    )
+
+
+async def shutdown_providers() -> None:
+    """Shut down all suggestion providers.
+
+    This should only be called once at the shutdown of application.
+    """
+    await asyncio.gather(*[p.shutdown() for p in providers.values()])
+
+
 def get_providers() -> tuple[dict[str, BaseProvider], list[BaseProvider]]:
     """Return a tuple of all the providers and default providers."""
     return providers, default_providers
@@ -1,5 +1,7 @@
 """AccuWeather integration."""
+import asyncio
 import logging
+from functools import partial
 from typing import Any, Optional
 
 import httpx
@@ -7,13 +9,34 @@ from fastapi import FastAPI
 from pydantic import BaseModel, HttpUrl
 
 from merino.config import settings
-from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.providers.base import (
+    BaseProvider,
+    BaseSuggestion,
+    QueryFailure,
+    SuggestionRequest,
+)
+from merino.utils.cache import TTLCache
+from merino.utils.task_runner import SingleFlight
 
 API_KEY: str = settings.providers.accuweather.api_key
 CLIENT_IP_OVERRIDE: str = settings.location.client_ip_override
 SCORE: float = settings.providers.accuweather.score
 QUERY_TIMEOUT_SEC: float = settings.providers.accuweather.query_timeout_sec
 
+# Connection pool limits of the HTTP client shared by all AccuWeather requests
+MAX_CONNECTIONS: int = settings.providers.accuweather.max_connections
+MAX_KEEPALIVE_CONNECTIONS: int = (
+    settings.providers.accuweather.max_keepalive_connections
+)
+
+# Cache settings for AccuWeather responses
+CACHE_MAX_SIZE: int = settings.providers.accuweather.cache_max_size
+CACHE_TTL_LOCATION_SEC: float = settings.providers.accuweather.cache_ttl_location_sec
+CACHE_TTL_CURRENT_CONDITIONS_SEC: float = (
+    settings.providers.accuweather.cache_ttl_current_conditions_sec
+)
+CACHE_TTL_FORECAST_SEC: float = settings.providers.accuweather.cache_ttl_forecast_sec
+
 # Endpoint URL components
 URL_BASE: str = settings.providers.accuweather.url_base
 URL_PARAM_API_KEY: str = settings.providers.accuweather.url_param_api_key
@@ -43,6 +66,13 @@ class Temperature(BaseModel):
             self.f = round(c * 9 / 5 + 32)
 
 
+class AccuweatherLocation(BaseModel):
+    """Model for AccuWeather locations."""
+
+    key: str
+    localized_name: Optional[str] = None
+
+
 class CurrentConditions(BaseModel):
     """Model for AccuWeather current conditions."""
 
@@ -72,9 +102,22 @@ class Suggestion(BaseSuggestion):
 class Provider(BaseProvider):
     """Suggestion provider for AccuWeather."""
 
+    geolocation_fields = ("country", "postal_code")
     # In normal usage this is None, but tests can create the provider with a
     # FastAPI instance to fetch mock responses from it. See `__init__()`.
     _app: Optional[FastAPI]
+    # The HTTP client shared by all the requests to AccuWeather, so that
+    # connections are pooled and kept alive across suggest requests.
+    client: httpx.AsyncClient
+    # Caches for each stage of the weather lookup. Postal codes rarely move to
+    # another location, whereas current conditions and forecasts get stale soon.
+    location_cache: TTLCache[tuple[str, str], AccuweatherLocation]
+    current_conditions_cache: TTLCache[str, CurrentConditions]
+    forecast_cache: TTLCache[str, Forecast]
+    # Concurrent cache misses for the same key share a single upstream request.
+    location_flights: SingleFlight[tuple[str, str], Optional[AccuweatherLocation]]
+    current_conditions_flights: SingleFlight[str, Optional[CurrentConditions]]
+    forecast_flights: SingleFlight[str, Optional[Forecast]]
 
     def __init__(
         self,
@@ -88,12 +131,39 @@ class Provider(BaseProvider):
         self._name = name
         self._enabled_by_default = enabled_by_default
         self._query_timeout_sec = query_timeout_sec
+        self.client = self._create_client()
+        self.location_cache = TTLCache(CACHE_MAX_SIZE, CACHE_TTL_LOCATION_SEC)
+        self.current_conditions_cache = TTLCache(
+            CACHE_MAX_SIZE, CACHE_TTL_CURRENT_CONDITIONS_SEC
+        )
+        self.forecast_cache = TTLCache(CACHE_MAX_SIZE, CACHE_TTL_FORECAST_SEC)
+        self.location_flights = SingleFlight()
+        self.current_conditions_flights = SingleFlight()
+        self.forecast_flights = SingleFlight()
         super().__init__(**kwargs)
 
     async def initialize(self) -> None:
         """Initialize the provider."""
         ...
 
+    async def shutdown(self) -> None:
+        """Close the HTTP client."""
+        await self.client.aclose()
+
+    async def resume(self) -> None:
+        """Replace the HTTP client closed by the parent process."""
+        self.client = self._create_client()
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            app=self._app,
+            base_url=URL_BASE,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+
     def hidden(self) -> bool:  # noqa: D102
         return False
 
@@ -110,34 +180,90 @@ class Provider(BaseProvider):
             logger.warning("Country and/or postal code unknown")
             return []
 
-        async with httpx.AsyncClient(app=self._app, base_url=URL_BASE) as client:
-            suggestions = await self._get_weather(
-                client,
-                country=country,
-                postal_code=postal_code,
-            )
-            return suggestions
+        return await self._get_weather(country=country, postal_code=postal_code)
 
     async def _get_weather(
-        self, client: httpx.AsyncClient, country: str, postal_code: str
+        self, country: str, postal_code: str
     ) -> list[BaseSuggestion]:
         # Get the AccuWeather location key for the country and postal codes.
+        location = await self._get_location(country, postal_code)
+        if location is None:
+            return QueryFailure()
+
+        # Both only depend on the location key, so fetch them concurrently. Like
+        # the location lookup, a failure of either one fails the whole suggestion.
+        current_conditions, forecast = await asyncio.gather(
+            self._get_current_conditions(location.key),
+            self._get_forecast(location.key),
+        )
+        if current_conditions is None or forecast is None:
+            return QueryFailure()
+
+        city_name = location.localized_name
+        return [
+            Suggestion(
+                title=f"Weather for {city_name}",
+                url=current_conditions.url,
+                provider=self.name,
+                is_sponsored=False,
+                score=SCORE,
+                icon=None,
+                city_name=city_name,
+                current_conditions=current_conditions,
+                forecast=forecast,
+            )
+        ]
+
+    async def _get_location(
+        self, country: str, postal_code: str
+    ) -> Optional[AccuweatherLocation]:
+        cache_key = (country, postal_code)
+        if (location := self.location_cache.get(cache_key)) is not None:
+            return location
+
+        return await self.location_flights.do(
+            cache_key, partial(self._fetch_location, country, postal_code)
+        )
+
+    async def _fetch_location(
+        self, country: str, postal_code: str
+    ) -> Optional[AccuweatherLocation]:
         try:
-            location_resp = await client.get(
+            location_resp = await self.client.get(
                 URL_POSTALCODES_PATH.format(country_code=country),
                 params={
                     URL_PARAM_API_KEY: API_KEY,
                     URL_POSTALCODES_PARAM_QUERY: postal_code,
                 },
             )
-            location = location_resp.json()[0]
-            location_key = location["Key"]
+            location_data = location_resp.json()[0]
+            location = AccuweatherLocation(
+                key=location_data["Key"],
+                localized_name=location_data.get("LocalizedName"),
+            )
         except Exception:
-            return []
-
-        # Get the current conditions for the location key.
+            return None
+
+        self.location_cache.set((country, postal_code), location)
+        return location
+
+    async def _get_current_conditions(
+        self, location_key: str
+    ) -> Optional[CurrentConditions]:
+        if (
+            current_conditions := self.current_conditions_cache.get(location_key)
+        ) is not None:
+            return current_conditions
+
+        return await self.current_conditions_flights.do(
+            location_key, partial(self._fetch_current_conditions, location_key)
+        )
+
+    async def _fetch_current_conditions(
+        self, location_key: str
+    ) -> Optional[CurrentConditions]:
         try:
-            current_conditions_resp = await client.get(
+            current_conditions_resp = await self.client.get(
                 URL_CURRENT_CONDITIONS_PATH.format(location_key=location_key),
                 params={
                     URL_PARAM_API_KEY: API_KEY,
@@ -145,16 +271,27 @@ class Provider(BaseProvider):
             )
             current_conditions_data = current_conditions_resp.json()[0]
         except Exception:
-            return []
+            return None
 
         current_conditions = self._parse_current_conditions(current_conditions_data)
         if current_conditions is None:
             logger.warning("Unexpected current conditions response")
-            return []
+            return None
 
-        # Get the forecast for the location key.
+        self.current_conditions_cache.set(location_key, current_conditions)
+        return current_conditions
+
+    async def _get_forecast(self, location_key: str) -> Optional[Forecast]:
+        if (forecast := self.forecast_cache.get(location_key)) is not None:
+            return forecast
+
+        return await self.forecast_flights.do(
+            location_key, partial(self._fetch_forecast, location_key)
+        )
+
+    async def _fetch_forecast(self, location_key: str) -> Optional[Forecast]:
         try:
-            forecasts_resp = await client.get(
+            forecasts_resp = await self.client.get(
                 URL_FORECASTS_PATH.format(location_key=location_key),
                 params={
                     URL_PARAM_API_KEY: API_KEY,
@@ -162,27 +299,15 @@ class Provider(BaseProvider):
             )
             forecasts_data = forecasts_resp.json()
         except Exception:
-            return []
+            return None
 
         forecast = self._parse_forecast(forecasts_data)
         if forecast is None:
             logger.warning("Unexpected forecast response")
-            return []
+            return None
 
-        city_name = location.get("LocalizedName")
-        return [
-            Suggestion(
-                title=f"Weather for {city_name}",
-                url=current_conditions.url,
-                provider=self.name,
-                is_sponsored=False,
-                score=SCORE,
-                icon=None,
-                city_name=city_name,
-                current_conditions=current_conditions,
-                forecast=forecast,
-            )
-        ]
+        self.forecast_cache.set(location_key, forecast)
+        return forecast
 
     def _parse_current_conditions(self, data: Any) -> Optional[CurrentConditions]:
         match data:
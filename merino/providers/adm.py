@@ -1,20 +1,37 @@
 """AdM integration that uses the remote-settings provided data."""
 import asyncio
+import json
 import logging
+import os
 import time
-from asyncio import as_completed
 from enum import Enum, unique
-from typing import Any, Final, Optional, Protocol, Tuple, cast
+from typing import (
+    Any,
+    Final,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Sequence,
+    TypeVar,
+    cast,
+)
 
 import httpx
-from pydantic import HttpUrl
+from pydantic import HttpUrl, ValidationError
 
 from merino import cron
 from merino.config import settings
+from merino.exceptions import InvalidSnapshotError
 from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.utils.keyword_index import KeywordIndex, KeywordIndexBuilder
+from merino.utils.leader import LeaderLock
+from merino.utils.snapshot import Snapshot, write_snapshot
+from merino.utils.string_table import DecodedTable, StringTable
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class RemoteSettingsBackend(Protocol):
     """Protocol for a Remote Settings backend that this provider depends on.
@@ -24,6 +41,12 @@ class RemoteSettingsBackend(Protocol):
     directly depend on.
     """
 
+    async def get_timestamp(
+        self, bucket: str, collection: str
+    ) -> str:  # pragma: no cover
+        """Get the timestamp (i.e. ETag) of the collection from Remote Settings."""
+        ...
+
     async def get(
         self, bucket: str, collection: str
     ) -> list[dict[str, Any]]:  # pragma: no cover
@@ -40,10 +63,18 @@ class RemoteSettingsBackend(Protocol):
         """Get the icon URL for the given URI."""
         ...
 
+    async def close(self) -> None:  # pragma: no cover
+        """Release the resources held by the backend."""
+        ...
+
 
 class TestBackend:
     """A test backend that always returns empty results for tests."""
 
+    async def get_timestamp(self, bucket: str, collection: str) -> str:
+        """Return a fake collection timestamp."""
+        return ""
+
     async def get(self, bucket: str, collection: str) -> list[dict[str, Any]]:
         """Return fake records."""
         return []
@@ -56,6 +87,10 @@ class TestBackend:
         """Return a fake icon URL for the given URI."""
         return ""
 
+    async def close(self) -> None:
+        """Nothing to release for the test backend."""
+        ...
+
 
 @unique
 class IABCategory(str, Enum):
@@ -72,6 +107,9 @@ class IABCategory(str, Enum):
 # Used whenever the `icon` field is missing from the suggestion payload.
 MISSING_ICON_ID: Final = "-1"
 
+# The kind of the snapshot files written by this provider.
+SNAPSHOT_KIND: Final = "adm"
+
 
 class SponsoredSuggestion(BaseSuggestion):
     """Model for sponsored suggestions."""
@@ -97,17 +135,138 @@ class NonsponsoredSuggestion(BaseSuggestion):
     click_url: Optional[HttpUrl] = None
 
 
+class AttachmentData(NamedTuple):
+    """Suggestion data parsed from the attachment of a single Remote Settings
+    record. Both IDs stored in `suggestions` are local to the record.
+    """
+
+    suggestions: KeywordIndex
+    full_keywords: list[str]
+    results: list[dict[str, Any]]
+
+
+class RecordData(NamedTuple):
+    """The location of the data of a single Remote Settings record in the merged
+    data of the provider, so that unchanged records don't have to be fetched again.
+    """
+
+    last_modified: int
+    results: range
+    full_keywords: range
+
+
+def _take(items: Sequence[T], ids: range) -> list[T]:
+    return list(items[ids.start : ids.stop])
+
+
+def _encode_suggestion(suggestion: Optional[BaseSuggestion]) -> str:
+    # URLs are `str` subclasses, so the fields are JSON serializable as is.
+    return "" if suggestion is None else json.dumps(suggestion.dict())
+
+
+def _decode_suggestion(encoded: str) -> Optional[BaseSuggestion]:
+    """Restore a suggestion rendered and validated by another process, without
+    validating it again.
+    """
+    if not encoded:
+        return None
+    fields = json.loads(encoded)
+    model = SponsoredSuggestion if fields["is_sponsored"] else NonsponsoredSuggestion
+    return model.construct(**fields)
+
+
+def parse_attachment(attachment: list[dict[str, Any]]) -> AttachmentData:
+    """Parse the suggestions of a record attachment.
+
+    Args:
+      - `attachment`: the decoded JSON content of the record attachment
+    """
+    suggestions = KeywordIndexBuilder()
+    full_keywords: list[str] = []
+    results: list[dict[str, Any]] = []
+    for suggestion in attachment:
+        result_id = len(results)
+        keywords = suggestion.pop("keywords", [])
+        full_keywords_tuples = suggestion.pop("full_keywords", [])
+        begin = 0
+        for full_keyword, n in full_keywords_tuples:
+            fkw_index = len(full_keywords)
+            for query in keywords[begin : begin + n]:
+                # Note that for adM suggestions, each keyword can only be mapped to
+                # a single suggestion.
+                suggestions.add(query, result_id, fkw_index)
+            begin += n
+            full_keywords.append(full_keyword)
+        results.append(suggestion)
+
+    return AttachmentData(suggestions.build(), full_keywords, results)
+
+
+def _write_snapshot_file(
+    path: str,
+    metadata: dict[str, Any],
+    suggestions: KeywordIndex,
+    full_keywords: Sequence[str],
+    results: Sequence[dict[str, Any]],
+    rendered_suggestions: Sequence[Optional[BaseSuggestion]],
+) -> None:
+    """Write the data of the provider to a snapshot file. Full keywords, results,
+    and rendered suggestions are stored as string tables, unless they're already
+    loaded from a snapshot.
+    """
+    tables: dict[str, KeywordIndex | StringTable] = {
+        "suggestions": suggestions,
+        "full_keywords": full_keywords
+        if isinstance(full_keywords, StringTable)
+        else StringTable(full_keywords),
+        "results": DecodedTable.encode(results, json.dumps),
+        "rendered_suggestions": DecodedTable.encode(
+            rendered_suggestions, _encode_suggestion
+        ),
+    }
+    sections = {
+        f"{prefix}.{name}": buffer
+        for prefix, table in tables.items()
+        for name, buffer in table.sections().items()
+    }
+    write_snapshot(path, SNAPSHOT_KIND, metadata, sections)
+
+
 class Provider(BaseProvider):
     """Suggestion provider for adMarketplace through Remote Settings."""
 
-    suggestions: dict[str, Tuple[int, int]] = {}
-    full_keywords_list: list[str] = []
-    results: list[dict[str, Any]] = []
+    # The following are lists once fetched, or memory-mapped tables decoding their
+    # items upon access once loaded from the snapshot.
+    suggestions: KeywordIndex = KeywordIndex()
+    full_keywords: Sequence[str] = []
+    results: Sequence[dict[str, Any]] = []
     icons: dict[int, str] = {}
+    # The validated suggestion of each result, or `None` if the result is invalid.
+    # Only `full_keyword` is left to be filled in upon queries.
+    rendered_suggestions: Sequence[Optional[BaseSuggestion]] = []
+    # The collection timestamp and the location of the data of each record as of
+    # the last fetch. They're used to only fetch and re-index the changed records.
+    collection_timestamp: str = ""
+    record_data: dict[str, RecordData] = {}
+    # Whether records had keywords in common as of the last fetch. Only the entry
+    # of the last record is indexed for those, so the other entries can't be
+    # recovered from the index if that record changes, and all the records are
+    # fetched again instead.
+    has_shared_keywords: bool = False
+    # The time the data was last known to be in sync with Remote Settings, or
+    # `None` until the data is loaded.
+    updated_at: Optional[float] = None
     # Store the value to avoid fetching it from settings every time as that'd
     # require a three-way dict lookup.
     score: float = settings.providers.adm.score
     score_wikipedia: float = settings.providers.adm.score_wikipedia
+    snapshot_path: str = settings.providers.adm.snapshot_path
+    # The modification time of the snapshot file as of the last time it was loaded
+    # or written, used to reload snapshots written by other processes.
+    snapshot_mtime_ns: int = 0
+    # Elects the single worker process resyncing from Remote Settings, when the
+    # workers forked by `merino.prefork` share a snapshot file. See `resume()`.
+    leader_lock: Optional[LeaderLock] = None
     last_fetch_at: float
     cron_task: asyncio.Task
     backend: RemoteSettingsBackend
@@ -127,29 +286,181 @@ class Provider(BaseProvider):
 
     async def initialize(self) -> None:
         """Initialize cron job."""
-        try:
-            await self._fetch()
-        except Exception as e:
+        if self.snapshot_path and await self._load_snapshot():
+            # Serve suggestions from the snapshot right away. Setting the last
+            # fetch timestamp to 0 makes the cron job resync with Remote Settings
+            # in the background upon its first tick.
+            self.last_fetch_at = 0
+        else:
+            try:
+                await self._fetch()
+            except Exception as e:
+                logger.warning(
+                    "Failed to fetch data from Remote Settings, will retry it soon",
+                    extra={"error message": f"{e}"},
+                )
+                # Set the last fetch timestamp to 0 so that the cron job will retry
+                # the fetch upon the next tick.
+                self.last_fetch_at = 0
+
+        self._start_cron_job()
+
+    async def resume(self) -> None:
+        """Restart the resync cron job in a forked worker process. The backend is
+        expected to be replaced by the caller, as the provider doesn't own it.
+
+        If the workers share a snapshot file, only one of them (the leader) resyncs
+        from Remote Settings and writes the snapshot, while the others reload it
+        whenever it changes. The keyword index of a loaded snapshot is memory-mapped,
+        so its pages are shared by the workers as well. Should the leader exit,
+        another worker takes over upon its next cron tick.
+        """
+        if self.snapshot_path:
+            self.leader_lock = LeaderLock(f"{self.snapshot_path}.lock")
+        else:
             logger.warning(
-                "Failed to fetch data from Remote Settings, will retry it soon",
-                extra={"error message": f"{e}"},
+                "No snapshot path for adM data, each worker resyncs on its own"
+            )
+        self._start_cron_job()
+
+    async def shutdown(self) -> None:
+        """Stop the resync cron job and close the backend."""
+        if hasattr(self, "cron_task"):
+            self.cron_task.cancel()
+        if self.leader_lock is not None:
+            self.leader_lock.release()
+        await self.backend.close()
+
+    def _start_cron_job(self) -> None:
+        """Run a cron job that resyncs data in the background."""
+        if self.leader_lock is None:
+            cron_job = cron.Job(
+                name="resync_rs_data",
+                interval=settings.providers.adm.resync_interval_sec,
+                condition=self._should_fetch,
+                task=self._fetch,
+            )
+        else:
+            # Tick more frequently than the resync interval, so that followers
+            # pick up the snapshots written by the leader soon.
+            cron_job = cron.Job(
+                name="resync_rs_data",
+                interval=settings.providers.adm.cron_interval_sec,
+                condition=self._should_resync,
+                task=self._resync,
             )
-            # Set the last fetch timestamp to 0 so that the cron job will retry
-            # the fetch upon the next tick.
-            self.last_fetch_at = 0
-
-        # Run a cron job that resyncs data from Remote Settings in the background.
-        cron_job = cron.Job(
-            name="resync_rs_data",
-            interval=settings.providers.adm.resync_interval_sec,
-            condition=self._should_fetch,
-            task=self._fetch,
-        )
         # Store the created task on the instance variable. Otherwise it will get
         # garbage collected because asyncio's runtime only holds a weak
         # reference to it.
         self.cron_task = asyncio.create_task(cron_job())
 
+    async def _load_snapshot(self) -> bool:
+        """Load the data indexed by the last successful fetch from the snapshot
+        file. The keyword index, the full keywords, the results, and the rendered
+        suggestions are memory-mapped rather than read, and the latter two are only
+        decoded upon access.
+
+        Returns:
+          Whether or not the snapshot was loaded.
+        """
+        try:
+            mtime_ns = os.stat(self.snapshot_path).st_mtime_ns
+            snapshot = await asyncio.to_thread(
+                Snapshot, self.snapshot_path, SNAPSHOT_KIND
+            )
+            metadata = snapshot.metadata
+            if metadata["rendering"] != self._rendering():
+                raise InvalidSnapshotError("Suggestions rendered with other settings")
+            suggestions = KeywordIndex.from_sections(snapshot.sections("suggestions"))
+            full_keywords = StringTable.from_sections(
+                snapshot.sections("full_keywords")
+            )
+            results = DecodedTable(
+                StringTable.from_sections(snapshot.sections("results")), json.loads
+            )
+            rendered_suggestions = DecodedTable(
+                StringTable.from_sections(snapshot.sections("rendered_suggestions")),
+                _decode_suggestion,
+            )
+            icons, timestamp = (
+                {int(id): url for id, url in metadata["icons"].items()},
+                metadata["collection_timestamp"],
+            )
+            record_data = {
+                id: RecordData(
+                    last_modified, range(*result_ids), range(*full_keyword_ids)
+                )
+                for id, (last_modified, result_ids, full_keyword_ids) in metadata[
+                    "records"
+                ].items()
+            }
+            has_shared_keywords = metadata["has_shared_keywords"]
+        except FileNotFoundError:
+            return False
+        except (OSError, InvalidSnapshotError, KeyError) as e:
+            logger.warning(
+                "Failed to load the snapshot of Remote Settings data",
+                extra={"error message": f"{e}"},
+            )
+            return False
+
+        self.suggestions = suggestions
+        self.results = results
+        self.full_keywords = full_keywords
+        self.icons = icons
+        self.rendered_suggestions = rendered_suggestions
+        self.collection_timestamp = timestamp
+        self.record_data = record_data
+        self.has_shared_keywords = has_shared_keywords
+        self.snapshot_mtime_ns = mtime_ns
+        # Snapshots written before `updated_at` was recorded are of unknown age.
+        self.updated_at = max(
+            metadata.get("updated_at") or 0.0, self._published_updated_at() or 0.0
+        )
+        self.data_version += 1
+        logger.info(
+            "Loaded the snapshot of Remote Settings data",
+            extra={"suggestions": len(suggestions)},
+        )
+        return True
+
+    async def _write_snapshot(self) -> None:
+        """Write the currently indexed data to the snapshot file."""
+        metadata = {
+            "collection_timestamp": self.collection_timestamp,
+            "updated_at": self.updated_at,
+            "rendering": self._rendering(),
+            "icons": self.icons,
+            "records": {
+                id: [
+                    data.last_modified,
+                    [data.results.start, data.results.stop],
+                    [data.full_keywords.start, data.full_keywords.stop],
+                ]
+                for id, data in self.record_data.items()
+            },
+            "has_shared_keywords": self.has_shared_keywords,
+        }
+        try:
+            # Encoding the results and suggestions takes a while, so it's done in
+            # the thread writing the snapshot as well. Note that the data is never
+            # mutated, only replaced.
+            await asyncio.to_thread(
+                _write_snapshot_file,
+                self.snapshot_path,
+                metadata,
+                self.suggestions,
+                self.full_keywords,
+                self.results,
+                self.rendered_suggestions,
+            )
+            self.snapshot_mtime_ns = os.stat(self.snapshot_path).st_mtime_ns
+        except OSError as e:
+            logger.warning(
+                "Failed to write the snapshot of Remote Settings data",
+                extra={"error message": f"{e}"},
+            )
+
     def _should_fetch(self) -> bool:
         """Check if it should fetch data from Remote Settings."""
         return cast(
@@ -158,21 +469,92 @@ class Provider(BaseProvider):
             >= settings.providers.adm.resync_interval_sec,
         )
 
+    def _is_leader(self) -> bool:
+        """Check if this process resyncs from Remote Settings, trying to take over
+        the leadership if it's vacant.
+        """
+        return self.leader_lock is None or self.leader_lock.acquire()
+
+    def _should_resync(self) -> bool:
+        """Check if it should resync, i.e. fetch data from Remote Settings as the
+        leader or reload a changed snapshot as a follower. Followers with an
+        unchanged snapshot pick up the last time the leader found it up to date.
+        """
+        if self._is_leader():
+            return self._should_fetch()
+        try:
+            if os.stat(self.snapshot_path).st_mtime_ns != self.snapshot_mtime_ns:
+                return True
+        except OSError:
+            return False
+        # The data is unchanged, but the leader may have found it up to date since.
+        if self.updated_at is not None and (published := self._published_updated_at()):
+            self.updated_at = max(self.updated_at, published)
+        return False
+
+    @property
+    def updated_at_path(self) -> str:
+        """Return the path of the file whose modification time is the last time
+        the leader found the data of the snapshot up to date.
+        """
+        return f"{self.snapshot_path}.updated"
+
+    def _publish_updated_at(self, updated_at: float) -> None:
+        """Let the followers know that the data of the snapshot is still up to
+        date, without rewriting the snapshot. Rewriting it would make all of them
+        reload the same data, and lose the memory pages they share.
+        """
+        try:
+            if os.stat(self.snapshot_path).st_mtime_ns != self.snapshot_mtime_ns:
+                # The snapshot doesn't hold the data of this process, e.g. it
+                # failed to write it, so it's not known to be up to date.
+                return
+            with open(self.updated_at_path, "ab"):
+                pass
+            os.utime(self.updated_at_path, (updated_at, updated_at))
+        except OSError as e:
+            logger.warning(
+                "Failed to publish the update time of Remote Settings data",
+                extra={"error message": f"{e}"},
+            )
+
+    def _published_updated_at(self) -> Optional[float]:
+        """Return the last time the leader found the data of the snapshot up to
+        date, or `None` if it's unknown.
+        """
+        try:
+            return os.stat(self.updated_at_path).st_mtime
+        except OSError:
+            return None
+
+    async def _resync(self) -> None:
+        """Fetch data from Remote Settings as the leader, or reload the snapshot
+        written by the leader otherwise.
+        """
+        if self._is_leader():
+            await self._fetch()
+        else:
+            await self._load_snapshot()
+
     async def _fetch(self) -> None:
-        """Fetch suggestions, keywords, and icons from Remote Settings."""
-        # A dictionary keyed on suggestion keywords, each value stores an index
-        # (pointer) to one entry of the suggestion result list.
-        suggestions: dict[str, Tuple[int, int]] = {}
-        # A list of full keywords
-        full_keywords: list[str] = []
-        # A list of suggestion results.
-        results: list[dict[str, Any]] = []
-        # A dictionary of icon IDs to icon URLs.
-        icons: dict[int, str] = {}
+        """Fetch suggestions, keywords, and icons from Remote Settings.
 
-        suggest_settings = await self.backend.get(
-            settings.remote_settings.bucket, settings.remote_settings.collection
-        )
+        Only the attachments of records that have been added or changed since
+        the last fetch are downloaded. Nothing is fetched if the collection
+        timestamp is unchanged.
+        """
+        bucket = settings.remote_settings.bucket
+        collection = settings.remote_settings.collection
+
+        timestamp = await self.backend.get_timestamp(bucket, collection)
+        if timestamp and timestamp == self.collection_timestamp:
+            logger.debug("Remote Settings collection unchanged, skipping the fetch")
+            updated_at = self.last_fetch_at = self.updated_at = time.time()
+            if self.leader_lock is not None:
+                self._publish_updated_at(updated_at)
+            return
+
+        suggest_settings = await self.backend.get(bucket, collection)
 
         # Falls back to "data" records if "offline-expansion-data" records do not exist
         records = [
@@ -181,51 +563,155 @@ class Provider(BaseProvider):
             if record["type"] == "offline-expansion-data"
         ] or [record for record in suggest_settings if record["type"] == "data"]
 
-        fetch_tasks = [
-            self.backend.fetch_attachment(item["attachment"]["location"])
-            for item in records
+        changed_records = [
+            record
+            for record in records
+            if self.has_shared_keywords
+            or (data := self.record_data.get(record["id"])) is None
+            or data.last_modified != record["last_modified"]
         ]
-        fkw_index = 0
-        for done_task in as_completed(fetch_tasks):
-            res = await done_task
-
-            for suggestion in res.json():
-                result_id = len(results)
-                keywords = suggestion.pop("keywords", [])
-                full_keywords_tuples = suggestion.pop("full_keywords", [])
-                begin = 0
-                for full_keyword, n in full_keywords_tuples:
-                    for query in keywords[begin : begin + n]:
-                        # Note that for adM suggestions, each keyword can only be mapped to
-                        # a single suggestion.
-                        suggestions[query] = (result_id, fkw_index)
-                    begin += n
-                    full_keywords.append(full_keyword)
-                    fkw_index = len(full_keywords)
-                results.append(suggestion)
+        responses = await asyncio.gather(
+            *[
+                self.backend.fetch_attachment(record["attachment"]["location"])
+                for record in changed_records
+            ]
+        )
+        fetched: dict[str, AttachmentData] = {
+            record["id"]: parse_attachment(response.json())
+            for record, response in zip(changed_records, responses)
+        }
+
+        # A dictionary of icon IDs to icon URLs.
+        icons: dict[int, str] = {}
         icon_record = [
             record for record in suggest_settings if record["type"] == "icon"
         ]
         for icon in icon_record:
             id = int(icon["id"].replace("icon-", ""))
             icons[id] = self.backend.get_icon_url(icon["attachment"]["location"])
+        # Icon URLs are rendered into the suggestions of all the records.
+        render_all = icons != self.icons
+
+        record_data = self.record_data
+        suggestions, results, full_keywords, rendered_suggestions = (
+            self.suggestions,
+            self.results,
+            self.full_keywords,
+            self.rendered_suggestions,
+        )
+        has_shared_keywords = self.has_shared_keywords
+        if fetched or [record["id"] for record in records] != [*record_data]:
+            # Split the data of the unchanged records out of the merged data, then
+            # merge it with the data of the changed records in the record order.
+            unchanged_ids = [
+                record["id"] for record in records if record["id"] not in fetched
+            ]
+            unchanged_suggestions = dict(
+                zip(
+                    unchanged_ids,
+                    self.suggestions.partition(
+                        [
+                            (record_data[id].results, record_data[id].full_keywords)
+                            for id in unchanged_ids
+                        ]
+                    ),
+                )
+            )
+            record_data = {}
+            parts: list[tuple[KeywordIndex, int, int]] = []
+            merged_results: list[dict[str, Any]] = []
+            merged_full_keywords: list[str] = []
+            merged_rendered: list[Optional[BaseSuggestion]] = []
+            for record in records:
+                result_offset = len(merged_results)
+                fkw_offset = len(merged_full_keywords)
+                if (attachment := fetched.get(record["id"])) is not None:
+                    parts.append((attachment.suggestions, result_offset, fkw_offset))
+                    merged_results.extend(attachment.results)
+                    merged_full_keywords.extend(attachment.full_keywords)
+                    if not render_all:
+                        merged_rendered.extend(
+                            self._render_suggestions(attachment.results, icons)
+                        )
+                else:
+                    data = self.record_data[record["id"]]
+                    parts.append(
+                        (unchanged_suggestions[record["id"]], result_offset, fkw_offset)
+                    )
+                    merged_results.extend(_take(self.results, data.results))
+                    merged_full_keywords.extend(
+                        _take(self.full_keywords, data.full_keywords)
+                    )
+                    if not render_all:
+                        merged_rendered.extend(
+                            _take(self.rendered_suggestions, data.results)
+                        )
+                record_data[record["id"]] = RecordData(
+                    record["last_modified"],
+                    range(result_offset, len(merged_results)),
+                    range(fkw_offset, len(merged_full_keywords)),
+                )
+            results, full_keywords, rendered_suggestions = (
+                merged_results,
+                merged_full_keywords,
+                merged_rendered,
+            )
+            suggestions = KeywordIndex.merge(parts)
+            has_shared_keywords = len(suggestions) < sum(
+                len(index) for index, *_ in parts
+            )
+
+        if render_all:
+            rendered_suggestions = self._render_suggestions(results, icons)
+
+        logger.info(
+            "Fetched data from Remote Settings",
+            extra={
+                "records": len(record_data),
+                "changed_records": len(fetched),
+            },
+        )
 
         # overwrite the instance variables
         self.suggestions = suggestions
         self.results = results
         self.full_keywords = full_keywords
+        self.record_data = record_data
+        self.has_shared_keywords = has_shared_keywords
         self.icons = icons
-        self.last_fetch_at = time.time()
-
-    def hidden(self) -> bool:  # noqa: D102
-        return False
-
-    async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
-        """Provide suggestion for a given query."""
-        q = srequest.query
-        if (suggest_look_ups := self.suggestions.get(q)) is not None:
-            results_id, fkw_id = suggest_look_ups
-            res = self.results[results_id]
+        self.rendered_suggestions = rendered_suggestions
+        self.collection_timestamp = timestamp
+        self.last_fetch_at = self.updated_at = time.time()
+        self.data_version += 1
+
+        if self.snapshot_path:
+            await self._write_snapshot()
+
+    def _rendering(self) -> dict[str, Any]:
+        """Return the settings that the rendered suggestions depend on besides the
+        results and icons. Snapshots are only valid for the same settings.
+        """
+        return {
+            "provider": self.name,
+            "score": self.score,
+            "score_wikipedia": self.score_wikipedia,
+        }
+
+    def _render_suggestions(
+        self, results: Sequence[dict[str, Any]], icons: dict[int, str]
+    ) -> list[Optional[BaseSuggestion]]:
+        """Validate the suggestion of each result once, so that queries don't have
+        to. Invalid results are logged and never suggested.
+
+        Args:
+          - `results`: the results from Remote Settings
+          - `icons`: a dictionary of icon IDs to icon URLs
+        Returns:
+          A list of suggestions parallel to `results`. As it depends on the matched
+          keyword, `full_keyword` is left empty.
+        """
+        rendered: list[Optional[BaseSuggestion]] = []
+        for res in results:
             is_sponsored = res.get("iab_category") == IABCategory.SHOPPING
             score = (
                 self.score_wikipedia
@@ -234,7 +720,7 @@ class Provider(BaseProvider):
             )
             suggestion_dict = {
                 "block_id": res.get("id"),
-                "full_keyword": self.full_keywords[fkw_id],
+                "full_keyword": "",
                 "title": res.get("title"),
                 "url": res.get("url"),
                 "impression_url": res.get("impression_url"),
@@ -242,12 +728,46 @@ class Provider(BaseProvider):
                 "provider": self.name,
                 "advertiser": advertiser,
                 "is_sponsored": is_sponsored,
-                "icon": self.icons.get(int(res.get("icon", MISSING_ICON_ID))),
+                "icon": icons.get(int(res.get("icon", MISSING_ICON_ID))),
                 "score": score,
             }
-            return [
-                SponsoredSuggestion(**suggestion_dict)
-                if is_sponsored
-                else NonsponsoredSuggestion(**suggestion_dict)
-            ]
+            try:
+                rendered.append(
+                    SponsoredSuggestion(**suggestion_dict)
+                    if is_sponsored
+                    else NonsponsoredSuggestion(**suggestion_dict)
+                )
+            except ValidationError as e:
+                logger.warning(
+                    "Invalid suggestion from Remote Settings",
+                    extra={"block_id": res.get("id"), "error message": f"{e}"},
+                )
+                rendered.append(None)
+        return rendered
+
+    def hidden(self) -> bool:  # noqa: D102
+        return False
+
+    def is_ready(self) -> bool:
+        """Return whether data was loaded, either from Remote Settings or from the
+        snapshot.
+        """
+        return self.updated_at is not None
+
+    def data_age_sec(self) -> float | None:
+        """Return the time since the data was last known to be in sync with Remote
+        Settings.
+        """
+        return None if self.updated_at is None else time.time() - self.updated_at
+
+    async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
+        """Provide suggestion for a given query."""
+        q = srequest.query
+        if (suggest_look_ups := self.suggestions.get(q)) is not None:
+            results_id, fkw_id = suggest_look_ups
+            if (suggestion := self.rendered_suggestions[results_id]) is not None:
+                # `copy()` doesn't validate the suggestion again.
+                return [
+                    suggestion.copy(update={"full_keyword": self.full_keywords[fkw_id]})
+                ]
         return []
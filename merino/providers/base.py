@@ -27,12 +27,24 @@ class BaseSuggestion(BaseModel):
     icon: str | None = None
 
 
+class QueryFailure(list[BaseSuggestion]):
+    """The suggestions of a query that failed without raising, e.g. upon an upstream
+    error, which are usually none. Unlike other results, they aren't cached in the
+    suggest responses they're part of.
+    """
+
+
 class BaseProvider(ABC):
     """Abstract class for suggestion providers."""
 
     _name: str
     _enabled_by_default: bool
     _query_timeout_sec: float = settings.runtime.query_timeout_sec
+    # The fields of `SuggestionRequest.geolocation` that the suggestions depend on.
+    geolocation_fields: tuple[str, ...] = ()
+    # A counter to bump whenever the data backing the suggestions changes, which
+    # invalidates the suggest responses cached for this provider.
+    data_version: int = 0
 
     @abstractmethod
     async def initialize(self) -> None:
@@ -42,12 +54,30 @@ class BaseProvider(ABC):
         """
         ...
 
+    async def shutdown(self) -> None:
+        """Release the resources held by the provider, e.g. HTTP clients or
+        background tasks. This is called once at the shutdown of the application.
+        """
+        ...
+
+    async def resume(self) -> None:
+        """Resume the provider in a worker process forked by `merino.prefork`.
+
+        The provider was initialized and then shut down by the parent process, so
+        the data it loaded is inherited while its resources bound to the event loop
+        of the parent aren't. Providers holding such resources, e.g. HTTP clients or
+        background tasks, should recreate them here.
+        """
+        ...
+
     @abstractmethod
     async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
         """Query against this provider.
 
         Args:
           - `srequest`: the suggestion request.
+        Returns:
+          The suggestions, or a `QueryFailure` if they couldn't be looked up.
         """
         ...
 
@@ -69,6 +99,18 @@ class BaseProvider(ABC):
         else:
             return "disabled_by_default"
 
+    def is_ready(self) -> bool:
+        """Return whether the provider has the data to serve suggestions, e.g. once
+        its indexes are loaded. Providers without data of their own are always ready.
+        """
+        return True
+
+    def data_age_sec(self) -> float | None:
+        """Return the time (in seconds) since the data of the provider was last known
+        to be up to date, or `None` if the provider has no data of its own.
+        """
+        return None
+
     @property
     def name(self) -> str:
         """Return the name of the provider for use in logging and metrics"""
@@ -1,21 +1,35 @@
 """Top Pick Navigational Queries Provider"""
 import asyncio
+import hashlib
 import json
 import logging
 import os
-from collections import defaultdict
-from typing import Any, Final, Optional
+import time
+from typing import Any, Final, Optional, Sequence
 
 from fastapi import FastAPI
 
 from merino.config import settings
+from merino.exceptions import InvalidSnapshotError
 from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.utils.prefix_index import PrefixIndex
+from merino.utils.snapshot import Snapshot, write_snapshot
+from merino.utils.string_table import DecodedTable, StringTable
 
 SCORE: float = settings.providers.top_picks.score
 LOCAL_TOP_PICKS_FILE: str = settings.providers.top_picks.top_picks_file_path
 QUERY_CHAR_LIMIT: int = settings.providers.top_picks.query_char_limit
+SNAPSHOT_PATH: str = settings.providers.top_picks.snapshot_path
 # The minimal characters that Firefox Urlbar would send to Merino
 FIREFOX_CHAR_LIMIT: Final[int] = 2
+# The kind of the snapshot files written by this provider.
+SNAPSHOT_KIND: Final = "top_picks"
+# The indexes stored in snapshots along with their minimum prefix lengths.
+SNAPSHOT_INDEXES: Final[dict[str, int]] = {
+    "primary_index": QUERY_CHAR_LIMIT,
+    "secondary_index": QUERY_CHAR_LIMIT,
+    "short_domain_index": FIREFOX_CHAR_LIMIT,
+}
 
 
 logger = logging.getLogger(__name__)
@@ -28,6 +42,13 @@ class Suggestion(BaseSuggestion):
     is_top_pick: bool
 
 
+def _decode_suggestion(encoded: str) -> Suggestion:
+    """Restore a suggestion validated by another process, without validating it
+    again.
+    """
+    return Suggestion.construct(**json.loads(encoded))
+
+
 class Provider(BaseProvider):
     """Top Pick Query Suggestion Provider"""
 
@@ -35,12 +56,14 @@ class Provider(BaseProvider):
     # FastAPI instance to fetch mock responses from it. See `__init__()`.
     _app: Optional[FastAPI]
 
-    primary_index: defaultdict = defaultdict(list)
-    secondary_index: defaultdict = defaultdict(list)
-    short_domain_index: defaultdict = defaultdict(list)
-    results: list[Suggestion]
+    primary_index: PrefixIndex = PrefixIndex()
+    secondary_index: PrefixIndex = PrefixIndex()
+    short_domain_index: PrefixIndex = PrefixIndex()
+    results: Sequence[Suggestion]
     query_min: int
     query_max: int
+    # The time the indexes were built, or `None` until they are.
+    updated_at: Optional[float] = None
 
     def __init__(
         self,
@@ -58,12 +81,14 @@ class Provider(BaseProvider):
             index_results: dict[str, Any] = await asyncio.to_thread(
                 Provider.build_indices
             )
-            self.primary_index: defaultdict = index_results["primary_index"]
-            self.secondary_index: defaultdict = index_results["secondary_index"]
-            self.short_domain_index: defaultdict = index_results["short_domain_index"]
-            self.results: list[Suggestion] = index_results["results"]
+            self.primary_index = index_results["primary_index"]
+            self.secondary_index = index_results["secondary_index"]
+            self.short_domain_index = index_results["short_domain_index"]
+            self.results = index_results["results"]
             self.query_min: int = index_results["index_char_range"][0]
             self.query_max: int = index_results["index_char_range"][1]
+            self.updated_at = time.time()
+            self.data_version += 1
 
         except Exception as e:
             logger.warning(f"Could not instantiate Top Pick Provider: {e}")
@@ -72,6 +97,14 @@ class Provider(BaseProvider):
     def hidden(self) -> bool:  # noqa: D102
         return False
 
+    def is_ready(self) -> bool:
+        """Return whether the indexes are built."""
+        return self.updated_at is not None
+
+    def data_age_sec(self) -> float | None:
+        """Return the time since the indexes were built from the Top Picks file."""
+        return None if self.updated_at is None else time.time() - self.updated_at
+
     async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
         """Query Top Pick provider and return suggestion"""
         # Ignore https:// and http://
@@ -79,9 +112,8 @@ class Provider(BaseProvider):
             return []
         # Suggestions between Firefox char min of 2 and query limit - 1 for short domains
         if FIREFOX_CHAR_LIMIT <= len(srequest.query) <= (QUERY_CHAR_LIMIT - 1):
-            if ids := self.short_domain_index.get(srequest.query):
-                res = self.results[ids[0]]
-                return [res]
+            if (id := self.short_domain_index.get(srequest.query)) is not None:
+                return [self.results[id]]
 
         # Ignore requests below or above character min/max after checking short domains above
         if (
@@ -89,12 +121,10 @@ class Provider(BaseProvider):
             or len(srequest.query) > self.query_max
         ):
             return []
-        if ids := self.primary_index.get(srequest.query):
-            res = self.results[ids[0]]
-            return [res]
-        elif ids := self.secondary_index.get(srequest.query):
-            res = self.results[ids[0]]
-            return [res]
+        if (id := self.primary_index.get(srequest.query)) is not None:
+            return [self.results[id]]
+        elif (id := self.secondary_index.get(srequest.query)) is not None:
+            return [self.results[id]]
         return []
 
     @staticmethod
@@ -113,13 +143,18 @@ class Provider(BaseProvider):
 
     @staticmethod
     def build_index(domain_list: dict[str, Any]) -> dict[str, Any]:
-        """Construct indexes and results from Top Picks"""
-        # A dictionary of keyed values that point to the matching index
-        primary_index: defaultdict = defaultdict(list)
-        # A dictionary of keyed values that point to the matching index
-        secondary_index: defaultdict = defaultdict(list)
-        # A dictionary encapsulating short domains and their similars
-        short_domain_index: defaultdict = defaultdict(list)
+        """Construct indexes and results from Top Picks.
+
+        Each index stores every domain (or similar) once, and looking up a query in
+        an index matches all the keys starting with that query. When multiple
+        domains match, the one listed first in the domain list wins.
+        """
+        # Entries of domains, matched by queries of `QUERY_CHAR_LIMIT` or more chars
+        primary_entries: list[tuple[str, int]] = []
+        # Entries of similars, matched by queries of `QUERY_CHAR_LIMIT` or more chars
+        secondary_entries: list[tuple[str, int]] = []
+        # Entries of short domains and their similars
+        short_domain_entries: list[tuple[str, int]] = []
         # A list of suggestions
         results: list[Suggestion] = []
 
@@ -147,44 +182,122 @@ class Provider(BaseProvider):
                 score=SCORE,
             )
 
-            # Insertion of short keys between Firefox limit of 2 and QUERY_CHAR_LIMIT - 1
+            # Insertion of short domains between Firefox limit of 2 and QUERY_CHAR_LIMIT - 1
             # For similars equal to or longer than QUERY_CHAR_LIMIT, the values are added
             # to the secondary index.
             if FIREFOX_CHAR_LIMIT <= len(domain) <= (QUERY_CHAR_LIMIT - 1):
-                for chars in range(FIREFOX_CHAR_LIMIT, len(domain) + 1):
-                    short_domain_index[domain[:chars]].append(index_key)
+                short_domain_entries.append((domain, index_key))
                 for variant in record.get("similars", []):
                     if len(variant) >= QUERY_CHAR_LIMIT:
                         # Long variants will be indexed later into `secondary_index`
                         continue
 
-                    for chars in range(FIREFOX_CHAR_LIMIT, len(variant) + 1):
-                        short_domain_index[variant[:chars]].append(index_key)
+                    short_domain_entries.append((variant, index_key))
 
-            # Insertion of keys into primary index.
-            for chars in range(QUERY_CHAR_LIMIT, len(domain) + 1):
-                primary_index[domain[:chars]].append(index_key)
+            # Insertion of domains into primary index.
+            if len(domain) >= QUERY_CHAR_LIMIT:
+                primary_entries.append((domain, index_key))
 
-            # Insertion of keys into secondary index.
+            # Insertion of similars into secondary index.
             for variant in record.get("similars", []):
                 if len(variant) > query_max:
                     query_max = len(variant)
-                for chars in range(QUERY_CHAR_LIMIT, len(variant) + 1):
-                    secondary_index[variant[:chars]].append(index_key)
+                if len(variant) >= QUERY_CHAR_LIMIT:
+                    secondary_entries.append((variant, index_key))
 
             results.append(suggestion)
 
         return {
-            "primary_index": primary_index,
-            "secondary_index": secondary_index,
-            "short_domain_index": short_domain_index,
+            "primary_index": PrefixIndex(primary_entries, QUERY_CHAR_LIMIT),
+            "secondary_index": PrefixIndex(secondary_entries, QUERY_CHAR_LIMIT),
+            "short_domain_index": PrefixIndex(short_domain_entries, FIREFOX_CHAR_LIMIT),
             "results": results,
             "index_char_range": (query_min, query_max),
         }
 
+    @staticmethod
+    def snapshot_source(file: str) -> dict[str, Any]:
+        """Return what the indexes are built from, i.e. the digest of the domain
+        list file and the settings affecting the indexes. A snapshot is only valid
+        for the source it was built from.
+        """
+        with open(file, "rb") as readfile:
+            digest = hashlib.sha256(readfile.read()).hexdigest()
+        return {"sha256": digest, "score": SCORE, "query_char_limit": QUERY_CHAR_LIMIT}
+
+    @staticmethod
+    def load_snapshot(path: str, source: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Load indexes and results from a snapshot file. The indexes are backed
+        by the memory-mapped file, and the results are only decoded upon access.
+
+        Returns:
+          The same dictionary as `build_index()` or `None` if the snapshot doesn't
+          exist, is invalid, or was built from a different source.
+        """
+        try:
+            snapshot = Snapshot(path, SNAPSHOT_KIND)
+            if snapshot.metadata["source"] != source:
+                return None
+            index_results: dict[str, Any] = {
+                name: PrefixIndex.from_sections(snapshot.sections(name), min_prefix_len)
+                for name, min_prefix_len in SNAPSHOT_INDEXES.items()
+            }
+            index_results["results"] = DecodedTable(
+                StringTable.from_sections(snapshot.sections("results")),
+                _decode_suggestion,
+            )
+            index_results["index_char_range"] = tuple(
+                snapshot.metadata["index_char_range"]
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, InvalidSnapshotError, KeyError) as e:
+            logger.warning(f"Cannot load Top Picks snapshot: {e}")
+            return None
+        return index_results
+
+    @staticmethod
+    def write_snapshot(
+        path: str, source: dict[str, Any], index_results: dict[str, Any]
+    ) -> None:
+        """Write indexes and results returned from `build_index()` to a snapshot file."""
+        metadata = {
+            "source": source,
+            "index_char_range": index_results["index_char_range"],
+        }
+        tables: dict[str, PrefixIndex | StringTable] = {
+            name: index_results[name] for name in SNAPSHOT_INDEXES
+        }
+        tables["results"] = DecodedTable.encode(
+            index_results["results"], Suggestion.json
+        )
+        sections = {
+            f"{prefix}.{name}": buffer
+            for prefix, table in tables.items()
+            for name, buffer in table.sections().items()
+        }
+        try:
+            write_snapshot(path, SNAPSHOT_KIND, metadata, sections)
+        except OSError as e:
+            logger.warning(f"Cannot write Top Picks snapshot: {e}")
+
     @staticmethod
     def build_indices() -> dict[str, Any]:
-        """Read domain file, create indices and suggestions"""
+        """Read domain file, create indices and suggestions.
+
+        If `SNAPSHOT_PATH` is set, they're loaded from the snapshot built from the
+        current domain file, and the snapshot is (re)built if there isn't one.
+        """
+        if SNAPSHOT_PATH:
+            source = Provider.snapshot_source(LOCAL_TOP_PICKS_FILE)
+            if (
+                index_results := Provider.load_snapshot(SNAPSHOT_PATH, source)
+            ) is not None:
+                return index_results
+
         domains = Provider.read_domain_list(LOCAL_TOP_PICKS_FILE)
         index_results = Provider.build_index(domains)
+
+        if SNAPSHOT_PATH:
+            Provider.write_snapshot(SNAPSHOT_PATH, source, index_results)
         return index_results
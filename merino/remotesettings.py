@@ -1,4 +1,6 @@
 """A thin wrapper around the Remote Settings client."""
+import asyncio
+from importlib.util import find_spec
 from typing import Any, cast
 from urllib.parse import urljoin
 
@@ -7,22 +9,61 @@ import kinto_http
 
 from merino.config import settings
 
+# HTTP/2 requires the optional `h2` package (i.e. `httpx[http2]`), fall back to
+# HTTP/1.1 if it's not installed.
+HTTP2_ENABLED: bool = settings.remote_settings.http2 and find_spec("h2") is not None
+
 
 class LiveBackend:
     """Backend that connects to a live Remote Settings server."""
 
     client: kinto_http.AsyncClient
+    # A long-lived, pooled HTTP client used to fetch attachments.
+    http_client: httpx.AsyncClient
+    # Bound the number of in-flight attachment fetches.
+    fetch_semaphore: asyncio.Semaphore
     attachment_host: str = ""
 
     def __init__(self) -> None:
         """Init Remote Settings Client"""
         self.client = kinto_http.AsyncClient(server_url=settings.remote_settings.server)
+        self.http_client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            limits=httpx.Limits(
+                max_connections=settings.remote_settings.max_connections,
+                max_keepalive_connections=(
+                    settings.remote_settings.max_keepalive_connections
+                ),
+            ),
+        )
+        self.fetch_semaphore = asyncio.Semaphore(
+            settings.remote_settings.max_concurrent_fetches
+        )
 
     async def fetch_attachment_host(self) -> str:
         """Fetch the attachment host from the Remote Settings server."""
         server_info = await self.client.server_info()
         return cast(str, server_info["capabilities"]["attachments"]["base_url"])
 
+    async def get_timestamp(self, bucket: str, collection: str) -> str:
+        """Get the timestamp (i.e. ETag) of a collection from Remote Settings server.
+
+        Note that `kinto_http.Client.get_records_timestamp()` memoizes the timestamp
+        and is hence not suitable for polling. This issues a `HEAD` request instead,
+        which is much cheaper than fetching all the records.
+
+        Args:
+          - `collection`: the collection name
+          -  `bucket`: the bucket name
+        """
+        endpoint = await self.client.get_endpoint(
+            "records", bucket=bucket, collection=collection
+        )
+        _, headers = await asyncio.to_thread(
+            self.client.session.request, "head", endpoint
+        )
+        return cast(str, headers.get("ETag", "")).strip('"')
+
     async def get(self, bucket: str, collection: str) -> list[dict[str, Any]]:
         """Get records from Remote Settings server.
 
@@ -44,8 +85,8 @@ class LiveBackend:
         if not self.attachment_host:
             self.attachment_host = await self.fetch_attachment_host()
         uri = urljoin(self.attachment_host, attachment_uri)
-        async with httpx.AsyncClient() as client:
-            return await client.get(uri)
+        async with self.fetch_semaphore:
+            return await self.http_client.get(uri)
 
     def get_icon_url(self, icon_uri: str) -> str:
         """Get the URL for an icon.
@@ -54,3 +95,7 @@ class LiveBackend:
           - `icon_uri`: a URI path for an icon stored on Remote Settings
         """
         return urljoin(self.attachment_host, icon_uri)
+
+    async def close(self) -> None:
+        """Close the HTTP client and its pooled connections."""
+        await self.http_client.aclose()
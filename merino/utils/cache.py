@@ -0,0 +1,82 @@
+"""A utility module for in-memory caching."""
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+# TypeVar for cache keys
+K = TypeVar("K", bound=Hashable)
+
+# TypeVar for cache values
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """A bounded, in-memory LRU cache whose entries expire after a TTL.
+
+    When the cache is full, the least recently used entry is evicted to make room
+    for a new one. Expired entries are evicted lazily, i.e. upon lookups.
+
+    Note that it's not thread-safe, which is fine for the asyncio event loop.
+    """
+
+    max_size: int
+    ttl_sec: float
+    hits: int
+    misses: int
+    _entries: OrderedDict[K, tuple[float, V]]
+    _timer: Callable[[], float]
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_sec: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+          - `max_size`: the maximum number of entries
+          - `ttl_sec`: the default time to live (in seconds) of the entries
+          - `timer`: a monotonic clock, only meant to be overridden in tests
+        """
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._timer = timer
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value for the key or `None` if it's missing or expired."""
+        if (entry := self._entries.get(key)) is not None:
+            expires_at, value = entry
+            if self._timer() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: K, value: V, ttl_sec: Optional[float] = None) -> None:
+        """Cache a value for the key.
+
+        Args:
+          - `key`: the cache key
+          - `value`: the value to cache
+          - `ttl_sec`: an optional TTL (in seconds) overriding the default one
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = self._timer() + (self.ttl_sec if ttl_sec is None else ttl_sec)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        self._entries.clear()
@@ -0,0 +1,282 @@
+"""A compact, array-backed keyword index.
+
+It maps keywords to a pair of integer IDs, i.e. `(result_id, full_keyword_id)`
+for adM suggestions, without allocating a Python object per keyword. All the
+keywords are sorted and packed into a single UTF-8 encoded blob, the keyword
+boundaries as well as the IDs are stored in parallel `array("I")` columns.
+
+Lookups are done via binary search, i.e. O(log n). To keep them from allocating a
+slice of the blob per probe, every `FENCE_INTERVAL`th keyword is also kept as a
+`bytes` object: lookups bisect those in C, and then search the short block of the
+blob between two of them at once.
+
+Since the index is just a blob and a few flat columns, it can also be backed by
+read-only buffers, e.g. sections of a memory-mapped snapshot file.
+"""
+import heapq
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence
+
+# Type for raw index entries, i.e. `(encoded_keyword, result_id, fkw_id)`.
+Entry = tuple[bytes, int, int]
+
+# The item type of the `array` columns, i.e. unsigned int.
+ARRAY_TYPECODE = "I"
+
+# `surrogatepass` makes sure that any Python string can be encoded, so that
+# lookups never raise for odd queries.
+ENCODING_ERRORS = "surrogatepass"
+
+# The number of keywords per block between two fences, see `KeywordIndex._find()`.
+# Fences take about `1 / FENCE_INTERVAL` of the memory of the keywords, and lookups
+# search up to `FENCE_INTERVAL` keywords linearly.
+FENCE_INTERVAL = 32
+
+
+def _encode(keyword: str) -> bytes:
+    return keyword.encode("utf-8", ENCODING_ERRORS)
+
+
+def _pack(entries: Iterable[Entry]) -> "KeywordIndex":
+    """Pack entries sorted by keyword into an index. For duplicate keywords,
+    only the last entry is kept.
+    """
+    chunks: list[bytes] = []
+    offsets = array(ARRAY_TYPECODE, [0])
+    result_ids = array(ARRAY_TYPECODE)
+    fkw_ids = array(ARRAY_TYPECODE)
+    size = 0
+    for keyword, result_id, fkw_id in entries:
+        if chunks and chunks[-1] == keyword:
+            # Override the previous entry of a duplicate keyword.
+            result_ids[-1] = result_id
+            fkw_ids[-1] = fkw_id
+            continue
+        chunks.append(keyword)
+        size += len(keyword)
+        offsets.append(size)
+        result_ids.append(result_id)
+        fkw_ids.append(fkw_id)
+
+    return KeywordIndex(b"".join(chunks), offsets, result_ids, fkw_ids)
+
+
+class KeywordIndex:
+    """An immutable keyword index. Use `KeywordIndexBuilder` to create one."""
+
+    _blob: bytes | memoryview
+    _offsets: Sequence[int]
+    _result_ids: Sequence[int]
+    _fkw_ids: Sequence[int]
+    # Every `FENCE_INTERVAL`th keyword, starting with the first one.
+    _fences: list[bytes]
+
+    def __init__(
+        self,
+        blob: bytes | memoryview = b"",
+        offsets: Optional[Sequence[int]] = None,
+        result_ids: Optional[Sequence[int]] = None,
+        fkw_ids: Optional[Sequence[int]] = None,
+    ) -> None:
+        self._blob = blob
+        self._offsets = offsets if offsets is not None else array(ARRAY_TYPECODE, [0])
+        self._result_ids = (
+            result_ids if result_ids is not None else array(ARRAY_TYPECODE)
+        )
+        self._fkw_ids = fkw_ids if fkw_ids is not None else array(ARRAY_TYPECODE)
+        self._fences = [
+            self._keyword_at(position)
+            for position in range(0, len(self._result_ids), FENCE_INTERVAL)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._result_ids)
+
+    def __contains__(self, keyword: object) -> bool:
+        return isinstance(keyword, str) and self._find(_encode(keyword)) is not None
+
+    def _keyword_at(self, position: int) -> bytes:
+        # `bytes()` is a no-op for `bytes`, and it makes memoryview slices comparable.
+        return bytes(self._blob[self._offsets[position] : self._offsets[position + 1]])
+
+    def _find(self, key: bytes) -> Optional[int]:
+        """Return the position of the encoded keyword or `None` if not found."""
+        block = bisect_right(self._fences, key) - 1
+        if block < 0:
+            return None
+        offsets = self._offsets
+        lo = block * FENCE_INTERVAL
+        hi = min(lo + FENCE_INTERVAL, len(self._result_ids))
+        base = offsets[lo]
+        # Search all the keywords of the block at once, and then check whether a
+        # match spans exactly one keyword.
+        chunk = bytes(self._blob[base : offsets[hi]])
+        found = chunk.find(key)
+        while found >= 0:
+            # An empty keyword starts where the next keyword does, so of the
+            # keywords starting at an offset, only the last one can be non-empty.
+            if key:
+                position = bisect_right(offsets, base + found, lo, hi) - 1
+            else:
+                position = bisect_left(offsets, base + found, lo, hi)
+            if (
+                position < hi
+                and offsets[position] == base + found
+                and offsets[position + 1] - offsets[position] == len(key)
+            ):
+                return position
+            found = chunk.find(key, found + 1)
+        return None
+
+    def get(self, keyword: str) -> Optional[tuple[int, int]]:
+        """Look up the `(result_id, full_keyword_id)` pair for a keyword.
+
+        Args:
+          - `keyword`: the keyword to look up
+        Returns:
+          The pair of IDs or `None` if the keyword isn't indexed.
+        """
+        if (position := self._find(_encode(keyword))) is None:
+            return None
+        return self._result_ids[position], self._fkw_ids[position]
+
+    def _entries(
+        self, result_id_offset: int = 0, fkw_id_offset: int = 0
+    ) -> Iterator[Entry]:
+        for position in range(len(self._result_ids)):
+            yield (
+                self._keyword_at(position),
+                self._result_ids[position] + result_id_offset,
+                self._fkw_ids[position] + fkw_id_offset,
+            )
+
+    def items(self) -> Iterator[tuple[str, tuple[int, int]]]:
+        """Iterate over all the `(keyword, (result_id, full_keyword_id))` entries
+        in the keyword order.
+        """
+        for position in range(len(self._result_ids)):
+            yield (
+                self._keyword_at(position).decode("utf-8", ENCODING_ERRORS),
+                (self._result_ids[position], self._fkw_ids[position]),
+            )
+
+    @staticmethod
+    def merge(parts: Sequence[tuple["KeywordIndex", int, int]]) -> "KeywordIndex":
+        """Merge multiple indexes into one without decoding any keywords.
+
+        Args:
+          - `parts`: a sequence of `(index, result_id_offset, fkw_id_offset)`
+            tuples. The offsets are added to the IDs of the respective index.
+            For keywords present in multiple indexes, the last one wins.
+        """
+        # `heapq.merge()` is stable, so the entries of duplicate keywords are
+        # yielded in the order of `parts`.
+        return _pack(
+            heapq.merge(
+                *(index._entries(*offsets) for index, *offsets in parts),
+                key=itemgetter(0),
+            )
+        )
+
+    def partition(self, ranges: Sequence[tuple[range, range]]) -> list["KeywordIndex"]:
+        """Split the index into one index per pair of result ID and full keyword ID
+        ranges, i.e. the inverse of `merge()`.
+
+        Args:
+          - `ranges`: a sequence of non-overlapping `(result_ids, full_keyword_ids)`
+            ranges. The IDs of each part are made relative to the start of its
+            ranges. Entries of result IDs outside all the ranges are dropped.
+        """
+        owners: dict[int, int] = {
+            result_id: part
+            for part, (result_ids, _) in enumerate(ranges)
+            for result_id in result_ids
+        }
+        entries: list[list[Entry]] = [[] for _ in ranges]
+        for keyword, result_id, fkw_id in self._entries():
+            if (part := owners.get(result_id)) is not None:
+                result_ids, fkw_ids = ranges[part]
+                entries[part].append(
+                    (keyword, result_id - result_ids.start, fkw_id - fkw_ids.start)
+                )
+        # The entries are still sorted by keyword.
+        return [_pack(part_entries) for part_entries in entries]
+
+    def sections(self) -> dict[str, Any]:
+        """Return the underlying buffers of the index, e.g. to write a snapshot."""
+        return {
+            "blob": self._blob,
+            "offsets": self._offsets,
+            "result_ids": self._result_ids,
+            "fkw_ids": self._fkw_ids,
+        }
+
+    @classmethod
+    def from_sections(cls, sections: Mapping[str, Any]) -> "KeywordIndex":
+        """Create an index backed by the buffers returned from `sections()`.
+        The buffers are used as is, i.e. they're not copied.
+        """
+        return cls(
+            sections["blob"],
+            sections["offsets"],
+            sections["result_ids"],
+            sections["fkw_ids"],
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory (in bytes) held by this index."""
+        return sum(
+            sys.getsizeof(obj)
+            for obj in (
+                self,
+                self._blob,
+                self._offsets,
+                self._result_ids,
+                self._fkw_ids,
+                self._fences,
+                *self._fences,
+            )
+        )
+
+
+class KeywordIndexBuilder:
+    """Collect keyword entries and pack them into a `KeywordIndex`.
+
+    Like assignments to a dict, a keyword added more than once is mapped to the
+    IDs of its last insertion.
+    """
+
+    _keywords: list[bytes]
+    _result_ids: array
+    _fkw_ids: array
+
+    def __init__(self) -> None:
+        self._keywords = []
+        self._result_ids = array(ARRAY_TYPECODE)
+        self._fkw_ids = array(ARRAY_TYPECODE)
+
+    def add(self, keyword: str, result_id: int, fkw_id: int) -> None:
+        """Add a keyword entry.
+
+        Args:
+          - `keyword`: the keyword
+          - `result_id`: the index of the result that the keyword maps to
+          - `fkw_id`: the index of the full keyword that the keyword maps to
+        """
+        self._keywords.append(_encode(keyword))
+        self._result_ids.append(result_id)
+        self._fkw_ids.append(fkw_id)
+
+    def build(self) -> KeywordIndex:
+        """Sort, de-duplicate, and pack all the added entries into an index."""
+        keywords = self._keywords
+        # `sorted()` is stable, so duplicate keywords stay in insertion order.
+        order = sorted(range(len(keywords)), key=keywords.__getitem__)
+        return _pack(
+            (keywords[position], self._result_ids[position], self._fkw_ids[position])
+            for position in order
+        )
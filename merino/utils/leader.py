@@ -0,0 +1,52 @@
+"""A utility module for electing a leader among processes through a lock file."""
+import fcntl
+import os
+from typing import IO, Optional
+
+
+class LeaderLock:
+    """An exclusive lock on a file that elects a single leader among the processes
+    sharing it, e.g. the worker processes forked by `merino.prefork`.
+
+    The leader holds the lock until it releases it or exits, in which case the OS
+    releases the lock and the next process trying to acquire it takes over. Note
+    that the lock is held by an open file, so it must be acquired after forking.
+    """
+
+    path: str
+    _file: Optional[IO[bytes]]
+
+    def __init__(self, path: str) -> None:
+        """Initialize the lock.
+
+        Args:
+          - `path`: the path of the lock file, created if it doesn't exist
+        """
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        """Try to become the leader without blocking.
+
+        Returns:
+          Whether or not this process is the leader.
+        """
+        if self._file is not None:
+            return True
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        file = open(self.path, "ab")
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            return False
+        self._file = file
+        return True
+
+    def release(self) -> None:
+        """Step down as the leader, if this process is the leader."""
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
@@ -15,6 +15,9 @@ from merino.middleware.user_agent import UserAgent
 class LogDataModel(BaseModel):
     """Shared generic log data model. These fields are shared between the Request Summary Logs
     and the Suggest Logs.
+
+    The models describe the schema of the log data, which is built as plain dicts by
+    the `create_*_log_data()` functions below.
     """
 
     errno: int
@@ -57,53 +60,68 @@ class SuggestLogDataModel(LogDataModel):
     browser: str
     os_family: str
     form_factor: str
+    sample_rate: float = 1.0
 
 
 def create_request_summary_log_data(
     request: Request, message: Message, dt: datetime
-) -> RequestSummaryLogDataModel:
-    """Create log data for API endpoints."""
-    return RequestSummaryLogDataModel(
-        errno=0,
-        time=dt,
-        agent=request.headers.get("User-Agent"),
-        path=request.url.path,
-        method=request.method,
-        lang=request.headers.get("Accept-Language"),
-        querystring=dict(request.query_params),
-        code=message["status"],
-    )
+) -> dict[str, Any]:
+    """Create log data for API endpoints.
+
+    The log data is built directly rather than via `RequestSummaryLogDataModel` as
+    it's created for every request, but it has the same keys and types as the
+    `dict()` of the model.
+    """
+    headers: Headers = request.headers
+    return {
+        "errno": 0,
+        "time": dt.isoformat(),
+        "path": request.url.path,
+        "method": request.method,
+        "agent": headers.get("User-Agent"),
+        "lang": headers.get("Accept-Language"),
+        "querystring": dict(request.query_params),
+        "code": int(message["status"]),
+    }
 
 
 def create_suggest_log_data(
-    request: Request, message: Message, dt: datetime
-) -> SuggestLogDataModel:
-    """Create log data for the suggest API endpoint."""
+    request: Request, message: Message, dt: datetime, sample_rate: float = 1.0
+) -> dict[str, Any]:
+    """Create log data for the suggest API endpoint.
+
+    The log data is built directly rather than via `SuggestLogDataModel` as it's
+    created for every logged suggest request, but it has the same keys and types as
+    the `dict()` of the model.
+    """
     location: Location = request.scope[ScopeKey.GEOLOCATION]
     user_agent: UserAgent = request.scope[ScopeKey.USER_AGENT]
+    query_params = request.query_params
 
-    return SuggestLogDataModel(
+    return {
         # General Data
-        sensitive=True,
-        errno=0,
-        time=dt,
+        "errno": 0,
+        "time": dt.isoformat(),
         # Request Data
-        path=request.url.path,
-        method=request.method,
-        query=request.query_params.get("q"),
-        code=message["status"],
-        rid=Headers(scope=message)["X-Request-ID"],
-        session_id=request.query_params.get("sid"),
-        sequence_no=int(seq) if (seq := request.query_params.get("seq")) else None,
-        client_variants=request.query_params.get("client_variants", ""),
-        requested_providers=request.query_params.get("providers", ""),
+        "path": request.url.path,
+        "method": request.method,
+        "sensitive": True,
+        "query": query_params.get("q"),
+        "code": int(message["status"]),
+        "rid": Headers(scope=message)["X-Request-ID"],
+        "session_id": query_params.get("sid"),
+        "sequence_no": int(seq) if (seq := query_params.get("seq")) else None,
+        "client_variants": query_params.get("client_variants", ""),
+        "requested_providers": query_params.get("providers", ""),
         # Location Data
-        country=location.country,
-        region=location.region,
-        city=location.city,
-        dma=location.dma,
+        "country": location.country,
+        "region": location.region,
+        "city": location.city,
+        "dma": location.dma,
         # User Agent Data
-        browser=user_agent.browser,
-        os_family=user_agent.os_family,
-        form_factor=user_agent.form_factor,
-    )
+        "browser": user_agent.browser,
+        "os_family": user_agent.os_family,
+        "form_factor": user_agent.form_factor,
+        # Sampling Data
+        "sample_rate": float(sample_rate),
+    }
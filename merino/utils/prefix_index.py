@@ -0,0 +1,124 @@
+"""A compact prefix index.
+
+It answers "what's the smallest ID among the keys starting with this prefix?"
+while storing each key only once. Keys are kept in a sorted list, so all the keys
+sharing a prefix form a contiguous range that is located via binary search. The
+IDs are stored in a parallel `array("I")` column, along with a sparse table of the
+minimum ID of every range of a power-of-two length, which answers the minimum ID of
+any range with two lookups.
+
+Compared to expanding every prefix of every key into a dict, it doesn't allocate
+any per-prefix strings or lists, and building it only takes a sort.
+
+An index can also be restored from the sections of a snapshot file, in which case
+the IDs and the sparse table are used as is, and only the keys are decoded.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from merino.utils.string_table import StringTable
+
+
+class PrefixIndex:
+    """An immutable prefix index over `(key, id)` entries."""
+
+    min_prefix_len: int
+    _keys: list[str]
+    _ids: Sequence[int]
+    # `_min_ids[k][i]` is the smallest of the IDs `i` to `i + 2**k` (excluded).
+    _min_ids: list[Sequence[int]]
+
+    def __init__(
+        self, entries: Iterable[tuple[str, int]] = (), min_prefix_len: int = 1
+    ) -> None:
+        """Build the index.
+
+        Args:
+          - `entries`: an iterable of `(key, id)` tuples, a key can be given more
+            than once with different IDs
+          - `min_prefix_len`: prefixes shorter than this never match
+        """
+        pairs = sorted(entries)
+        self.min_prefix_len = min_prefix_len
+        self._keys = [key for key, _ in pairs]
+        self._ids = array("I", (id for _, id in pairs))
+        self._min_ids = _build_min_ids(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, prefix: object) -> bool:
+        return isinstance(prefix, str) and self.get(prefix) is not None
+
+    def get(self, prefix: str) -> Optional[int]:
+        """Return the smallest ID among the keys starting with the prefix, or `None`
+        if there isn't any.
+        """
+        if len(prefix) < self.min_prefix_len:
+            return None
+        keys = self._keys
+        lo = bisect_left(keys, prefix)
+        # Keys are sorted, so are their leading `len(prefix)` characters.
+        hi = bisect_right(keys, prefix, lo=lo, key=lambda key: key[: len(prefix)])
+        if lo == hi:
+            return None
+        # The range is covered by two, possibly overlapping, power-of-two ranges.
+        level = (hi - lo).bit_length() - 1
+        min_ids = self._min_ids[level]
+        return min(min_ids[lo], min_ids[hi - (1 << level)])
+
+    def sections(self) -> dict[str, Any]:
+        """Return the index as flat buffers, e.g. to write a snapshot. The keys
+        are packed into a `StringTable`, and each level of the sparse table but
+        the first one, i.e. the IDs, gets its own buffer.
+        """
+        sections = {
+            f"keys.{name}": buffer
+            for name, buffer in StringTable(self._keys).sections().items()
+        }
+        sections["ids"] = self._ids
+        for level, min_ids in enumerate(self._min_ids[1:], start=1):
+            sections[f"min_ids.{level}"] = min_ids
+        return sections
+
+    @classmethod
+    def from_sections(
+        cls, sections: Mapping[str, Any], min_prefix_len: int = 1
+    ) -> "PrefixIndex":
+        """Create an index from the buffers returned from `sections()`, without
+        re-sorting the keys or rebuilding the sparse table. The keys are decoded,
+        as lookups compare them with many prefixes, but the other buffers are used
+        as is, i.e. they're not copied.
+        """
+        index = cls(min_prefix_len=min_prefix_len)
+        index._keys = list(
+            StringTable.from_sections(
+                {
+                    name.removeprefix("keys."): buffer
+                    for name, buffer in sections.items()
+                    if name.startswith("keys.")
+                }
+            )
+        )
+        index._ids = sections["ids"]
+        index._min_ids = [index._ids] + [
+            sections[f"min_ids.{level}"]
+            for level in range(1, len(index._ids).bit_length())
+        ]
+        return index
+
+
+def _build_min_ids(ids: Sequence[int]) -> list[Sequence[int]]:
+    """Build the sparse table of the minimum IDs of the ranges of a power-of-two
+    length, where each level is derived from the halves in the previous one.
+    """
+    levels = [ids]
+    half = 1
+    while 2 * half <= len(ids):
+        previous = levels[-1]
+        levels.append(
+            array("I", (min(pair) for pair in zip(previous, previous[half:])))
+        )
+        half *= 2
+    return levels
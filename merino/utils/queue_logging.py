@@ -0,0 +1,115 @@
+"""A utility module for emitting logs from a background thread.
+
+Log records are put on a bounded in-memory queue by the logging call and written
+out by the handlers of a `QueueListener` in a background thread, so that a slow log
+consumer (e.g. stdout piped to the container log agent) never blocks the event
+loop. When the queue is full, records are dropped and counted rather than waited
+for.
+"""
+import copy
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from merino.metrics import get_metrics_client
+
+# The listener of the installed queue handler, if any.
+_listener: Optional[QueueListener] = None
+# The loggers routed through the installed queue handler.
+_loggers: list[logging.Logger] = []
+
+
+class _QueueListener(QueueListener):
+    """A queue listener that can be stopped while its bounded queue is full."""
+
+    def enqueue_sentinel(self) -> None:
+        """Wait for room in the queue to enqueue the stop sentinel."""
+        self.queue.put(self._sentinel)  # type: ignore [attr-defined]
+
+
+class BoundedQueueHandler(QueueHandler):
+    """A queue handler that drops records when its bounded queue is full."""
+
+    dropped: int
+    _unreported: int
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the handler.
+
+        Args:
+          - `maxsize`: the maximum number of records waiting to be written
+        """
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Prepare a record for queuing.
+
+        Unlike `QueueHandler.prepare()`, records are formatted by the handlers of
+        the listener thread, so that formatters see the original record. Only the
+        message arguments are merged, as they might be mutated after logging.
+        """
+        if record.args:
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enqueue a record or drop it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+            # The metrics client is bound to the event loop of the main thread, so
+            # drops in other threads are reported along with the next one in it.
+            if threading.current_thread() is threading.main_thread():
+                unreported, self._unreported = self._unreported, 0
+                get_metrics_client().increment(
+                    "logging.queue.dropped", value=unreported
+                )
+
+
+def start_queue_logging(logger_names: list[str], maxsize: int) -> BoundedQueueHandler:
+    """Route the records of the given loggers through a bounded queue to their
+    current handlers, which then run in a background thread.
+
+    Any previously started queue logging is stopped first. The loggers are expected
+    to share the same handlers.
+
+    Args:
+      - `logger_names`: the names of the loggers
+      - `maxsize`: the maximum number of records waiting to be written
+    Returns:
+      The installed queue handler.
+    """
+    global _listener, _loggers
+
+    stop_queue_logging()
+    _loggers = [logging.getLogger(name) for name in logger_names]
+    handler = BoundedQueueHandler(maxsize)
+    _listener = _QueueListener(
+        handler.queue, *_loggers[0].handlers, respect_handler_level=True
+    )
+    for logger in _loggers:
+        logger.handlers = [handler]
+    _listener.start()
+    return handler
+
+
+def stop_queue_logging() -> None:
+    """Write out the queued records and stop the background thread, if any. The
+    loggers are routed back to their handlers, which then run synchronously.
+    """
+    global _listener, _loggers
+
+    if _listener is not None:
+        _listener.stop()
+        for logger in _loggers:
+            logger.handlers = list(_listener.handlers)
+        _listener = None
+        _loggers = []
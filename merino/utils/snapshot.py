@@ -0,0 +1,168 @@
+"""A versioned, memory-mappable snapshot format for provider indexes.
+
+A snapshot file is laid out as follows:
+
+    | magic (8 bytes) | version (u32) | header length (u32) | header (JSON) |
+    | section 0 | section 1 | ... |
+
+The JSON header stores the kind of the snapshot (e.g. "adm"), arbitrary JSON
+metadata, and the location of each named binary section. Sections are aligned to
+8 bytes and can be any buffer, e.g. `bytes` or `array` columns. When reading a
+snapshot, the file is memory-mapped and sections are exposed as `memoryview`s cast
+back to their original item format, so the data is paged in lazily by the OS
+rather than parsed up front.
+
+Snapshots are meant to be a local cache for fast cold starts, so they're only
+valid on hosts with the same byte order and item sizes as the writer.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Final
+
+from merino.exceptions import InvalidSnapshotError
+
+MAGIC: Final[bytes] = b"MRNOSNAP"
+# Bump this whenever the layout of the file or of any snapshot kind changes.
+VERSION: Final[int] = 2
+# Struct for the fixed-size preamble: magic, version, and header length.
+PREAMBLE: Final[struct.Struct] = struct.Struct("<8sII")
+ALIGNMENT: Final[int] = 8
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(
+    path: str, kind: str, metadata: dict[str, Any], sections: dict[str, Any]
+) -> None:
+    """Write a snapshot file atomically, i.e. readers either see the previous
+    snapshot or the new one, never a partially written one.
+
+    Args:
+      - `path`: the path of the snapshot file
+      - `kind`: the kind of the snapshot, checked by the reader
+      - `metadata`: JSON serializable metadata
+      - `sections`: named binary sections, i.e. objects supporting the buffer
+        protocol such as `bytes` or `array`
+    """
+    views = {name: memoryview(section) for name, section in sections.items()}
+    layout: dict[str, dict[str, Any]] = {}
+    offset = 0
+    for name, view in views.items():
+        layout[name] = {
+            "offset": offset,
+            "length": view.nbytes,
+            "format": view.format,
+            "itemsize": view.itemsize,
+        }
+        offset = _align(offset + view.nbytes)
+
+    header = json.dumps(
+        {
+            "kind": kind,
+            "byteorder": sys.byteorder,
+            "metadata": metadata,
+            "sections": layout,
+        }
+    ).encode()
+    data_start = _align(PREAMBLE.size + len(header))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+            file.write(header)
+            for name, view in views.items():
+                file.seek(data_start + layout[name]["offset"])
+                file.write(view)
+            # Make sure the file size covers empty trailing sections.
+            file.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave partially written files behind, e.g. when the disk is full.
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class Snapshot:
+    """A memory-mapped snapshot file."""
+
+    kind: str
+    metadata: dict[str, Any]
+    _layout: dict[str, dict[str, Any]]
+    _data: memoryview
+
+    def __init__(self, path: str, kind: str) -> None:
+        """Open and memory-map a snapshot file.
+
+        Args:
+          - `path`: the path of the snapshot file
+          - `kind`: the expected kind of the snapshot
+        Raises:
+          - `InvalidSnapshotError` if the file isn't a compatible snapshot of the
+            expected kind.
+          - `OSError` if the file can't be read.
+        """
+        with open(path, "rb") as file:
+            # Note that empty files can't be memory-mapped.
+            if os.fstat(file.fileno()).st_size < PREAMBLE.size:
+                raise InvalidSnapshotError(f"Truncated snapshot: {path}")
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = PREAMBLE.unpack_from(mapped)
+        if magic != MAGIC:
+            raise InvalidSnapshotError(f"Not a snapshot: {path}")
+        if version != VERSION:
+            raise InvalidSnapshotError(f"Unsupported snapshot version: {version}")
+
+        try:
+            header = json.loads(mapped[PREAMBLE.size : PREAMBLE.size + header_length])
+        except ValueError as e:
+            raise InvalidSnapshotError(f"Invalid snapshot header: {e}") from e
+        if header["kind"] != kind:
+            raise InvalidSnapshotError(
+                f"Unexpected snapshot kind: {header['kind']}, expected: {kind}"
+            )
+        if header["byteorder"] != sys.byteorder or any(
+            struct.calcsize(info["format"]) != info["itemsize"]
+            for info in header["sections"].values()
+        ):
+            raise InvalidSnapshotError("Snapshot written on an incompatible platform")
+
+        data_start = _align(PREAMBLE.size + header_length)
+        self._layout = header["sections"]
+        if any(
+            data_start + info["offset"] + info["length"] > len(mapped)
+            for info in self._layout.values()
+        ):
+            raise InvalidSnapshotError(f"Truncated snapshot: {path}")
+
+        self.kind = kind
+        self.metadata = header["metadata"]
+        self._data = memoryview(mapped)[data_start:]
+
+    def section(self, name: str) -> memoryview:
+        """Return a section as a read-only memoryview of its original item format.
+
+        Raises:
+          - `KeyError` if the snapshot doesn't have the section.
+        """
+        info = self._layout[name]
+        view = self._data[info["offset"] : info["offset"] + info["length"]]
+        return view.cast(info["format"])
+
+    def sections(self, prefix: str) -> dict[str, memoryview]:
+        """Return all the sections named `{prefix}.{name}`, keyed by `name`."""
+        return {
+            name.removeprefix(f"{prefix}."): self.section(name)
+            for name in self._layout
+            if name.startswith(f"{prefix}.")
+        }
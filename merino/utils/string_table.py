@@ -0,0 +1,137 @@
+"""A compact, immutable sequence of strings.
+
+The strings are packed into a single UTF-8 encoded blob, their boundaries are
+stored in an `array("I")` column, and each string is decoded upon access. Like
+`KeywordIndex`, a table can be backed by read-only buffers, e.g. sections of a
+memory-mapped snapshot file, so loading it doesn't decode anything up front.
+
+`DecodedTable` builds on it for sequences of arbitrary items, e.g. JSON
+documents, which are only decoded as they are accessed.
+"""
+from array import array
+from itertools import accumulate
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Mapping,
+    Sequence,
+    TypeVar,
+    overload,
+)
+
+T = TypeVar("T")
+
+# See the same in `keyword_index`, any Python string can be stored.
+ENCODING_ERRORS = "surrogatepass"
+
+
+class StringTable(Sequence[str]):
+    """An immutable sequence of strings packed into a single blob."""
+
+    _blob: bytes | memoryview
+    _offsets: Sequence[int]
+
+    def __init__(self, strings: Iterable[str] = ()) -> None:
+        """Pack the strings into a table.
+
+        Args:
+          - `strings`: the strings to store
+        """
+        encoded = [string.encode("utf-8", ENCODING_ERRORS) for string in strings]
+        self._blob = b"".join(encoded)
+        self._offsets = array("I", accumulate(map(len, encoded), initial=0))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        offsets = self._offsets
+        return str(
+            self._blob[offsets[index] : offsets[index + 1]],
+            "utf-8",
+            ENCODING_ERRORS,
+        )
+
+    def sections(self) -> dict[str, Any]:
+        """Return the underlying buffers of the table, e.g. to write a snapshot."""
+        return {"blob": self._blob, "offsets": self._offsets}
+
+    @classmethod
+    def from_sections(cls, sections: Mapping[str, Any]) -> "StringTable":
+        """Create a table backed by the buffers returned from `sections()`.
+        The buffers are used as is, i.e. they're not copied.
+        """
+        table = cls()
+        table._blob, table._offsets = sections["blob"], sections["offsets"]
+        return table
+
+
+class DecodedTable(Sequence[T], Generic[T]):
+    """A read-only sequence of items stored as the strings of a `StringTable`.
+
+    Each item is decoded upon its first access and then cached, so that only the
+    items in use are ever decoded.
+    """
+
+    strings: StringTable
+    _decode: Callable[[str], T]
+    _items: dict[int, T]
+
+    def __init__(self, strings: StringTable, decode: Callable[[str], T]) -> None:
+        """Initialize the sequence.
+
+        Args:
+          - `strings`: the encoded items
+          - `decode`: the function decoding an item from its string
+        """
+        self.strings = strings
+        self._decode = decode
+        self._items = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if (item := self._items.get(index)) is None:
+            item = self._items[index] = self._decode(self.strings[index])
+        return item
+
+    @staticmethod
+    def encode(items: Sequence[T], encode: Callable[[T], str]) -> StringTable:
+        """Encode items into a table, reusing the table of a `DecodedTable`.
+
+        Args:
+          - `items`: the items to encode
+          - `encode`: the function encoding an item into a string
+        """
+        if isinstance(items, DecodedTable):
+            return items.strings
+        return StringTable(map(encode, items))
@@ -1,8 +1,9 @@
 """A utility module to facilitate running & managing asyncio Tasks."""
 
 import logging
-from asyncio import ALL_COMPLETED, Task, wait
-from typing import Callable, Optional
+import math
+from asyncio import ALL_COMPLETED, Task, create_task, get_running_loop, shield, wait
+from typing import Any, Callable, Coroutine, Generic, Hashable, Optional, TypeVar
 
 from merino.metrics import Client
 
@@ -11,11 +12,18 @@ logger = logging.getLogger(__name__)
 # Type for timeout callback
 TimeoutCallback = Callable[[list[Task]], None]
 
+# TypeVar for the keys of `SingleFlight`
+K = TypeVar("K", bound=Hashable)
+
+# TypeVar for the results of `SingleFlight`
+V = TypeVar("V")
+
 
 async def gather(
     tasks: list[Task],
     *,
     timeout: Optional[float] = None,
+    timeouts: Optional[list[Optional[float]]] = None,
     timeout_cb: Optional[TimeoutCallback] = None,
 ) -> tuple[list[Task], list[Task]]:
     """Run a list of tasks to their completion, gather all the completed tasks whenever
@@ -26,8 +34,12 @@ async def gather(
     - tasks: A list of Tasks.
     - timeout: A float indicating timeout (in seconds) for the entire task execution.
       If not specified, no timeout will be set.
+    - timeouts: A list of timeouts (in seconds), one per task. Each task is cancelled
+      as soon as its own timeout occurs, the other tasks keep running. A task without
+      a timeout (i.e. `None`) only uses `timeout`, which also caps all the others.
     - timeout_cb: A callable that gets called when timeout occurs. This callback will
-      be executed before the cancellation of the timeout tasks.
+      be executed before the cancellation of the timeout tasks. With per-task
+      timeouts, it's called once for every group of tasks timing out together.
 
     Returns: a tuple of two lists: the completed tasks and the timed out tasks.
 
@@ -42,19 +54,88 @@ async def gather(
     if len(tasks) == 0:
         return [], []
 
-    done, pending = await wait(tasks, timeout=timeout, return_when=ALL_COMPLETED)
-    if pending:
-        logger.warning("Timeout triggered in the task runner")
-        if timeout_cb:
-            timeout_cb(list(pending))
-        for task in pending:
-            logger.warning(f"Cancelling the task: {task.get_name()} due to timeout")
-            task.cancel()
+    if timeouts is None:
+        done, pending = await wait(tasks, timeout=timeout, return_when=ALL_COMPLETED)
+        if pending:
+            _cancel(list(pending), timeout_cb)
+        return list(done), list(pending)
+
+    loop = get_running_loop()
+    started_at: float = loop.time()
+    deadlines: dict[Task, float] = {}
+    for task, task_timeout in zip(tasks, timeouts, strict=True):
+        limits = [t for t in (timeout, task_timeout) if t is not None]
+        deadlines[task] = started_at + min(limits) if limits else math.inf
 
-    return list(done), list(pending)
+    completed: list[Task] = []
+    timed_out: list[Task] = []
+    running: set[Task] = set(tasks)
+    while running:
+        # Wake up when all the tasks are done or when the next deadline is due.
+        next_deadline: float = min(deadlines[task] for task in running)
+        done, pending = await wait(
+            running,
+            timeout=None
+            if next_deadline == math.inf
+            else max(next_deadline - loop.time(), 0),
+            return_when=ALL_COMPLETED,
+        )
+        completed.extend(done)
+        now: float = loop.time()
+        expired: list[Task] = [task for task in pending if deadlines[task] <= now]
+        if expired:
+            _cancel(expired, timeout_cb)
+            timed_out.extend(expired)
+        running = pending.difference(expired)
+
+    return completed, timed_out
+
+
+def _cancel(tasks: list[Task], timeout_cb: Optional[TimeoutCallback]) -> None:
+    """Cancel timed out tasks after calling the timeout callback on them."""
+    logger.warning("Timeout triggered in the task runner")
+    if timeout_cb:
+        timeout_cb(tasks)
+    for task in tasks:
+        logger.warning(f"Cancelling the task: {task.get_name()} due to timeout")
+        task.cancel()
 
 
 def metrics_timeout_handler(client: Client, tasks: list[Task]) -> None:
     """Timeout handler to record metrics for timed out tasks"""
     for task in tasks:
         client.increment(f"providers.{task.get_name()}.query.timeout")
+
+
+class SingleFlight(Generic[K, V]):
+    """De-duplicate concurrent calls keyed by the same key, so that all the callers
+    await the result of a single in-flight call. Once it finishes, the next call for
+    that key starts a new one.
+
+    The call runs in its own task and each caller awaits it through `shield()`, so
+    a cancelled caller (e.g. due to a query timeout) neither cancels the call nor
+    the other callers waiting for it.
+    """
+
+    _tasks: dict[K, Task[V]]
+
+    def __init__(self) -> None:
+        self._tasks = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def do(self, key: K, call: Callable[[], Coroutine[Any, Any, V]]) -> V:
+        """Run `call` unless there is already an in-flight call for the key, then
+        return its result (or raise its exception).
+
+        Args:
+        - key: The key to de-duplicate calls on.
+        - call: A callable returning the coroutine to run.
+        """
+        if (task := self._tasks.get(key)) is None:
+            task = create_task(call())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+        return await shield(task)
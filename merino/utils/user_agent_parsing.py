@@ -1,7 +1,17 @@
 """A utility module for user agent parsing."""
+from functools import cache
+from types import ModuleType
 from typing import Any, cast
 
-from ua_parser import user_agent_parser
+
+@cache
+def get_parser() -> ModuleType:
+    """Import the user agent parser upon the first call rather than at import time,
+    as importing it compiles hundreds of regular expressions.
+    """
+    from ua_parser import user_agent_parser
+
+    return cast(ModuleType, user_agent_parser)
 
 
 def parse(ua_str: str) -> dict[str, str]:
@@ -9,7 +19,7 @@ def parse(ua_str: str) -> dict[str, str]:
 
     It returns a dict with `browser`, `family`, and `form_factor` keys.
     """
-    ua: dict[str, Any] = user_agent_parser.Parse(ua_str)
+    ua: dict[str, Any] = get_parser().Parse(ua_str)
     browser = _parse_browser(ua["user_agent"])
     os_family = _parse_os_family(ua["os"])
     form_factor = _parse_form_factor(ua["device"], os_family)
@@ -1,23 +1,31 @@
 """Merino V1 API"""
+import json
 import logging
-from asyncio import Task
+from asyncio import Semaphore, Task, as_completed, create_task
 from collections import Counter
 from functools import partial
 from itertools import chain
+from typing import Any, AsyncIterator, NamedTuple
 
 from asgi_correlation_id.context import correlation_id
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from starlette.requests import Request
 
 from merino.config import settings
 from merino.metrics import Client
 from merino.middleware import ScopeKey
+from merino.middleware.geolocation import Location
 from merino.providers import get_providers
-from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
+from merino.providers.base import BaseProvider, QueryFailure, SuggestionRequest
 from merino.utils import task_runner
-from merino.web.models_v1 import ProviderResponse, SuggestResponse
+from merino.utils.cache import TTLCache
+from merino.web.models_v1 import (
+    BatchSuggestRequest,
+    ProviderResponse,
+    SuggestResponse,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -29,8 +37,38 @@ SUGGEST_RESPONSE = {
     "request_id": "",
 }
 
-# Timeout for query tasks.
-QUERY_TIMEOUT_SEC = settings.runtime.query_timeout_sec
+# The overall time budget for the query tasks of a request.
+QUERY_BUDGET_SEC = settings.runtime.query_budget_sec
+
+# The maximum number of queries of a batch suggest request, and of the concurrent
+# queries per batch.
+BATCH_MAX_QUERIES: int = settings.runtime.batch_max_queries
+BATCH_MAX_CONCURRENCY: int = settings.runtime.batch_max_concurrency
+# The error reported for the failed queries of a batch.
+BATCH_QUERY_ERROR: str = "Failed to query suggestions"
+
+RESPONSE_CACHE_MAX_SIZE: int = settings.runtime.response_cache_max_size
+RESPONSE_CACHE_TTL_SEC: float = settings.runtime.response_cache_ttl_sec
+
+
+class CachedSuggestions(NamedTuple):
+    """The suggestions of a suggest request, serialized as a JSON array, along with
+    their count per provider.
+    """
+
+    content: bytes
+    counts: Counter[str]
+
+
+# The key of cached suggestions: the query, the names of the queried providers, the
+# geolocation fields they use, and the data versions of the providers.
+SuggestCacheKey = tuple[str, tuple[str, ...], tuple[Any, ...], tuple[int, ...]]
+
+# Suggestions cached by request. Keystroke traffic is skewed towards a small head of
+# short prefixes, so that the same requests repeat a lot across users.
+response_cache: TTLCache[SuggestCacheKey, CachedSuggestions] = TTLCache(
+    RESPONSE_CACHE_MAX_SIZE, RESPONSE_CACHE_TTL_SEC
+)
 
 
 @router.get(
@@ -47,7 +85,7 @@ async def suggest(
     sources: tuple[dict[str, BaseProvider], list[BaseProvider]] = Depends(
         get_providers
     ),
-) -> JSONResponse:
+) -> Response:
     """Query Merino for suggestions.
 
     Args:
@@ -65,18 +103,134 @@ async def suggest(
     # feature_flags: FeatureFlags = request.scope[ScopeKey.FEATURE_FLAGS]
 
     metrics_client: Client = request.scope[ScopeKey.METRICS_CLIENT]
+    search_from = resolve_providers(sources, providers)
+    suggestions = await query_suggestions(
+        q, search_from, request.scope[ScopeKey.GEOLOCATION], metrics_client
+    )
+
+    return render_suggest_response(suggestions.content, client_variants)
+
+
+@router.post(
+    "/suggest/batch",
+    tags=["suggest"],
+    summary="Merino batch suggest endpoint",
+    response_class=StreamingResponse,
+)
+async def suggest_batch(
+    request: Request,
+    batch: BatchSuggestRequest,
+    sources: tuple[dict[str, BaseProvider], list[BaseProvider]] = Depends(
+        get_providers
+    ),
+) -> StreamingResponse:
+    """Query Merino for the suggestions of many queries at once.
+
+    The queries run concurrently through the same providers as the `suggest`
+    endpoint, and their results are streamed as soon as they're ready, one JSON
+    object per line. Results are in completion order, and refer to their query by
+    its index in `queries`.
+
+    Args:
+    - `batch`: The queries, and optionally the comma separated suggestion providers
+      to query.
+
+    Returns:
+    A stream of newline delimited JSON objects, with the `index`, the `query`, and
+    the `suggestions` of each query, or an `error` instead of `suggestions` if the
+    query failed.
+    """
+    if len(batch.queries) > BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many queries, the maximum is {BATCH_MAX_QUERIES}",
+        )
+
+    metrics_client: Client = request.scope[ScopeKey.METRICS_CLIENT]
+    search_from = resolve_providers(sources, batch.providers)
+    location: Location = request.scope[ScopeKey.GEOLOCATION]
+    # Bound the concurrent queries, so that a large batch doesn't starve the
+    # other requests of the providers.
+    semaphore = Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def query(index: int, q: str) -> bytes:
+        try:
+            async with semaphore:
+                suggestions = await query_suggestions(
+                    q, search_from, location, metrics_client
+                )
+        except Exception:
+            # Unlike the suggest endpoint, which fails the request, a failed query
+            # doesn't fail the others, which are already being streamed.
+            logger.exception("Failed to query suggestions for a batch")
+            metrics_client.increment("suggest.batch.errors")
+            result = [b',"error":', encode_json(BATCH_QUERY_ERROR)]
+        else:
+            result = [b',"suggestions":', suggestions.content]
+        return b"".join(
+            [b'{"index":', encode_json(index), b',"query":', encode_json(q)]
+            + result
+            + [b"}\n"]
+        )
 
+    async def stream() -> AsyncIterator[bytes]:
+        tasks = [create_task(query(i, q)) for i, q in enumerate(batch.queries)]
+        try:
+            for line in as_completed(tasks):
+                yield await line
+        finally:
+            # Stop the remaining queries if the client goes away.
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def resolve_providers(
+    sources: tuple[dict[str, BaseProvider], list[BaseProvider]],
+    providers: str | None,
+) -> list[BaseProvider]:
+    """Return the providers to query, i.e. the requested ones if any or the default
+    ones.
+
+    Args:
+      - `sources`: all the providers and the default providers
+      - `providers`: a comma separated string of the requested providers, if any
+    """
     active_providers, default_providers = sources
     if providers is not None:
-        search_from = [
+        return [
             active_providers[p] for p in providers.split(",") if p in active_providers
         ]
-    else:
-        search_from = default_providers
+    return default_providers
 
-    srequest = SuggestionRequest(
-        query=q, geolocation=request.scope[ScopeKey.GEOLOCATION]
-    )
+
+async def query_suggestions(
+    q: str,
+    search_from: list[BaseProvider],
+    location: Location,
+    metrics_client: Client,
+) -> CachedSuggestions:
+    """Query the providers for suggestions, or look them up in the response cache.
+
+    Args:
+      - `q`: the query string
+      - `search_from`: the providers to query
+      - `location`: the geolocation of the request
+      - `metrics_client`: the metrics client of the request
+    Returns:
+      The serialized suggestions along with their count per provider.
+    """
+    cache_key: SuggestCacheKey | None = None
+    if RESPONSE_CACHE_MAX_SIZE > 0:
+        cache_key = get_cache_key(q, search_from, location)
+        if (cached := response_cache.get(cache_key)) is not None:
+            metrics_client.increment("suggest.cache.hit")
+            emit_suggestions_per_metrics(metrics_client, cached.counts, search_from)
+            return cached
+        metrics_client.increment("suggest.cache.miss")
+
+    srequest = SuggestionRequest(query=q, geolocation=location)
 
     lookups: list[Task] = []
     for p in search_from:
@@ -87,12 +241,12 @@ async def suggest(
         task.set_name(p.name)
         lookups.append(task)
 
-    completed_tasks, _ = await task_runner.gather(
+    # Each provider is cancelled upon its own timeout, so that a slow provider
+    # doesn't hold back the results of the others.
+    completed_tasks, timedout_tasks = await task_runner.gather(
         lookups,
-        timeout=max(
-            (provider.query_timeout_sec for provider in search_from),
-            default=QUERY_TIMEOUT_SEC,
-        ),
+        timeout=QUERY_BUDGET_SEC,
+        timeouts=[provider.query_timeout_sec for provider in search_from],
         timeout_cb=partial(task_runner.metrics_timeout_handler, metrics_client),
     )
     suggestions = list(
@@ -106,25 +260,90 @@ async def suggest(
         )
     )
 
-    emit_suggestions_per_metrics(metrics_client, suggestions, search_from)
+    counts = Counter(suggestion.provider for suggestion in suggestions)
+    emit_suggestions_per_metrics(metrics_client, counts, search_from)
 
-    response = SuggestResponse(
-        suggestions=suggestions,
-        request_id=correlation_id.get(),
-        client_variants=client_variants.split(",") if client_variants else [],
+    # Serialize the suggestions directly rather than via `SuggestResponse` and
+    # `jsonable_encoder()`, as each of them walks through all the suggestions again.
+    # The serialized output is the same, `SuggestResponse` still defines the schema.
+    result = CachedSuggestions(
+        encode_json([suggestion.dict() for suggestion in suggestions]), counts
+    )
+    # Partial results of timed out or failed providers aren't cached.
+    if (
+        cache_key is not None
+        and not timedout_tasks
+        and not any(isinstance(task.result(), QueryFailure) for task in completed_tasks)
+    ):
+        response_cache.set(cache_key, result)
+    return result
+
+
+def get_cache_key(
+    q: str, search_from: list[BaseProvider], location: Location
+) -> SuggestCacheKey:
+    """Return the key of the cached suggestions of a suggest request.
+
+    Providers match queries verbatim, so the query is part of the key as is.
+
+    Args:
+      - `q`: the query string
+      - `search_from`: the queried providers
+      - `location`: the geolocation of the request
+    """
+    providers = sorted(search_from, key=lambda provider: provider.name)
+    fields = sorted({field for p in providers for field in p.geolocation_fields})
+    return (
+        q,
+        tuple(provider.name for provider in providers),
+        tuple(getattr(location, field) for field in fields),
+        tuple(provider.data_version for provider in providers),
+    )
+
+
+def encode_json(content: Any) -> bytes:
+    """Serialize content to JSON the same way as `JSONResponse`."""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def render_suggest_response(
+    suggestions: bytes, client_variants: str | None
+) -> Response:
+    """Render the response of a suggest request around its serialized suggestions.
+
+    The output is the same as rendering a `SuggestResponse` with `JSONResponse`.
+    """
+    return Response(
+        content=b"".join(
+            [
+                b'{"suggestions":',
+                suggestions,
+                b',"request_id":',
+                encode_json(correlation_id.get()),
+                b',"client_variants":',
+                encode_json(client_variants.split(",") if client_variants else []),
+                b',"server_variants":[]}',
+            ]
+        ),
+        media_type="application/json",
     )
-    return JSONResponse(content=jsonable_encoder(response))
 
 
 def emit_suggestions_per_metrics(
     metrics_client: Client,
-    suggestions: list[BaseSuggestion],
+    suggestion_counter: Counter[str],
     searched_providers: list[BaseProvider],
 ) -> None:
     """Emit metrics for suggestions per request and suggestions per request by provider."""
-    metrics_client.histogram("suggestions-per.request", value=len(suggestions))
-
-    suggestion_counter = Counter(suggestion.provider for suggestion in suggestions)
+    metrics_client.histogram(
+        "suggestions-per.request", value=sum(suggestion_counter.values())
+    )
 
     for provider in searched_providers:
         provider_name = provider.name
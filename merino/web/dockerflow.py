@@ -2,14 +2,22 @@
 import json
 import logging
 import os
+from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse, Response
 
+from merino.config import settings
+from merino.providers import get_providers
+from merino.providers.base import BaseProvider
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# The data age (in seconds) beyond which a provider is reported as stale.
+MAX_DATA_AGE_SEC: float = settings.runtime.max_data_age_sec
+
 
 @router.get(
     "/__version__",
@@ -29,9 +37,43 @@ async def version() -> JSONResponse:
 @router.get(
     "/__heartbeat__", tags=["__heartbeat__"], summary="Dockerflow: __heartbeat__"
 )
-async def heartbeat() -> Response:
-    """Dockerflow: Query service heartbeat. It returns an empty string in the response."""
-    return Response(content="")
+async def heartbeat(
+    sources: tuple[dict[str, BaseProvider], list[BaseProvider]] = Depends(
+        get_providers
+    ),
+) -> JSONResponse:
+    """Dockerflow: Query service heartbeat, i.e. the readiness of the providers.
+
+    It returns a 500 status until all the providers enabled by default have loaded
+    their data, so that no traffic is sent to a service that would return empty
+    suggestions. Providers that are only queried upon request (e.g. a failed load of
+    a provider disabled by default) and stale providers (see
+    `runtime.max_data_age_sec`) are reported as a warning, but keep a 200 status, as
+    the service can still serve the default suggestions.
+    """
+    active_providers, _ = sources
+    checks: dict[str, str] = {}
+    details: dict[str, dict[str, Any]] = {}
+    for name, provider in active_providers.items():
+        ready = provider.is_ready()
+        data_age_sec = provider.data_age_sec()
+        if not ready:
+            checks[f"providers.{name}"] = (
+                "error" if provider.enabled_by_default else "warning"
+            )
+        elif data_age_sec is not None and data_age_sec > MAX_DATA_AGE_SEC:
+            checks[f"providers.{name}"] = "warning"
+        else:
+            checks[f"providers.{name}"] = "ok"
+        details[f"providers.{name}"] = {"ready": ready, "data_age_sec": data_age_sec}
+
+    status = next(
+        (level for level in ["error", "warning"] if level in checks.values()), "ok"
+    )
+    return JSONResponse(
+        status_code=500 if status == "error" else 200,
+        content={"status": status, "checks": checks, "details": details},
+    )
 
 
 @router.get(
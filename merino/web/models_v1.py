@@ -18,3 +18,10 @@ class SuggestResponse(BaseModel):
     request_id: str
     client_variants: list[str] = []
     server_variants: list[str] = []
+
+
+class BatchSuggestRequest(BaseModel):
+    """Model for the `suggest/batch` API request."""
+
+    queries: list[str]
+    providers: str | None = None
@@ -0,0 +1,9 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Micro-benchmarks for the merino service.
+
+Benchmarks are standalone scripts rather than test modules, run them with e.g.
+`MERINO_ENV=testing python -m tests.benchmarks.bench_adm_keyword_index`.
+"""
@@ -0,0 +1,103 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the memory usage and lookup time of the adM keyword index against a
+plain dict keyed on keywords.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_adm_keyword_index [N]
+
+where `N` is the number of synthetic suggestions (defaults to 20,000).
+"""
+
+import gc
+import random
+import string
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from merino.utils.keyword_index import KeywordIndexBuilder
+
+# The number of full keywords per suggestion and the number of words per full keyword.
+FULL_KEYWORDS_PER_SUGGESTION = 4
+WORDS_PER_FULL_KEYWORD = 3
+
+
+def make_keywords(n_suggestions: int) -> list[tuple[str, int, int]]:
+    """Generate offline-expanded keywords, i.e. every prefix (3 chars or longer)
+    of every full keyword, mimicking the "offline-expansion-data" records.
+    """
+    rng = random.Random(42)
+    entries = []
+    fkw_id = 0
+    for result_id in range(n_suggestions):
+        for _ in range(FULL_KEYWORDS_PER_SUGGESTION):
+            full_keyword = " ".join(
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+                for _ in range(WORDS_PER_FULL_KEYWORD)
+            )
+            for end in range(3, len(full_keyword) + 1):
+                entries.append((full_keyword[:end], result_id, fkw_id))
+            fkw_id += 1
+    return entries
+
+
+def measure(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Return the built object and the memory (in bytes) retained by it."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main() -> None:
+    """Run the benchmark and print the report."""
+    n_suggestions = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    entries = make_keywords(n_suggestions)
+    # Copy the keywords so that both structures own their strings.
+    keywords = [keyword.encode().decode() for keyword, _, _ in entries]
+
+    def build_dict() -> dict[str, tuple[int, int]]:
+        return {
+            keyword.encode().decode(): (result_id, fkw_id)
+            for keyword, result_id, fkw_id in entries
+        }
+
+    def build_index() -> Any:
+        builder = KeywordIndexBuilder()
+        for keyword, result_id, fkw_id in entries:
+            builder.add(keyword, result_id, fkw_id)
+        return builder.build()
+
+    suggestions_dict, dict_bytes = measure(build_dict)
+    suggestions_index, index_bytes = measure(build_index)
+
+    samples = random.Random(0).sample(keywords, min(len(keywords), 10_000))
+    dict_time = timeit.timeit(
+        lambda: [suggestions_dict.get(k) for k in samples], number=5
+    )
+    index_time = timeit.timeit(
+        lambda: [suggestions_index.get(k) for k in samples], number=5
+    )
+    lookups = len(samples) * 5
+
+    print(f"suggestions: {n_suggestions:,}, keywords: {len(suggestions_index):,}")
+    print(f"{'':<14}{'memory (MiB)':>14}{'lookup (us)':>14}")
+    print(
+        f"{'dict':<14}{dict_bytes / 2**20:>14.2f}" f"{dict_time / lookups * 1e6:>14.2f}"
+    )
+    print(
+        f"{'KeywordIndex':<14}{index_bytes / 2**20:>14.2f}"
+        f"{index_time / lookups * 1e6:>14.2f}"
+    )
+    print(f"memory saved: {1 - index_bytes / dict_bytes:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the time for the adM provider to get ready from its snapshot against
+indexing the data of a full Remote Settings download, i.e. parsing the attachment,
+building the keyword index, and rendering the suggestions.
+
+Both go through the provider itself, i.e. `Provider._fetch()` with the
+attachment already downloaded, and `Provider._load_snapshot()` for the snapshot
+written by the fetch.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_adm_snapshot [N]
+
+where `N` is the number of synthetic suggestions (defaults to 20,000).
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from itertools import groupby
+from operator import itemgetter
+from typing import Any
+
+import httpx
+
+from merino.middleware.geolocation import Location
+from merino.providers.adm import Provider
+from merino.providers.base import SuggestionRequest
+from tests.benchmarks.bench_adm_keyword_index import make_keywords
+
+
+def make_attachment(n_suggestions: int) -> list[dict[str, Any]]:
+    """Generate the suggestions of an "offline-expansion-data" attachment."""
+    attachment = []
+    for result_id, entries in groupby(make_keywords(n_suggestions), itemgetter(1)):
+        keywords: list[str] = []
+        full_keywords: list[tuple[str, int]] = []
+        for _, fkw_entries in groupby(entries, itemgetter(2)):
+            fkw_keywords = [keyword for keyword, _, _ in fkw_entries]
+            keywords.extend(fkw_keywords)
+            full_keywords.append((fkw_keywords[-1], len(fkw_keywords)))
+        attachment.append(
+            {
+                "id": result_id,
+                "url": f"https://example.org/target/{result_id}",
+                "click_url": f"https://example.org/click/{result_id}",
+                "impression_url": f"https://example.org/impression/{result_id}",
+                "iab_category": "22 - Shopping",
+                "icon": "01",
+                "advertiser": "Example.org",
+                "title": f"Suggestion {result_id}",
+                "keywords": keywords,
+                "full_keywords": full_keywords,
+            }
+        )
+    return attachment
+
+
+class Backend:
+    """A Remote Settings backend serving a single record with the attachment."""
+
+    def __init__(self, attachment: list[dict[str, Any]]) -> None:
+        self.content = json.dumps(attachment)
+
+    async def get_timestamp(self, bucket: str, collection: str) -> str:
+        """Return a fake collection timestamp."""
+        return "123"
+
+    async def get(self, bucket: str, collection: str) -> list[dict[str, Any]]:
+        """Return the data record and an icon record."""
+        return [
+            {
+                "type": "offline-expansion-data",
+                "id": "offline-expansion-data-01",
+                "last_modified": 123,
+                "attachment": {"location": "data-01.json"},
+            },
+            {"type": "icon", "id": "icon-01", "attachment": {"location": "01.png"}},
+        ]
+
+    async def fetch_attachment(self, attachment_uri: str) -> httpx.Response:
+        """Return the attachment."""
+        return httpx.Response(200, text=self.content)
+
+    def get_icon_url(self, icon_uri: str) -> str:
+        """Return a fake icon URL."""
+        return f"https://example.org/icons/{icon_uri}"
+
+    async def close(self) -> None:
+        """Close nothing."""
+
+
+async def run(n_suggestions: int, snapshot_path: str) -> None:
+    """Run the benchmark and print the report."""
+    attachment = make_attachment(n_suggestions)
+    fetched = Provider(backend=Backend(attachment))
+
+    begin = time.perf_counter()
+    await fetched._fetch()
+    fetch_time = time.perf_counter() - begin
+
+    fetched.snapshot_path = snapshot_path
+    begin = time.perf_counter()
+    await fetched._write_snapshot()
+    write_time = time.perf_counter() - begin
+
+    loaded = Provider(backend=Backend(attachment))
+    loaded.snapshot_path = snapshot_path
+    begin = time.perf_counter()
+    assert await loaded._load_snapshot()
+    load_time = time.perf_counter() - begin
+
+    # Query a sample of the keywords, which pages in the parts of the snapshot
+    # they're in and decodes their suggestions.
+    queries = [
+        SuggestionRequest(query=keyword, geolocation=Location())
+        for suggestion in attachment[::97]
+        for keyword in suggestion["keywords"][::7]
+    ]
+    begin = time.perf_counter()
+    for srequest in queries:
+        assert await loaded.query(srequest)
+    first_queries_time = time.perf_counter() - begin
+
+    print(f"suggestions: {n_suggestions:,}, keywords: {len(fetched.suggestions):,}")
+    print(f"snapshot size: {os.path.getsize(snapshot_path) / 2**20:.2f} MiB")
+    print(f"{'fetch (ms)':<28}{fetch_time * 1e3:>10.2f}")
+    print(f"{'write snapshot (ms)':<28}{write_time * 1e3:>10.2f}")
+    print(f"{'load snapshot (ms)':<28}{load_time * 1e3:>10.2f}")
+    print(
+        f"{f'first {len(queries)} queries (ms)':<28}{first_queries_time * 1e3:>10.2f}"
+    )
+    print("note: the fetch excludes downloading the attachment")
+
+
+def main() -> None:
+    """Run the benchmark in a temporary directory."""
+    n_suggestions = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asyncio.run(run(n_suggestions, os.path.join(tmp_dir, "adm.snapshot")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the CPU time to build the log data of a request via the pydantic log
+data models against building it directly as a dict.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_log_data [N]
+
+where `N` is the number of rounds (defaults to 20,000). The model variant validates
+the direct log data with the model and dumps it back, which only differs from how
+the log data used to be built by an extra dict literal.
+"""
+
+import sys
+import timeit
+from datetime import datetime
+from typing import Any
+
+from starlette.requests import Request
+from starlette.types import Message
+
+from merino.middleware import ScopeKey
+from merino.middleware.geolocation import Location
+from merino.middleware.user_agent import UserAgent
+from merino.utils.log_data_creators import (
+    RequestSummaryLogDataModel,
+    SuggestLogDataModel,
+    create_request_summary_log_data,
+    create_suggest_log_data,
+)
+
+MESSAGE: Message = {
+    "type": "http.response.start",
+    "status": 200,
+    "headers": [(b"x-request-id", b"1b11844c52b34c33a6ad54b7bc2eb7c7")],
+}
+HEADERS: list[tuple[bytes, bytes]] = [
+    (
+        b"user-agent",
+        b"Mozilla/5.0 (Macintosh; Intel Mac OS X 11.2; rv:85.0) "
+        b"Gecko/20100101 Firefox/103.0",
+    ),
+    (b"accept-language", b"en-US"),
+]
+
+
+def suggest_request() -> Request:
+    """Return a fresh suggest request, so that parsing isn't cached across rounds."""
+    return Request(
+        scope={
+            "type": "http",
+            "headers": HEADERS,
+            "method": "GET",
+            "path": "/api/v1/suggest",
+            "query_string": (
+                b"q=firefox&sid=9aadf682-2f7a-4ad1-9976-dc30b60451d8&seq=3"
+                b"&client_variants=foo,bar&providers=adm,top_picks"
+            ),
+            ScopeKey.GEOLOCATION: Location(
+                country="US", region="WA", city="Milton", dma=819
+            ),
+            ScopeKey.USER_AGENT: UserAgent(
+                browser="Firefox(103.0)", os_family="macos", form_factor="desktop"
+            ),
+        }
+    )
+
+
+def summary_request() -> Request:
+    """Return a fresh request to a non-suggest endpoint."""
+    return Request(
+        scope={
+            "type": "http",
+            "headers": HEADERS,
+            "method": "GET",
+            "path": "/__heartbeat__",
+            "query_string": b"",
+        }
+    )
+
+
+def suggest_via_model() -> dict[str, Any]:
+    """Build the suggest log data like it was built before, via its model."""
+    data = create_suggest_log_data(suggest_request(), MESSAGE, datetime.now())
+    return SuggestLogDataModel(**data).dict()
+
+
+def suggest_direct() -> dict[str, Any]:
+    """Build the suggest log data directly."""
+    return create_suggest_log_data(suggest_request(), MESSAGE, datetime.now())
+
+
+def summary_via_model() -> dict[str, Any]:
+    """Build the request summary log data like it was built before, via its model."""
+    data = create_request_summary_log_data(summary_request(), MESSAGE, datetime.now())
+    return RequestSummaryLogDataModel(**data).dict()
+
+
+def summary_direct() -> dict[str, Any]:
+    """Build the request summary log data directly."""
+    return create_request_summary_log_data(summary_request(), MESSAGE, datetime.now())
+
+
+def main() -> None:
+    """Run the benchmark and print the report."""
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    cases = {
+        "web.suggest.request": (suggest_via_model, suggest_direct),
+        "request.summary": (summary_via_model, summary_direct),
+    }
+
+    print(f"rounds: {rounds:,}")
+    print(f"{'':<22}{'model (us)':>14}{'direct (us)':>14}{'saved (us)':>14}")
+    for name, (via_model, direct) in cases.items():
+        assert via_model().keys() == direct().keys()
+        model_time = timeit.timeit(via_model, number=rounds) / rounds * 1e6
+        direct_time = timeit.timeit(direct, number=rounds) / rounds * 1e6
+        print(
+            f"{name:<22}{model_time:>14.2f}{direct_time:>14.2f}"
+            f"{model_time - direct_time:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
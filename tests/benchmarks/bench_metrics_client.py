@@ -0,0 +1,97 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the per-request cost of the metrics client with and without recording
+calls (see `metrics.record_calls`) and with feature flag tags rebuilt on every
+metric call versus built once per decision.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_metrics_client [N]
+
+where `N` is the number of simulated requests (defaults to 10,000). Each request
+records `METRICS_PER_REQUEST` metrics with `FLAGS` feature flag decisions, which
+is about what a suggest request with a few providers does.
+"""
+
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+from merino import metrics
+from merino.featureflags import FeatureFlags
+from merino.metrics import Client, MetricTags, feature_flags_as_tags, get_metrics_client
+
+METRICS_PER_REQUEST = 10
+FLAGS = 3
+METRIC_NAMES = [f"metric.{i}" for i in range(METRICS_PER_REQUEST)]
+
+
+class RebuildingClient(Client):
+    """A client that rebuilds the feature flag tags on every metric call."""
+
+    def feature_flags_tags(self) -> MetricTags:
+        """Build the tags from scratch."""
+        return feature_flags_as_tags(self.feature_flags)
+
+
+def simulate_request(client_class: type[Client]) -> tuple[Client, float]:
+    """Record the metrics of a request and return its client along with the time
+    (in seconds) spent recording the metrics.
+    """
+    feature_flags = FeatureFlags(
+        {f"flag_{i}": {"scheme": "random", "enabled": 0.5} for i in range(FLAGS)}
+    )
+    for i in range(FLAGS):
+        feature_flags.is_enabled(f"flag_{i}")
+    client = client_class(
+        statsd_client=get_metrics_client(), feature_flags=feature_flags
+    )
+    begin = time.perf_counter()
+    for name in METRIC_NAMES:
+        client.increment(name)
+    return client, time.perf_counter() - begin
+
+
+def measure(
+    client_class: type[Client], record_calls: bool, n: int
+) -> tuple[float, float]:
+    """Return the time (in µs) spent recording metrics and the memory (in bytes)
+    retained by the metrics client per request, i.e. as long as the request is alive.
+    """
+    with mock.patch.object(metrics, "RECORD_CALLS", record_calls):
+        elapsed = sum(simulate_request(client_class)[1] for _ in range(n))
+
+        tracemalloc.start()
+        clients = [simulate_request(client_class)[0] for _ in range(1_000)]
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del clients
+
+    return elapsed / n * 1e6, retained / 1_000
+
+
+def main() -> None:
+    """Run the benchmark and print the report."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    # The logs of feature flag decisions aren't relevant here.
+    metrics.logger.disabled = True
+    mock.patch("merino.featureflags.logger.disabled", True).start()
+
+    cases = {
+        "recording calls, rebuilding tags": (RebuildingClient, True),
+        "recording calls": (Client, True),
+        "production": (Client, False),
+    }
+    print(
+        f"requests: {n:,}, metrics per request: {METRICS_PER_REQUEST}, flags: {FLAGS}"
+    )
+    print(f"{'':<34}{'recording (us)':>18}{'retained (bytes)':>18}")
+    for name, (client_class, record_calls) in cases.items():
+        per_request, retained = measure(client_class, record_calls, n)
+        print(f"{name:<34}{per_request:>18.2f}{retained:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
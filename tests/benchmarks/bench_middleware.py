@@ -0,0 +1,116 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the per-request overhead of the Merino middleware stack against the
+fused middleware.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_middleware [N] [PATH]
+
+where `N` is the number of requests per run (defaults to 5,000) and `PATH` is the
+request path (defaults to "/api/v1/suggest"), e.g. "/__lbheartbeat__" to measure
+the overhead for load balancer probes. The best of `REPEAT` interleaved runs is
+reported to reduce noise.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+
+from asgi_correlation_id import CorrelationIdMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from merino.middleware.featureflags import FeatureFlagsMiddleware
+from merino.middleware.fused import FusedMiddleware
+from merino.middleware.geolocation import GeolocationMiddleware
+from merino.middleware.logging import LoggingMiddleware
+from merino.middleware.metrics import MetricsMiddleware
+from merino.middleware.user_agent import UserAgentMiddleware
+
+REPEAT = 5
+
+SCOPE: Scope = {
+    "type": "http",
+    "method": "GET",
+    "scheme": "http",
+    "server": ("localhost", 8000),
+    "path": "/api/v1/suggest",
+    "query_string": b"q=moz&sid=deadbeef&seq=1&client_variants=foo",
+    "headers": [
+        (
+            b"user-agent",
+            b"Mozilla/5.0 (Macintosh; Intel Mac OS X 11.2; rv:85.0) "
+            b"Gecko/20100101 Firefox/103.0",
+        ),
+        (b"x-request-id", b"1b11844c52b34c33a6ad54b7bc2eb7c7"),
+    ],
+    "client": ("216.160.83.56", 50000),
+}
+
+
+async def app(scope: Scope, receive: Receive, send: Send) -> None:
+    """Respond with an empty JSON body."""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive() -> Message:
+    """Return an empty request body."""
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message: Message) -> None:
+    """Discard the response."""
+
+
+def make_stack(app: ASGIApp) -> ASGIApp:
+    """Wrap the app in the middleware stack, in the same order as `merino.main`."""
+    return LoggingMiddleware(
+        UserAgentMiddleware(
+            GeolocationMiddleware(
+                FeatureFlagsMiddleware(CorrelationIdMiddleware(MetricsMiddleware(app)))
+            )
+        )
+    )
+
+
+async def measure(middleware: ASGIApp, n: int, path: str) -> float:
+    """Return the average time (in seconds) per request of a run."""
+    begin = time.perf_counter()
+    for _ in range(n):
+        await middleware({**SCOPE, "path": path}, receive, send)
+    return (time.perf_counter() - begin) / n
+
+
+async def main() -> None:
+    """Run the benchmark and print the report."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    path = sys.argv[2] if len(sys.argv) > 2 else SCOPE["path"]
+    # Keep the cost of emitting logs out of the comparison.
+    logging.disable(logging.CRITICAL)
+
+    middlewares: dict[str, ASGIApp] = {
+        "no-op": app,
+        "stack": make_stack(app),
+        "fused": FusedMiddleware(app),
+    }
+    timings: dict[str, list[float]] = {name: [] for name in middlewares}
+    # Interleave the runs so that they're equally affected by noise.
+    for _ in range(REPEAT + 1):
+        for name, middleware in middlewares.items():
+            timings[name].append(await measure(middleware, n, path))
+    # Drop the first run, which warms up caches, e.g. the metric names.
+    baseline, stack, fused = (min(timings[name][1:]) for name in middlewares)
+
+    print(f"requests: {n:,} to {path}")
+    print(f"{'':<10}{'per request (us)':>18}{'overhead (us)':>16}")
+    print(f"{'no-op':<10}{baseline * 1e6:>18.2f}{0:>16.2f}")
+    print(f"{'stack':<10}{stack * 1e6:>18.2f}{(stack - baseline) * 1e6:>16.2f}")
+    print(f"{'fused':<10}{fused * 1e6:>18.2f}{(fused - baseline) * 1e6:>16.2f}")
+    print(f"overhead saved: {1 - (fused - baseline) / (stack - baseline):.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
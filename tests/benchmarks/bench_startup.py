@@ -0,0 +1,84 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Profile the startup of a worker with `python -X importtime`, i.e. the time to
+import `merino.main` and then to preload what's deferred at import time (see
+`merino.main.preload()`).
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_startup [N] [TOP]
+
+where `N` is the number of fresh interpreters to profile (defaults to 5) and `TOP`
+is the number of slowest imports to report (defaults to 15). Import times are the
+medians across interpreters, and include the imports done by each module (i.e. the
+"cumulative" column of `-X importtime`). Set `MERINO_RUNTIME__FUSED_MIDDLEWARE` or
+`MERINO_SENTRY__MODE` to profile other configurations.
+"""
+
+import os
+import statistics
+import subprocess  # nosec
+import sys
+from collections import defaultdict
+
+# Import the app, then time the preload, which is printed on the last line of stdout.
+SCRIPT = """
+import time
+import merino.main
+began = time.perf_counter()
+merino.main.preload()
+print(time.perf_counter() - began)
+"""
+
+
+def profile() -> tuple[dict[str, int], float]:
+    """Profile a fresh interpreter.
+
+    Returns:
+      The cumulative import time (in us) of each module and the preload time (in s).
+    """
+    process = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        capture_output=True,
+        check=True,
+        env=os.environ,
+        text=True,
+    )
+    imports: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        imports[module.strip()] = int(cumulative)
+        # The imports done by the preload are part of its time.
+        if module.strip() == "merino.main":
+            break
+    return imports, float(process.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    """Run the benchmark and print the report."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    samples: dict[str, list[int]] = defaultdict(list)
+    preloads: list[float] = []
+    for _ in range(n):
+        imports, preload = profile()
+        for module, cumulative in imports.items():
+            samples[module].append(cumulative)
+        preloads.append(preload)
+    medians = {module: statistics.median(times) for module, times in samples.items()}
+
+    print(f"interpreters: {n}")
+    print(f"import merino.main: {medians['merino.main'] / 1000:.1f}ms")
+    print(f"preload: {statistics.median(preloads) * 1000:.1f}ms")
+    print(f"\n{'slowest imports':<48}{'cumulative (ms)':>18}")
+    slowest = sorted(medians.items(), key=lambda item: item[1], reverse=True)
+    for module, median in slowest[1 : top + 1]:
+        print(f"{module:<48}{median / 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the CPU time to serialize a suggest response via `SuggestResponse` and
+`jsonable_encoder()` against serializing the suggestions directly.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_suggest_response [N]
+
+where `N` is the number of suggestions per response (defaults to 3).
+"""
+
+import sys
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from merino.providers.adm import SponsoredSuggestion
+from merino.providers.base import BaseSuggestion
+from merino.web.models_v1 import SuggestResponse
+
+ROUNDS = 20_000
+
+
+def main() -> None:
+    """Run the benchmark and print the report."""
+    n_suggestions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    suggestions: list[BaseSuggestion] = [
+        SponsoredSuggestion(
+            block_id=i,
+            full_keyword="firefox accounts",
+            title="Mozilla Firefox Accounts",
+            url=f"https://example.org/target/{i}",
+            impression_url="https://example.org/impression",
+            click_url="https://example.org/click",
+            provider="adm",
+            advertiser="Example.org",
+            is_sponsored=True,
+            icon="https://example.org/icon.png",
+            score=0.3,
+        )
+        for i in range(n_suggestions)
+    ]
+
+    def via_model() -> bytes:
+        response = SuggestResponse(
+            suggestions=suggestions, request_id="abc", client_variants=["foo"]
+        )
+        return JSONResponse(content=jsonable_encoder(response)).body
+
+    def direct() -> bytes:
+        return JSONResponse(
+            content={
+                "suggestions": [suggestion.dict() for suggestion in suggestions],
+                "request_id": "abc",
+                "client_variants": ["foo"],
+                "server_variants": [],
+            }
+        ).body
+
+    assert via_model() == direct()
+
+    model_time = timeit.timeit(via_model, number=ROUNDS) / ROUNDS
+    direct_time = timeit.timeit(direct, number=ROUNDS) / ROUNDS
+
+    print(f"suggestions per response: {n_suggestions}")
+    print(f"{'':<28}{'per request (us)':>18}")
+    print(f"{'SuggestResponse + encoder':<28}{model_time * 1e6:>18.2f}")
+    print(f"{'direct':<28}{direct_time * 1e6:>18.2f}")
+    print(f"CPU saved per request: {(model_time - direct_time) * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    main()
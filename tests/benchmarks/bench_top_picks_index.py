@@ -0,0 +1,131 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the build time and memory usage of the Top Picks prefix indexes against
+the previous approach of expanding every prefix into a `defaultdict(list)`. It
+also checks that both answer every possible query with the same result.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_top_picks_index [FILE]
+
+where `FILE` is a Top Picks domain list (defaults to `dev/top_picks.json`).
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+from merino.providers.top_picks import (
+    FIREFOX_CHAR_LIMIT,
+    QUERY_CHAR_LIMIT,
+    SCORE,
+    Provider,
+    Suggestion,
+)
+
+
+def build_dict_indexes(domain_list: dict[str, Any]) -> dict[str, Any]:
+    """Build the indexes by expanding all prefixes, i.e. the previous approach."""
+    primary_index: defaultdict = defaultdict(list)
+    secondary_index: defaultdict = defaultdict(list)
+    short_domain_index: defaultdict = defaultdict(list)
+    results: list[Suggestion] = []
+    for index_key, record in enumerate(domain_list["domains"]):
+        domain = record["domain"]
+        results.append(
+            Suggestion(
+                block_id=0,
+                title=record["title"],
+                url=record["url"],
+                provider="top_picks",
+                is_top_pick=True,
+                is_sponsored=False,
+                icon=record["icon"],
+                score=SCORE,
+            )
+        )
+        if FIREFOX_CHAR_LIMIT <= len(domain) <= (QUERY_CHAR_LIMIT - 1):
+            for chars in range(FIREFOX_CHAR_LIMIT, len(domain) + 1):
+                short_domain_index[domain[:chars]].append(index_key)
+            for variant in record.get("similars", []):
+                if len(variant) >= QUERY_CHAR_LIMIT:
+                    continue
+                for chars in range(FIREFOX_CHAR_LIMIT, len(variant) + 1):
+                    short_domain_index[variant[:chars]].append(index_key)
+        for chars in range(QUERY_CHAR_LIMIT, len(domain) + 1):
+            primary_index[domain[:chars]].append(index_key)
+        for variant in record.get("similars", []):
+            for chars in range(QUERY_CHAR_LIMIT, len(variant) + 1):
+                secondary_index[variant[:chars]].append(index_key)
+    return {
+        "primary_index": primary_index,
+        "secondary_index": secondary_index,
+        "short_domain_index": short_domain_index,
+        "results": results,
+    }
+
+
+def measure(build: Callable[[], Any]) -> tuple[Any, float, int]:
+    """Return the built object, the build time (in seconds) and the memory (in
+    bytes) retained by it. Note that tracing memory slows down the build.
+    """
+    gc.collect()
+    tracemalloc.start()
+    begin = time.perf_counter()
+    obj = build()
+    duration = time.perf_counter() - begin
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, duration, size
+
+
+def check_equal_results(
+    domain_list: dict[str, Any], dict_indexes: dict, prefix_indexes: dict
+) -> int:
+    """Check that both index kinds agree for all prefixes of all keys."""
+    queries: set[str] = set()
+    for record in domain_list["domains"]:
+        for key in [record["domain"], *record.get("similars", [])]:
+            queries.update(key[:chars] for chars in range(1, len(key) + 2))
+    for name in ("primary_index", "secondary_index", "short_domain_index"):
+        for query in queries:
+            ids: Optional[list[int]] = dict_indexes[name].get(query)
+            expected = ids[0] if ids else None
+            actual = prefix_indexes[name].get(query)
+            if name == "short_domain_index" and len(query) >= QUERY_CHAR_LIMIT:
+                # Only queried for queries shorter than `QUERY_CHAR_LIMIT`.
+                continue
+            assert actual == expected, f"{name}: {query!r} {actual} != {expected}"
+    return len(queries)
+
+
+def main() -> None:
+    """Run the benchmark and print the report."""
+    file = sys.argv[1] if len(sys.argv) > 1 else "dev/top_picks.json"
+    domain_list = Provider.read_domain_list(file)
+    # Warm up, e.g. compile the URL validation regexes of pydantic.
+    build_dict_indexes(domain_list)
+    Provider.build_index(domain_list)
+
+    dict_indexes, dict_time, dict_bytes = measure(
+        lambda: build_dict_indexes(domain_list)
+    )
+    prefix_indexes, prefix_time, prefix_bytes = measure(
+        lambda: Provider.build_index(domain_list)
+    )
+    n_queries = check_equal_results(domain_list, dict_indexes, prefix_indexes)
+
+    print(f"domains: {len(domain_list['domains']):,}, queries checked: {n_queries:,}")
+    print(f"{'':<14}{'build (ms)':>14}{'memory (KiB)':>14}")
+    print(f"{'dict':<14}{dict_time * 1000:>14.2f}{dict_bytes / 1024:>14.1f}")
+    print(f"{'PrefixIndex':<14}{prefix_time * 1000:>14.2f}{prefix_bytes / 1024:>14.1f}")
+    print("note: both include creating the suggestions")
+
+
+if __name__ == "__main__":
+    main()
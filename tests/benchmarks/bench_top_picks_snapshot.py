@@ -0,0 +1,85 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the time for the Top Picks provider to load its indexes and results
+from a memory-mapped snapshot against building them from the domain list file.
+
+Both go through the provider itself, i.e. `Provider.read_domain_list()` and
+`Provider.build_index()` for the build, and `Provider.snapshot_source()` and
+`Provider.load_snapshot()` for the snapshot written from the build.
+
+Usage:
+    $ MERINO_ENV=testing python -m tests.benchmarks.bench_top_picks_snapshot [FILE]
+
+where `FILE` is a Top Picks domain list (defaults to `dev/top_picks.json`).
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Any
+
+from merino.providers.top_picks import Provider
+
+
+def query(index_results: dict[str, Any], domains: list[str]) -> list[int]:
+    """Look up the domains and access their results."""
+    ids = []
+    for domain in domains:
+        if (id := index_results["primary_index"].get(domain)) is None:
+            id = index_results["short_domain_index"].get(domain)
+        if id is not None:
+            index_results["results"][id]
+            ids.append(id)
+    return ids
+
+
+def run(file: str, snapshot_path: str) -> None:
+    """Run the benchmark and print the report."""
+    begin = time.perf_counter()
+    built = Provider.build_index(Provider.read_domain_list(file))
+    build_time = time.perf_counter() - begin
+
+    source = Provider.snapshot_source(file)
+    begin = time.perf_counter()
+    Provider.write_snapshot(snapshot_path, source, built)
+    write_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    loaded = Provider.load_snapshot(snapshot_path, Provider.snapshot_source(file))
+    load_time = time.perf_counter() - begin
+    assert loaded is not None
+
+    # Query every domain, which pages in the snapshot and decodes all the results.
+    domains = [result.url.split("/")[2] for result in built["results"]]
+    begin = time.perf_counter()
+    loaded_ids = query(loaded, domains)
+    first_queries_time = time.perf_counter() - begin
+    begin = time.perf_counter()
+    built_ids = query(built, domains)
+    built_queries_time = time.perf_counter() - begin
+    assert loaded_ids == built_ids
+    assert all(loaded["results"][id] == built["results"][id] for id in loaded_ids)
+
+    print(f"domains: {len(built['results']):,}")
+    print(f"snapshot size: {os.path.getsize(snapshot_path) / 2**10:.2f} KiB")
+    print(f"{'build (ms)':<28}{build_time * 1e3:>10.2f}")
+    print(f"{'write snapshot (ms)':<28}{write_time * 1e3:>10.2f}")
+    print(f"{'load snapshot (ms)':<28}{load_time * 1e3:>10.2f}")
+    print(
+        f"{f'first {len(domains)} queries (ms)':<28}{first_queries_time * 1e3:>10.2f}"
+    )
+    print(f"{'same on built (ms)':<28}{built_queries_time * 1e3:>10.2f}")
+
+
+def main() -> None:
+    """Run the benchmark in a temporary directory."""
+    file = sys.argv[1] if len(sys.argv) > 1 else "dev/top_picks.json"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run(file, os.path.join(tmp_dir, "top_picks.snapshot"))
+
+
+if __name__ == "__main__":
+    main()
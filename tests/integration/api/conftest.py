@@ -11,10 +11,19 @@ import pytest
 from starlette.testclient import TestClient
 
 from merino.main import app
+from merino.middleware.user_agent import user_agent_cache
 from merino.utils.log_data_creators import RequestSummaryLogDataModel
 from tests.integration.api.types import RequestSummaryLogDataFixture
 
 
+@pytest.fixture(autouse=True)
+def fixture_clear_user_agent_cache() -> None:
+    """Start each test with an empty user agent cache, so that the recorded cache
+    metrics don't depend on the order of tests.
+    """
+    user_agent_cache.clear()
+
+
 @pytest.fixture(name="client")
 def fixture_test_client() -> TestClient:
     """Return a FastAPI TestClient instance.
@@ -6,17 +6,77 @@
 
 import logging
 from logging import LogRecord
+from typing import Iterator
 
 import pytest
 from _pytest.logging import LogCaptureFixture
 from fastapi.testclient import TestClient
 from freezegun import freeze_time
+from pytest_mock import MockerFixture
 
+from merino.main import app
+from merino.providers import get_providers
+from merino.providers.base import BaseProvider, BaseSuggestion, SuggestionRequest
 from merino.utils.log_data_creators import RequestSummaryLogDataModel
 from tests.integration.api.types import RequestSummaryLogDataFixture
 from tests.types import FilterCaplogFixture
 
 
+class DataProvider(BaseProvider):
+    """A provider fake with data of a given readiness and age."""
+
+    def __init__(
+        self,
+        name: str,
+        ready: bool,
+        age: float | None,
+        enabled_by_default: bool = True,
+    ) -> None:
+        self._name = name
+        self._enabled_by_default = enabled_by_default
+        self.ready = ready
+        self.age = age
+
+    async def initialize(self) -> None:
+        """Initialize method for the DataProvider."""
+        ...
+
+    def hidden(self) -> bool:
+        """Return boolean indicating whether the provider is hidden."""
+        return False
+
+    def is_ready(self) -> bool:
+        """Return the readiness of the fake."""
+        return self.ready
+
+    def data_age_sec(self) -> float | None:
+        """Return the data age of the fake."""
+        return self.age
+
+    async def query(self, srequest: SuggestionRequest) -> list[BaseSuggestion]:
+        """Query against the DataProvider."""
+        return []
+
+
+@pytest.fixture(name="providers")
+def fixture_providers() -> Iterator[dict[str, BaseProvider]]:
+    """Override the application providers with ready ones for the duration of a
+    test. Tests can add or mutate the returned providers.
+    """
+    providers: dict[str, BaseProvider] = {
+        "fresh": DataProvider("fresh", ready=True, age=60.0),
+        "dataless": DataProvider("dataless", ready=True, age=None),
+    }
+
+    async def get_test_providers() -> tuple[dict[str, BaseProvider], list]:
+        return providers, list(providers.values())
+
+    app.dependency_overrides[get_providers] = get_test_providers
+    yield providers
+    del app.dependency_overrides[get_providers]
+
+
+@pytest.mark.usefixtures("providers")
 @pytest.mark.parametrize("endpoint", ["__heartbeat__", "__lbheartbeat__"])
 def test_heartbeats(client: TestClient, endpoint: str) -> None:
     """Test that the heartbeat endpoint is supported to conform to dockerflow"""
@@ -25,7 +85,80 @@ def test_heartbeats(client: TestClient, endpoint: str) -> None:
     assert response.status_code == 200
 
 
+def test_heartbeat_providers_ready(
+    client: TestClient, providers: dict[str, BaseProvider]
+) -> None:
+    """Test that the heartbeat reports the readiness and data age of each provider."""
+    response = client.get("/__heartbeat__")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "ok",
+        "checks": {"providers.fresh": "ok", "providers.dataless": "ok"},
+        "details": {
+            "providers.fresh": {"ready": True, "data_age_sec": 60.0},
+            "providers.dataless": {"ready": True, "data_age_sec": None},
+        },
+    }
+
+
+def test_heartbeat_provider_not_ready(
+    client: TestClient, providers: dict[str, BaseProvider]
+) -> None:
+    """Test that the heartbeat fails until all the providers enabled by default have
+    loaded their data.
+    """
+    providers["loading"] = DataProvider("loading", ready=False, age=None)
+
+    response = client.get("/__heartbeat__")
+
+    assert response.status_code == 500
+    assert response.json()["status"] == "error"
+    assert response.json()["checks"]["providers.loading"] == "error"
+    assert response.json()["checks"]["providers.fresh"] == "ok"
+
+
+def test_heartbeat_provider_not_ready_disabled_by_default(
+    client: TestClient, providers: dict[str, BaseProvider]
+) -> None:
+    """Test that the heartbeat warns about providers disabled by default that aren't
+    ready without failing, as they don't hold back the default suggestions.
+    """
+    providers["optional"] = DataProvider(
+        "optional", ready=False, age=None, enabled_by_default=False
+    )
+
+    response = client.get("/__heartbeat__")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "warning"
+    assert response.json()["checks"]["providers.optional"] == "warning"
+    assert response.json()["details"]["providers.optional"] == {
+        "ready": False,
+        "data_age_sec": None,
+    }
+
+
+def test_heartbeat_provider_stale(
+    mocker: MockerFixture, client: TestClient, providers: dict[str, BaseProvider]
+) -> None:
+    """Test that the heartbeat warns about stale providers without failing."""
+    mocker.patch("merino.web.dockerflow.MAX_DATA_AGE_SEC", 3600.0)
+    providers["stale"] = DataProvider("stale", ready=True, age=7200.0)
+
+    response = client.get("/__heartbeat__")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "warning"
+    assert response.json()["checks"]["providers.stale"] == "warning"
+    assert response.json()["details"]["providers.stale"] == {
+        "ready": True,
+        "data_age_sec": 7200.0,
+    }
+
+
 @freeze_time("1998-03-31")
+@pytest.mark.usefixtures("providers")
 @pytest.mark.parametrize("endpoint", ["__heartbeat__", "__lbheartbeat__"])
 def test_heartbeat_request_log_data(
     caplog: LogCaptureFixture,
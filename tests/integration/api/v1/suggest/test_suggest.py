@@ -4,21 +4,36 @@
 
 """Integration tests for the Merino v1 suggest API endpoint."""
 
+import asyncio
 import logging
 from typing import Any
 
 import aiodogstatsd
 import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 from freezegun import freeze_time
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
 
+from merino.middleware.geolocation import Location
+from merino.providers.accuweather import (
+    AccuweatherLocation,
+    CurrentConditions,
+    Forecast,
+)
+from merino.providers.accuweather import Provider as AccuweatherProvider
+from merino.providers.accuweather import Temperature
+from merino.providers.base import SuggestionRequest
+from merino.utils.cache import TTLCache
 from merino.utils.log_data_creators import SuggestLogDataModel
+from merino.web.models_v1 import SuggestResponse
 from tests.integration.api.v1.fake_providers import (
     CorruptProvider,
     NonsponsoredProvider,
     SponsoredProvider,
+    TimeoutSponsoredProvider,
 )
 from tests.integration.api.v1.types import Providers
 from tests.types import FilterCaplogFixture
@@ -37,6 +52,15 @@ def fixture_providers() -> Providers:
     }
 
 
+@pytest.fixture(name="response_cache")
+def fixture_response_cache(mocker: MockerFixture) -> TTLCache:
+    """Enable the suggest response cache, which is disabled for testing."""
+    cache: TTLCache = TTLCache(10, 60)
+    mocker.patch("merino.web.api_v1.RESPONSE_CACHE_MAX_SIZE", cache.max_size)
+    mocker.patch("merino.web.api_v1.response_cache", cache)
+    return cache
+
+
 def test_suggest_sponsored(client: TestClient) -> None:
     """Test that the suggest endpoint response is as expected using a sponsored
     provider.
@@ -139,6 +163,7 @@ def test_suggest_request_log_data(
         browser="Firefox(103.0)",
         os_family="macos",
         form_factor="desktop",
+        sample_rate=1.0,
     )
 
     client.get(
@@ -183,6 +208,7 @@ def test_suggest_request_log_data(
         "browser": record.__dict__["browser"],
         "os_family": record.__dict__["os_family"],
         "form_factor": record.__dict__["form_factor"],
+        "sample_rate": record.__dict__["sample_rate"],
     }
     assert log_data == expected_log_data.dict()
 
@@ -211,6 +237,7 @@ def test_suggest_with_invalid_geolocation_ip(
         (
             "/api/v1/suggest?q=none",
             [
+                "user_agent.cache.miss",
                 "providers.sponsored.query",
                 "providers.non-sponsored.query",
                 "suggestions-per.request",
@@ -224,6 +251,7 @@ def test_suggest_with_invalid_geolocation_ip(
         (
             "/api/v1/suggest",
             [
+                "user_agent.cache.miss",
                 "get.api.v1.suggest.timing",
                 "get.api.v1.suggest.status_codes.400",
                 "response.status_codes.400",
@@ -255,6 +283,7 @@ def test_suggest_metrics_500(mocker: MockerFixture, client: TestClient) -> None:
     """Test that 500 status codes are recorded as metrics."""
     error_msg = "test"
     expected_metric_keys = [
+        "user_agent.cache.miss",
         "providers.corrupted.query",
         "get.api.v1.suggest.timing",
         "get.api.v1.suggest.status_codes.500",
@@ -279,6 +308,7 @@ def test_suggest_metrics_500(mocker: MockerFixture, client: TestClient) -> None:
         (
             "/api/v1/suggest?q=none",
             [
+                "user_agent.cache.miss",
                 "providers.sponsored.query",
                 "providers.non-sponsored.query",
                 "suggestions-per.request",
@@ -293,6 +323,7 @@ def test_suggest_metrics_500(mocker: MockerFixture, client: TestClient) -> None:
         (
             "/api/v1/suggest",
             [
+                "user_agent.cache.miss",
                 "get.api.v1.suggest.timing",
                 "get.api.v1.suggest.status_codes.400",
                 "response.status_codes.400",
@@ -323,9 +354,159 @@ def test_suggest_feature_flags_tags_in_metrics(
     # TODO: Remove reliance on internal details of aiodogstatsd
     feature_flag_tags_per_metric = {
         call.args[0]: [
-            tag for tag in call.args[3].keys() if tag.startswith("feature_flag.")
+            tag
+            for tag in (call.args[3] or {}).keys()
+            if tag.startswith("feature_flag.")
         ]
         for call in report.call_args_list
     }
 
     assert expected_tags_per_metric == feature_flag_tags_per_metric
+
+
+def test_suggest_response_serialization(client: TestClient) -> None:
+    """Test that the response body is identical to serializing `SuggestResponse`
+    with `jsonable_encoder()`.
+    """
+    response = client.get("/api/v1/suggest?q=sponsored&client_variants=foo,bar")
+    assert response.status_code == 200
+
+    suggestions = asyncio.run(
+        SponsoredProvider(enabled_by_default=True).query(
+            SuggestionRequest(query="sponsored", geolocation=Location())
+        )
+    )
+    expected = SuggestResponse(
+        suggestions=suggestions,
+        request_id=response.json()["request_id"],
+        client_variants=["foo", "bar"],
+    )
+    assert response.content == JSONResponse(content=jsonable_encoder(expected)).body
+
+
+def test_suggest_response_cache(
+    mocker: MockerFixture,
+    client: TestClient,
+    response_cache: TTLCache,
+    providers: Providers,
+) -> None:
+    """Test that the suggestions of a request are cached, and that cache hits only
+    differ by the per-request fields of the response.
+    """
+    query_spy = mocker.spy(SponsoredProvider, "query")
+    report = mocker.patch.object(aiodogstatsd.Client, "_report")
+
+    first = client.get("/api/v1/suggest?q=sponsored&client_variants=foo")
+    second = client.get("/api/v1/suggest?q=sponsored&providers=non-sponsored,sponsored")
+
+    assert query_spy.call_count == 1
+    assert len(response_cache) == 1
+    assert second.status_code == 200
+    assert second.headers["content-type"] == "application/json"
+    assert second.json()["suggestions"] == first.json()["suggestions"]
+    assert second.json()["client_variants"] == []
+    assert second.json()["request_id"] != first.json()["request_id"]
+    metric_names = [call.args[0] for call in report.call_args_list]
+    assert metric_names.count("suggest.cache.miss") == 1
+    assert metric_names.count("suggest.cache.hit") == 1
+    assert metric_names.count("providers.sponsored.query") == 1
+    assert metric_names.count("suggestions-per.provider.sponsored") == 2
+
+    # The cache is keyed by the query and the set of queried providers.
+    client.get("/api/v1/suggest?q=Sponsored")
+    client.get("/api/v1/suggest?q=sponsored&providers=sponsored")
+
+    assert query_spy.call_count == 3
+
+    # Refreshing the data of a provider invalidates the cached responses.
+    providers["sponsored"].data_version += 1
+    client.get("/api/v1/suggest?q=sponsored")
+
+    assert query_spy.call_count == 4
+
+
+def test_suggest_response_cache_geolocation(
+    mocker: MockerFixture,
+    client: TestClient,
+    response_cache: TTLCache,
+) -> None:
+    """Test that the cache is only keyed by the geolocation fields used by the
+    queried providers.
+    """
+    mocker.patch.object(SponsoredProvider, "geolocation_fields", ("country",))
+    query_spy = mocker.spy(SponsoredProvider, "query")
+    mock_client = mocker.patch("fastapi.Request.client")
+
+    # The IP addresses are taken from `GeoLite2-City-Test.mmdb`.
+    for host in ["216.160.83.56", "2.125.160.216", "81.2.69.142"]:
+        mock_client.host = host
+        client.get("/api/v1/suggest?q=sponsored")
+
+    # The first address is in the US, the others are in the UK.
+    assert query_spy.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "providers",
+    [
+        {
+            "sponsored": SponsoredProvider(enabled_by_default=True),
+            "timedout-sponsored": TimeoutSponsoredProvider(enabled_by_default=True),
+        }
+    ],
+)
+def test_suggest_response_cache_timeout(
+    client: TestClient, response_cache: TTLCache
+) -> None:
+    """Test that partial responses with timed out providers aren't cached."""
+    response = client.get("/api/v1/suggest?q=sponsored")
+
+    assert len(response.json()["suggestions"]) == 1
+    assert len(response_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "providers", [{"accuweather": AccuweatherProvider(enabled_by_default=True)}]
+)
+def test_suggest_response_cache_provider_failure(
+    mocker: MockerFixture, client: TestClient, response_cache: TTLCache
+) -> None:
+    """Test that responses with providers failing without raising, e.g. upon
+    AccuWeather upstream errors, aren't cached.
+    """
+    mocker.patch("fastapi.Request.client").host = "216.160.83.56"
+    mocker.patch.object(
+        AccuweatherProvider,
+        "_fetch_location",
+        side_effect=[
+            None,
+            AccuweatherLocation(key="41333_PC", localized_name="Milton"),
+        ],
+    )
+    mocker.patch.object(
+        AccuweatherProvider,
+        "_fetch_current_conditions",
+        return_value=CurrentConditions(
+            url="https://www.accuweather.com/current",
+            summary="Mostly sunny",
+            icon_id=2,
+            temperature=Temperature(c=15),
+        ),
+    )
+    mocker.patch.object(
+        AccuweatherProvider,
+        "_fetch_forecast",
+        return_value=Forecast(
+            url="https://www.accuweather.com/forecast",
+            summary="Pleasant Saturday",
+            high=Temperature(c=20),
+            low=Temperature(c=10),
+        ),
+    )
+
+    failed = client.get("/api/v1/suggest?q=weather")
+    succeeded = client.get("/api/v1/suggest?q=weather")
+
+    assert failed.json()["suggestions"] == []
+    assert len(succeeded.json()["suggestions"]) == 1
+    assert len(response_cache) == 1
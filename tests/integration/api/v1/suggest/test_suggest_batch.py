@@ -0,0 +1,128 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Integration tests for the Merino v1 batch suggest API endpoint."""
+
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from merino.providers.base import BaseSuggestion, SuggestionRequest
+from tests.integration.api.v1.fake_providers import (
+    CorruptProvider,
+    NonsponsoredProvider,
+    SponsoredProvider,
+)
+from tests.integration.api.v1.types import Providers
+
+
+@pytest.fixture(name="providers")
+def fixture_providers() -> Providers:
+    """Define providers for this module which are injected automatically."""
+    return {
+        "sponsored": SponsoredProvider(enabled_by_default=True),
+        "non-sponsored": NonsponsoredProvider(enabled_by_default=True),
+    }
+
+
+def parse_lines(content: bytes) -> list[dict[str, Any]]:
+    """Parse a newline delimited JSON body, ordered by query index."""
+    lines: list[dict[str, Any]] = [json.loads(line) for line in content.splitlines()]
+    return sorted(lines, key=lambda line: int(line["index"]))
+
+
+def test_suggest_batch(client: TestClient) -> None:
+    """Test that the batch suggest endpoint streams the suggestions of each query,
+    which are the same as those of the suggest endpoint.
+    """
+    queries = ["sponsored", "nonsponsored", "nope", "sponsored"]
+
+    response = client.post("/api/v1/suggest/batch", json={"queries": queries})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = parse_lines(response.content)
+    assert [(line["index"], line["query"]) for line in lines] == list(
+        enumerate(queries)
+    )
+    for line in lines:
+        expected = client.get(f"/api/v1/suggest?q={line['query']}").json()
+        assert line["suggestions"] == expected["suggestions"]
+
+
+def test_suggest_batch_providers(client: TestClient) -> None:
+    """Test that the batch suggest endpoint only queries the requested providers."""
+    response = client.post(
+        "/api/v1/suggest/batch",
+        json={"queries": ["sponsored", "nonsponsored"], "providers": "sponsored"},
+    )
+
+    assert response.status_code == 200
+    lines = parse_lines(response.content)
+    assert [len(line["suggestions"]) for line in lines] == [1, 0]
+
+
+@pytest.mark.parametrize(
+    "providers",
+    [
+        {
+            "sponsored": SponsoredProvider(enabled_by_default=True),
+            "corrupt": CorruptProvider(),
+        }
+    ],
+)
+def test_suggest_batch_query_error(
+    mocker: MockerFixture, client: TestClient, providers: Providers
+) -> None:
+    """Test that a failed query is reported in its line, while the other queries
+    still stream their suggestions.
+    """
+    corrupt_query = providers["corrupt"].query
+
+    async def query(srequest: SuggestionRequest) -> list[BaseSuggestion]:
+        return await corrupt_query(srequest) if srequest.query == "corrupt" else []
+
+    mocker.patch.object(providers["corrupt"], "query", side_effect=query)
+
+    response = client.post(
+        "/api/v1/suggest/batch", json={"queries": ["sponsored", "corrupt", "nope"]}
+    )
+
+    assert response.status_code == 200
+    lines = parse_lines(response.content)
+    assert lines[1] == {
+        "index": 1,
+        "query": "corrupt",
+        "error": "Failed to query suggestions",
+    }
+    assert [len(lines[0]["suggestions"]), len(lines[2]["suggestions"])] == [1, 0]
+
+
+def test_suggest_batch_empty(client: TestClient) -> None:
+    """Test that the batch suggest endpoint returns an empty body without queries."""
+    response = client.post("/api/v1/suggest/batch", json={"queries": []})
+
+    assert response.status_code == 200
+    assert response.content == b""
+
+
+def test_suggest_batch_too_many_queries(
+    mocker: MockerFixture, client: TestClient
+) -> None:
+    """Test that batches with too many queries are rejected."""
+    mocker.patch("merino.web.api_v1.BATCH_MAX_QUERIES", 2)
+
+    response = client.post("/api/v1/suggest/batch", json={"queries": ["a", "b", "c"]})
+
+    assert response.status_code == 400
+
+
+def test_suggest_batch_invalid_body(client: TestClient) -> None:
+    """Test that batches without queries are rejected."""
+    response = client.post("/api/v1/suggest/batch", json={"providers": "sponsored"})
+
+    assert response.status_code == 400
@@ -47,6 +47,7 @@ SCENARIOS: dict[str, Scenario] = {
             "Cancelling the task: timedout-sponsored due to timeout",
         },
         expected_metric_keys={
+            "user_agent.cache.miss",
             "providers.timedout-sponsored.query",
             "providers.timedout-sponsored.query.timeout",
             "suggestions-per.request",
@@ -73,6 +74,7 @@ SCENARIOS: dict[str, Scenario] = {
             "Cancelling the task: timedout-sponsored due to timeout",
         },
         expected_metric_keys={
+            "user_agent.cache.miss",
             "providers.sponsored.query",
             "providers.timedout-sponsored.query",
             "providers.timedout-sponsored.query.timeout",
@@ -100,6 +102,7 @@ SCENARIOS: dict[str, Scenario] = {
         expected_suggestion_count=1,
         expected_logs_on_task_runner=set(),
         expected_metric_keys={
+            "user_agent.cache.miss",
             "providers.timedout-tolerant-sponsored.query",
             "suggestions-per.request",
             "suggestions-per.provider.timedout-tolerant-sponsored",
@@ -112,10 +115,11 @@ SCENARIOS: dict[str, Scenario] = {
     #          provider.
     #
     #   - Expects:
-    #     - 3 suggestions returned from all three providers since the max timeout is overridden
-    #       by the timed-out-tolerant provider
-    #     - Timeout logs should not be recorded in the task runner
-    #     - Timeout metrics should not be recorded in the task runner
+    #     - 2 suggestions returned from the non-timed-out and the timed-out-tolerant
+    #       providers, the timed-out provider is cancelled upon its own timeout rather
+    #       than waiting for the timeout of the timed-out-tolerant provider
+    #     - Timeout logs recorded in the task runner
+    #     - Timeout metrics recorded in the task runner
     "Case-IV: A-non-timed-out-and-a-timed-out-tolerant-and-a-timed-out-providers": Scenario(
         providers={
             "sponsored": SponsoredProvider(enabled_by_default=True),
@@ -124,11 +128,16 @@ SCENARIOS: dict[str, Scenario] = {
                 enabled_by_default=True
             ),
         },
-        expected_suggestion_count=3,
-        expected_logs_on_task_runner=set(),
+        expected_suggestion_count=2,
+        expected_logs_on_task_runner={
+            "Timeout triggered in the task runner",
+            "Cancelling the task: timedout-sponsored due to timeout",
+        },
         expected_metric_keys={
+            "user_agent.cache.miss",
             "providers.sponsored.query",
             "providers.timedout-sponsored.query",
+            "providers.timedout-sponsored.query.timeout",
             "providers.timedout-tolerant-sponsored.query",
             "suggestions-per.request",
             "suggestions-per.provider.timedout-tolerant-sponsored",
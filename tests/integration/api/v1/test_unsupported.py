@@ -94,6 +94,6 @@ def test_unsupported_endpoint_flags(mocker: MockerFixture, client: TestClient) -
 
     # TODO: Remove reliance on internal details of aiodogstatsd
     tags_per_metric: dict[str, list[str]] = {
-        call.args[0]: [*call.args[3].keys()] for call in report.call_args_list
+        call.args[0]: [*(call.args[3] or {}).keys()] for call in report.call_args_list
     }
     assert tags_per_metric == expected_tags_per_metric
@@ -13,8 +13,8 @@ from starlette.types import Receive, Scope, Send
 
 @pytest.fixture(name="scope")
 def fixture_scope() -> Scope:
-    """Create a Scope object for test."""
-    scope: Scope = {"type": "http"}
+    """Create a Scope object of a suggest request for test."""
+    scope: Scope = {"type": "http", "path": "/api/v1/suggest"}
     return scope
 
 
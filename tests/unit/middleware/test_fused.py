@@ -0,0 +1,179 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the middleware fused module."""
+
+import logging
+from typing import Any, Callable
+
+import aiodogstatsd
+import pytest
+from asgi_correlation_id import CorrelationIdMiddleware
+from asgi_correlation_id.context import correlation_id
+from freezegun import freeze_time
+from pytest import LogCaptureFixture
+from pytest_mock import MockerFixture
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from merino.featureflags import FeatureFlags, session_id_context
+from merino.metrics import Client
+from merino.middleware import ScopeKey
+from merino.middleware.featureflags import FeatureFlagsMiddleware
+from merino.middleware.fused import FusedMiddleware
+from merino.middleware.geolocation import GeolocationMiddleware, location_cache
+from merino.middleware.logging import LoggingMiddleware
+from merino.middleware.metrics import MetricsMiddleware
+from merino.middleware.user_agent import UserAgentMiddleware, user_agent_cache
+
+# Log record attributes that vary between runs.
+IGNORED_ATTRS: set[str] = {
+    "created",
+    "msecs",
+    "relativeCreated",
+    "lineno",
+    "funcName",
+    "pathname",
+    "filename",
+    "module",
+}
+
+USER_AGENT: bytes = (
+    b"Mozilla/5.0 (Macintosh; Intel Mac OS X 11.2; rv:85.0) "
+    b"Gecko/20100101 Firefox/103.0"
+)
+
+
+def make_stack(app: ASGIApp) -> ASGIApp:
+    """Wrap the app in the middleware stack replaced by `FusedMiddleware`, in
+    the same order as `merino.main`.
+    """
+    return LoggingMiddleware(
+        UserAgentMiddleware(
+            GeolocationMiddleware(
+                FeatureFlagsMiddleware(CorrelationIdMiddleware(MetricsMiddleware(app)))
+            )
+        )
+    )
+
+
+async def run(
+    make_middleware: Callable[[ASGIApp], ASGIApp],
+    scope: Scope,
+    receive: Receive,
+    status: int | None,
+) -> dict[str, Any]:
+    """Run a request through a middleware and return what the app and the client
+    observed. If `status` is `None`, the app raises an exception.
+    """
+    observed: dict[str, Any] = {"sent": []}
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        observed["session_id"] = session_id_context.get()
+        observed["correlation_id"] = correlation_id.get()
+        if status is None:
+            raise RuntimeError("failed")
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message: Message) -> None:
+        observed["sent"].append(message)
+
+    try:
+        await make_middleware(app)(scope, receive, send)
+    except RuntimeError:
+        observed["raised"] = True
+    return observed
+
+
+@pytest.fixture(name="scope")
+def fixture_scope() -> Scope:
+    """Create a Scope object of a suggest request."""
+    return {
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("localhost", 8000),
+        "path": "/api/v1/suggest",
+        "query_string": b"q=nope&sid=deadbeef&seq=1&client_variants=foo",
+        "headers": [
+            (b"user-agent", USER_AGENT),
+            (b"x-request-id", b"1b11844c52b34c33a6ad54b7bc2eb7c7"),
+        ],
+        # The IP address is taken from `GeoLite2-City-Test.mmdb`
+        "client": ("216.160.83.56", 50000),
+    }
+
+
+@freeze_time("1998-03-31")
+@pytest.mark.parametrize("path", ["/api/v1/suggest", "/__heartbeat__", "/nope"])
+@pytest.mark.parametrize("status", [200, 404, None])
+@pytest.mark.parametrize(
+    "request_id", [b"1b11844c52b34c33a6ad54b7bc2eb7c7", b"invalid", None]
+)
+@pytest.mark.asyncio
+async def test_same_outputs_as_stack(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    receive_mock: Receive,
+    scope: Scope,
+    path: str,
+    status: int | None,
+    request_id: bytes | None,
+) -> None:
+    """Test that the fused middleware has the same outputs as the middleware stack."""
+    caplog.set_level(logging.INFO)
+    report = mocker.patch.object(aiodogstatsd.Client, "_report")
+    mocker.patch("merino.middleware.fused.uuid4").return_value.hex = "generated"
+    mocker.patch("asgi_correlation_id.middleware.uuid4").return_value.hex = "generated"
+    scope["path"] = path
+    scope["headers"] = [
+        header for header in scope["headers"] if header[0] != b"x-request-id"
+    ] + ([(b"x-request-id", request_id)] if request_id else [])
+    outputs = []
+
+    make_middlewares: list[Callable[[ASGIApp], ASGIApp]] = [
+        make_stack,
+        FusedMiddleware,
+    ]
+    for make_middleware in make_middlewares:
+        caplog.clear()
+        report.reset_mock()
+        location_cache.clear()
+        user_agent_cache.clear()
+        session_id_context.set(None)
+        request_scope = dict(scope)
+        observed = await run(make_middleware, request_scope, receive_mock, status)
+        outputs.append(
+            {
+                **observed,
+                "geolocation": request_scope.get(ScopeKey.GEOLOCATION),
+                "user_agent": request_scope.get(ScopeKey.USER_AGENT),
+                "feature_flags": type(request_scope[ScopeKey.FEATURE_FLAGS]),
+                "metrics_client": type(request_scope[ScopeKey.METRICS_CLIENT]),
+                "logs": [
+                    (record.name, record.levelname, record.getMessage())
+                    for record in caplog.records
+                ],
+                "log_data": [
+                    {k: v for k, v in vars(record).items() if k not in IGNORED_ATTRS}
+                    for record in caplog.records
+                ],
+                # Timing values differ, only compare the metric names and types.
+                "metrics": [call.args[:2] for call in report.call_args_list],
+            }
+        )
+
+    stack_outputs, fused_outputs = outputs
+    assert fused_outputs == stack_outputs
+    assert fused_outputs["feature_flags"] is FeatureFlags
+    assert fused_outputs["metrics_client"] is Client
+    if path == "/api/v1/suggest":
+        assert fused_outputs["session_id"] == "deadbeef"
+        assert fused_outputs["geolocation"] is not None
+        assert fused_outputs["user_agent"] is not None
+    else:
+        assert fused_outputs["session_id"] is None
+        assert fused_outputs["geolocation"] is None
+        assert fused_outputs["user_agent"] is None
+    assert fused_outputs["metrics"]
@@ -4,13 +4,24 @@
 
 """Unit tests for the middleware geolocation module."""
 
+import aiodogstatsd
 import pytest
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from merino.middleware import ScopeKey
-from merino.middleware.geolocation import GeolocationMiddleware, Location
+from merino.middleware import ScopeKey, geolocation
+from merino.middleware.geolocation import (
+    GeolocationMiddleware,
+    Location,
+    location_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_location_cache() -> None:
+    """Start each test with an empty location cache."""
+    location_cache.clear()
 
 
 @pytest.fixture(name="geolocation_middleware")
@@ -144,3 +155,85 @@ async def test_geolocation_invalid_scope_type(
 
     assert ScopeKey.GEOLOCATION not in scope
     assert len(caplog.messages) == 0
+
+
+@pytest.mark.asyncio
+async def test_geolocation_cache(
+    mocker: MockerFixture,
+    geolocation_middleware: GeolocationMiddleware,
+    scope: Scope,
+    receive_mock: Receive,
+    send_mock: Send,
+) -> None:
+    """Test that repeated lookups of an IP address are served from the cache, and
+    that cache hits and misses are recorded.
+    """
+    expected_location: Location = Location(
+        country="US", region="WA", city="Milton", dma=819, postal_code="98354"
+    )
+    city_spy = mocker.spy(geolocation.get_reader(), "city")
+    increment_mock = mocker.patch.object(aiodogstatsd.Client, "increment")
+
+    for client_ip_and_port in [
+        ["216.160.83.56", 50000],
+        ["216.160.83.56", 50001],
+        ["255.255.255.255", 50000],
+        ["255.255.255.255", 50000],
+    ]:
+        scope["client"] = client_ip_and_port
+        await geolocation_middleware(scope, receive_mock, send_mock)
+
+    assert scope[ScopeKey.GEOLOCATION] == Location()
+    assert location_cache.get("216.160.83.56") == expected_location
+    assert city_spy.call_count == 2
+    assert increment_mock.call_args_list == [
+        mocker.call("geolocation.cache.miss"),
+        mocker.call("geolocation.cache.hit"),
+        mocker.call("geolocation.cache.miss"),
+        mocker.call("geolocation.cache.hit"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_geolocation_cache_disabled(
+    mocker: MockerFixture,
+    geolocation_middleware: GeolocationMiddleware,
+    scope: Scope,
+    receive_mock: Receive,
+    send_mock: Send,
+) -> None:
+    """Test that every lookup queries the database when the cache is disabled."""
+    mocker.patch.object(location_cache, "max_size", 0)
+    city_spy = mocker.spy(geolocation.get_reader(), "city")
+    increment_mock = mocker.patch.object(aiodogstatsd.Client, "increment")
+    scope["client"] = ["216.160.83.56", 50000]
+
+    await geolocation_middleware(scope, receive_mock, send_mock)
+    await geolocation_middleware(scope, receive_mock, send_mock)
+
+    assert city_spy.call_count == 2
+    assert len(location_cache) == 0
+    increment_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "path", ["/__heartbeat__", "/__lbheartbeat__", "/api/v1/providers"]
+)
+@pytest.mark.asyncio
+async def test_geolocation_skipped_path(
+    mocker: MockerFixture,
+    geolocation_middleware: GeolocationMiddleware,
+    scope: Scope,
+    receive_mock: Receive,
+    send_mock: Send,
+    path: str,
+) -> None:
+    """Test that no lookup takes place for endpoints not consuming the geolocation."""
+    city_spy = mocker.spy(geolocation.get_reader(), "city")
+    scope["path"] = path
+    scope["client"] = ["216.160.83.56", 50000]
+
+    await geolocation_middleware(scope, receive_mock, send_mock)
+
+    assert ScopeKey.GEOLOCATION not in scope
+    city_spy.assert_not_called()
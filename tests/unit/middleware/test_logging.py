@@ -5,13 +5,23 @@
 """Unit tests for the middleware logging module."""
 
 import logging
+from uuid import uuid4
 
 import pytest
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from merino.middleware.logging import LoggingMiddleware
+from merino.middleware import ScopeKey
+from merino.middleware.geolocation import Location
+from merino.middleware.logging import (
+    LoggingMiddleware,
+    get_suggest_sample_rate,
+    is_sampled,
+    log_request,
+)
+from merino.middleware.user_agent import UserAgent
 
 
 @pytest.mark.asyncio
@@ -31,3 +41,91 @@ async def test_logging_invalid_scope_type(
     await logging_middleware(scope, receive_mock, send_mock)
 
     assert len(caplog.messages) == 0
+
+
+@pytest.mark.parametrize(
+    ["status", "expected_rate"],
+    [(200, 0.1), (404, 0.5), (400, 1.0), (503, 1.0), (301, 0.1)],
+    ids=["default", "status_class", "status_code", "other_status_class", "fallback"],
+)
+def test_get_suggest_sample_rate(
+    mocker: MockerFixture, status: int, expected_rate: float
+) -> None:
+    """Test that status code overrides take precedence over status class ones, which
+    take precedence over the default sample rate.
+    """
+    mocker.patch("merino.middleware.logging.SUGGEST_SAMPLE_RATE", 0.1)
+    mocker.patch(
+        "merino.middleware.logging.SUGGEST_SAMPLE_RATES",
+        {"4xx": 0.5, "400": 1.0, "5xx": 1.0},
+    )
+
+    assert get_suggest_sample_rate(status) == expected_rate
+
+
+def test_is_sampled() -> None:
+    """Test that the sampling decision is deterministic on the session ID and
+    roughly follows the sample rate.
+    """
+    session_ids: list[str] = [str(uuid4()) for _ in range(2000)]
+
+    sampled: list[str] = [sid for sid in session_ids if is_sampled(sid, 0.25)]
+
+    assert 400 < len(sampled) < 600
+    assert all(is_sampled(sid, 0.25) for sid in sampled)
+    # Sessions sampled at a rate are also sampled at any higher rate.
+    assert all(is_sampled(sid, 0.5) for sid in sampled)
+    assert all(is_sampled(sid, 1.0) for sid in session_ids)
+    assert not any(is_sampled(sid, 0.0) for sid in session_ids)
+
+
+def test_is_sampled_without_session_id(mocker: MockerFixture) -> None:
+    """Test that requests without a session ID are sampled at random."""
+    mocker.patch("merino.middleware.logging.random", side_effect=[0.2, 0.3])
+
+    assert is_sampled(None, 0.25)
+    assert not is_sampled(None, 0.25)
+
+
+@pytest.mark.parametrize(
+    ["status", "expected_records"],
+    [(200, 0), (500, 1)],
+    ids=["sampled_out", "status_override"],
+)
+def test_log_request_sampling(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    status: int,
+    expected_records: int,
+) -> None:
+    """Test that suggest requests are only logged when sampled, along with their
+    sample rate.
+    """
+    caplog.set_level(logging.INFO)
+    mocker.patch("merino.middleware.logging.SUGGEST_SAMPLE_RATE", 0.0)
+    mocker.patch("merino.middleware.logging.SUGGEST_SAMPLE_RATES", {"5xx": 1.0})
+    request: Request = Request(
+        scope={
+            "type": "http",
+            "headers": [],
+            "method": "GET",
+            "path": "/api/v1/suggest",
+            "query_string": b"q=nope&sid=9aadf682-2f7a-4ad1-9976-dc30b60451d8",
+            ScopeKey.GEOLOCATION: Location(),
+            ScopeKey.USER_AGENT: UserAgent(
+                browser="Other", os_family="other", form_factor="other"
+            ),
+        }
+    )
+    message: Message = {
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"x-request-id", b"1b11844c52b34c33a6ad54b7bc2eb7c7")],
+    }
+
+    log_request(request, message)
+
+    records = [r for r in caplog.records if r.name == "web.suggest.request"]
+    assert len(records) == expected_records
+    if records:
+        assert records[0].__dict__["sample_rate"] == 1.0
@@ -4,12 +4,29 @@
 
 """Unit tests for the middleware user_agent module."""
 
+import aiodogstatsd
 import pytest
 from pytest_mock import MockerFixture
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from merino.middleware import ScopeKey
-from merino.middleware.user_agent import UserAgent, UserAgentMiddleware
+from merino.middleware import ScopeKey, user_agent
+from merino.middleware.user_agent import (
+    UserAgent,
+    UserAgentMiddleware,
+    get_user_agent,
+    user_agent_cache,
+)
+
+USER_AGENT: str = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 11.2; rv:85.0) Gecko/20100101"
+    " Firefox/103.0"
+)
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_user_agent_cache() -> None:
+    """Start each test with an empty user agent cache."""
+    user_agent_cache.clear()
 
 
 @pytest.fixture(name="user_agent_middleware")
@@ -58,3 +75,68 @@ async def test_user_agent_invalid_scope_type(
     await user_agent_middleware(scope, receive_mock, send_mock)
 
     assert ScopeKey.USER_AGENT not in scope
+
+
+def test_get_user_agent_cache(mocker: MockerFixture) -> None:
+    """Test that repeated "User-Agent" strings share the cached `UserAgent`, and
+    that cache hits and misses are recorded.
+    """
+    parse_spy = mocker.spy(user_agent, "parse")
+    increment_mock = mocker.patch.object(aiodogstatsd.Client, "increment")
+
+    first = get_user_agent(USER_AGENT)
+    second = get_user_agent(USER_AGENT)
+    other = get_user_agent("curl/7.84.0")
+
+    assert second is first
+    assert other.browser == "curl"
+    assert parse_spy.call_count == 2
+    assert increment_mock.call_args_list == [
+        mocker.call("user_agent.cache.miss"),
+        mocker.call("user_agent.cache.hit"),
+        mocker.call("user_agent.cache.miss"),
+    ]
+
+
+def test_get_user_agent_cache_long_string(mocker: MockerFixture) -> None:
+    """Test that overly long "User-Agent" strings are parsed but not cached."""
+    increment_mock = mocker.patch.object(aiodogstatsd.Client, "increment")
+    long_user_agent = USER_AGENT + " " * user_agent.CACHE_MAX_KEY_LENGTH
+
+    assert get_user_agent(long_user_agent) == get_user_agent(USER_AGENT)
+    assert len(user_agent_cache) == 1
+    assert increment_mock.call_args_list == [mocker.call("user_agent.cache.miss")]
+
+
+def test_get_user_agent_cache_disabled(mocker: MockerFixture) -> None:
+    """Test that every "User-Agent" string is parsed when the cache is disabled."""
+    mocker.patch.object(user_agent_cache, "max_size", 0)
+    parse_spy = mocker.spy(user_agent, "parse")
+    increment_mock = mocker.patch.object(aiodogstatsd.Client, "increment")
+
+    get_user_agent(USER_AGENT)
+    get_user_agent(USER_AGENT)
+
+    assert parse_spy.call_count == 2
+    increment_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "path", ["/__heartbeat__", "/__lbheartbeat__", "/api/v1/providers"]
+)
+@pytest.mark.asyncio
+async def test_user_agent_skipped_path(
+    user_agent_middleware: UserAgentMiddleware,
+    scope: Scope,
+    receive_mock: Receive,
+    send_mock: Send,
+    path: str,
+) -> None:
+    """Test that no parsing takes place for endpoints not consuming the user agent."""
+    scope["path"] = path
+    scope["headers"] = [(b"user-agent", USER_AGENT.encode())]
+
+    await user_agent_middleware(scope, receive_mock, send_mock)
+
+    assert ScopeKey.USER_AGENT not in scope
+    assert len(user_agent_cache) == 0
@@ -4,9 +4,12 @@
 
 """Unit tests for the accuweather provider module."""
 
+import asyncio
+
 import pytest
 from fastapi import APIRouter, FastAPI
 from pytest import LogCaptureFixture
+from pytest_mock import MockerFixture
 
 from merino.config import settings
 from merino.middleware.geolocation import Location
@@ -17,7 +20,7 @@ from merino.providers.accuweather import (
     Suggestion,
     Temperature,
 )
-from merino.providers.base import SuggestionRequest
+from merino.providers.base import QueryFailure, SuggestionRequest
 
 default_location_body = [
     {
@@ -276,6 +279,88 @@ async def test_forecast_returned(accuweather: Provider, geolocation: Location) -
     ]
 
 
+@pytest.mark.asyncio
+async def test_forecast_cached(accuweather: Provider, geolocation: Location) -> None:
+    """Test that responses of each stage are cached across queries."""
+    set_response_bodies()
+    srequest = SuggestionRequest(query="", geolocation=geolocation)
+    expected = await accuweather.query(srequest)
+
+    # The upstream can't serve anything now, so the results must come from caches.
+    set_response_bodies(location=[], current_conditions=[], forecast={})
+    try:
+        assert await accuweather.query(srequest) == expected
+    finally:
+        set_response_bodies()
+
+    assert accuweather.location_cache.hits == 1
+    assert accuweather.current_conditions_cache.hits == 1
+    assert accuweather.forecast_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_coalesced(
+    mocker: MockerFixture, accuweather: Provider, geolocation: Location
+) -> None:
+    """Test that concurrent queries for the same location share upstream requests."""
+    set_response_bodies()
+    spy = mocker.spy(accuweather.client, "get")
+    srequest = SuggestionRequest(query="", geolocation=geolocation)
+
+    results = await asyncio.gather(*[accuweather.query(srequest) for _ in range(5)])
+
+    assert all(len(res) == 1 and res == results[0] for res in results)
+    # One request for each of location, current conditions, and forecast.
+    assert spy.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_current_conditions_and_forecast_fetched_concurrently(
+    accuweather: Provider, geolocation: Location
+) -> None:
+    """Test that current conditions and forecast are requested concurrently."""
+    set_response_bodies()
+    in_flight = 0
+    max_in_flight = 0
+    get = accuweather.client.get
+
+    async def tracking_get(*args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return await get(*args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    accuweather.client.get = tracking_get  # type: ignore [assignment]
+
+    res = await accuweather.query(SuggestionRequest(query="", geolocation=geolocation))
+
+    assert len(res) == 1
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_not_cached(
+    accuweather: Provider, geolocation: Location
+) -> None:
+    """Test that failed lookups are not cached, and are reported as failures so
+    that suggest responses including them aren't cached either.
+    """
+    set_response_bodies(forecast={})
+    srequest = SuggestionRequest(query="", geolocation=geolocation)
+
+    res = await accuweather.query(srequest)
+    assert res == []
+    assert isinstance(res, QueryFailure)
+    assert len(accuweather.forecast_cache) == 0
+
+    set_response_bodies()
+    assert len(await accuweather.query(srequest)) == 1
+
+
 @pytest.mark.asyncio
 async def test_no_location_returned(
     accuweather: Provider, geolocation: Location
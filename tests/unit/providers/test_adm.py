@@ -5,15 +5,26 @@
 """Unit tests for the adm provider module."""
 
 import json
-from typing import Any
+import os
+import time
+from pathlib import Path
+from typing import Any, cast
 from unittest.mock import AsyncMock
 
 import httpx
 import pytest
 from pytest import LogCaptureFixture
+from pytest_mock import MockerFixture
 
 from merino.config import settings
-from merino.providers.adm import NonsponsoredSuggestion, Provider, RemoteSettingsBackend
+from merino.providers.adm import (
+    SNAPSHOT_KIND,
+    NonsponsoredSuggestion,
+    Provider,
+    RemoteSettingsBackend,
+)
+from merino.utils.snapshot import Snapshot
+from merino.utils.string_table import StringTable
 from tests.types import FilterCaplogFixture
 from tests.unit.types import SuggestionRequestFixture
 
@@ -21,6 +32,10 @@ from tests.unit.types import SuggestionRequestFixture
 class FakeBackend:
     """Fake Remote Settings backend that returns suggest data for tests."""
 
+    async def get_timestamp(self, bucket: str, collection: str) -> str:
+        """Return a fake collection timestamp."""
+        return "123"
+
     async def get(self, bucket: str, collection: str) -> list[dict[str, Any]]:
         """Return fake records."""
         return [
@@ -111,6 +126,10 @@ class FakeBackend:
         """Return a fake icon URL for the given URI."""
         return f"attachment-host/{icon_uri}"
 
+    async def close(self) -> None:
+        """Close the fake backend."""
+        ...
+
 
 @pytest.fixture(name="adm")
 def fixture_adm() -> Provider:
@@ -133,7 +152,7 @@ async def test_initialize(adm: Provider) -> None:
     """Test for the initialize() method of the adM provider."""
     await adm.initialize()
 
-    assert adm.suggestions == {
+    assert dict(adm.suggestions.items()) == {
         "firefox": (0, 0),
         "firefox account": (0, 0),
         "firefox accounts": (0, 0),
@@ -177,6 +196,39 @@ async def test_initialize_remote_settings_failure(
     assert len(records) == 1
     assert records[0].__dict__["error message"] == error_message
     assert adm.last_fetch_at == 0
+    assert adm.is_ready() is False
+    assert adm.data_age_sec() is None
+
+
+@pytest.mark.asyncio
+async def test_is_ready(mocker: MockerFixture, adm: Provider) -> None:
+    """Test that the provider is ready once its data is fetched, and for the data
+    age to be the time since the last successful fetch.
+    """
+    time_mock = mocker.patch("merino.providers.adm.time.time", return_value=1000.0)
+    assert adm.is_ready() is False
+    assert adm.data_age_sec() is None
+
+    await adm._fetch()
+    time_mock.return_value = 1060.0
+
+    assert adm.is_ready() is True
+    assert adm.data_age_sec() == 60
+
+
+@pytest.mark.asyncio
+async def test_shutdown() -> None:
+    """Test that shutdown() cancels the cron job and closes the backend."""
+    backend_mock = AsyncMock(spec=RemoteSettingsBackend)
+    backend_mock.get_timestamp.return_value = ""
+    backend_mock.get.return_value = []
+    adm: Provider = Provider(backend=backend_mock)
+    await adm.initialize()
+
+    await adm.shutdown()
+
+    assert adm.cron_task.cancelling()
+    backend_mock.close.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -210,3 +262,402 @@ async def test_query_with_missing_key(
     await adm.initialize()
 
     assert await adm.query(srequest("nope")) == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_skipped_for_unchanged_collection(
+    mocker: MockerFixture, adm: Provider
+) -> None:
+    """Test that nothing is fetched if the collection timestamp is unchanged."""
+    await adm._fetch()
+    data_version = adm.data_version
+    get_spy = mocker.spy(adm.backend, "get")
+    fetch_attachment_spy = mocker.spy(adm.backend, "fetch_attachment")
+
+    await adm._fetch()
+
+    get_spy.assert_not_called()
+    fetch_attachment_spy.assert_not_called()
+    assert adm.collection_timestamp == "123"
+    assert len(adm.suggestions) == 7
+    assert adm.data_version == data_version
+
+
+@pytest.mark.asyncio
+async def test_fetch_only_changed_records(mocker: MockerFixture, adm: Provider) -> None:
+    """Test that only the attachments of changed records are fetched on resync."""
+    await adm._fetch()
+    suggestions = adm.suggestions
+    data_version = adm.data_version
+    mocker.patch.object(adm.backend, "get_timestamp", return_value="456")
+    fetch_attachment_spy = mocker.spy(adm.backend, "fetch_attachment")
+
+    # The collection timestamp changed but none of the records did.
+    await adm._fetch()
+
+    fetch_attachment_spy.assert_not_called()
+    assert adm.suggestions is suggestions
+
+    # Bump `last_modified` of the "offline-expansion-data" record.
+    records = await FakeBackend().get("main", "quicksuggest")
+    records[1]["last_modified"] = 456
+    mocker.patch.object(adm.backend, "get_timestamp", return_value="789")
+    mocker.patch.object(adm.backend, "get", return_value=records)
+
+    await adm._fetch()
+
+    fetch_attachment_spy.assert_called_once_with(
+        "main-workspace/quicksuggest/attachment-02.json"
+    )
+    assert adm.record_data["offline-expansion-data-01"].last_modified == 456
+    assert dict(adm.suggestions.items()) == dict(suggestions.items())
+    # Resyncs invalidate the suggest responses cached for the provider.
+    assert adm.data_version == data_version + 2
+
+
+def make_record(id: str, location: str, last_modified: int) -> dict[str, Any]:
+    """Return an "offline-expansion-data" record with the given attachment."""
+    return {
+        "type": "offline-expansion-data",
+        "attachment": {"location": location},
+        "id": id,
+        "last_modified": last_modified,
+    }
+
+
+def make_attachment(id: int, keywords: list[str]) -> httpx.Response:
+    """Return an attachment with a single suggestion for the given keywords."""
+    suggestion = {
+        "id": id,
+        "url": f"https://example.org/target/{id}",
+        "click_url": f"https://example.org/click/{id}",
+        "impression_url": f"https://example.org/impression/{id}",
+        "iab_category": "22 - Shopping",
+        "icon": "01",
+        "advertiser": "Example.org",
+        "title": f"Suggestion {id}",
+        "keywords": keywords,
+        "full_keywords": [(keywords[-1], len(keywords))],
+    }
+    return httpx.Response(200, text=json.dumps([suggestion]))
+
+
+@pytest.mark.asyncio
+async def test_fetch_renders_only_changed_records(
+    mocker: MockerFixture, adm: Provider, srequest: SuggestionRequestFixture
+) -> None:
+    """Test that only the suggestions of changed records are rendered on resync,
+    while the data of the other records is kept from the merged data.
+    """
+    attachments = {
+        "a": make_attachment(1, ["alpha", "alpha one"]),
+        "b": make_attachment(2, ["beta", "beta two"]),
+    }
+    records = [make_record("a", "a", 1), make_record("b", "b", 1)]
+    mocker.patch.object(adm.backend, "get", return_value=records)
+    mocker.patch.object(
+        adm.backend, "fetch_attachment", side_effect=lambda uri: attachments[uri]
+    )
+    await adm._fetch()
+    alpha = await adm.query(srequest("alpha"))
+    render_spy = mocker.spy(adm, "_render_suggestions")
+
+    attachments["b"] = make_attachment(3, ["gamma"])
+    records[1] = make_record("b", "b", 2)
+    mocker.patch.object(adm.backend, "get_timestamp", return_value="456")
+    await adm._fetch()
+
+    assert [call.args[0] for call in render_spy.call_args_list] == [[adm.results[1]]]
+    assert adm.record_data["a"].results == range(0, 1)
+    assert adm.record_data["b"].results == range(1, 2)
+    assert await adm.query(srequest("alpha")) == alpha
+    assert await adm.query(srequest("beta")) == []
+    assert [s.title for s in await adm.query(srequest("gamma"))] == ["Suggestion 3"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_shared_keywords(
+    mocker: MockerFixture, adm: Provider, srequest: SuggestionRequestFixture
+) -> None:
+    """Test that the last record wins for keywords shared by records, and that all
+    the records are fetched again once that record changes, so that the shadowed
+    keywords of the other records are indexed again.
+    """
+    attachments = {
+        "a": make_attachment(1, ["shared", "alpha"]),
+        "b": make_attachment(2, ["shared", "beta"]),
+    }
+    records = [make_record("a", "a", 1), make_record("b", "b", 1)]
+    mocker.patch.object(adm.backend, "get", return_value=records)
+    fetch_mock = mocker.patch.object(
+        adm.backend, "fetch_attachment", side_effect=lambda uri: attachments[uri]
+    )
+    await adm._fetch()
+
+    assert [s.title for s in await adm.query(srequest("shared"))] == ["Suggestion 2"]
+
+    attachments["b"] = make_attachment(2, ["beta"])
+    records[1] = make_record("b", "b", 2)
+    mocker.patch.object(adm.backend, "get_timestamp", return_value="456")
+    fetch_mock.reset_mock()
+    await adm._fetch()
+
+    assert sorted(call.args[0] for call in fetch_mock.call_args_list) == ["a", "b"]
+    assert not adm.has_shared_keywords
+    assert [s.title for s in await adm.query(srequest("shared"))] == ["Suggestion 1"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_removed_records_after_snapshot(
+    mocker: MockerFixture, tmp_path: Path, srequest: SuggestionRequestFixture
+) -> None:
+    """Test that records removed from the collection after the snapshot was written
+    are dropped upon the resync of a provider started from the snapshot.
+    """
+    snapshot_path = str(tmp_path / "adm.snapshot")
+    adm = Provider(backend=FakeBackend())
+    adm.snapshot_path = snapshot_path
+    await adm._fetch()
+
+    restarted = Provider(backend=FakeBackend())
+    restarted.snapshot_path = snapshot_path
+    assert await restarted._load_snapshot()
+    assert restarted.record_data == adm.record_data
+    records = [
+        record
+        for record in await FakeBackend().get("main", "quicksuggest")
+        if record["type"] == "icon"
+    ]
+    mocker.patch.object(restarted.backend, "get_timestamp", return_value="456")
+    mocker.patch.object(restarted.backend, "get", return_value=records)
+
+    await restarted._fetch()
+
+    assert len(restarted.suggestions) == 0
+    assert restarted.results == []
+    assert await restarted.query(srequest("firefox")) == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot(
+    mocker: MockerFixture, tmp_path: Path, srequest: SuggestionRequestFixture
+) -> None:
+    """Test that the snapshot written after a fetch is served on the next startup
+    while resyncing in the background.
+    """
+    snapshot_path = str(tmp_path / "adm.snapshot")
+    adm = Provider(backend=FakeBackend())
+    adm.snapshot_path = snapshot_path
+    await adm._fetch()
+    expected = await adm.query(srequest("firefox"))
+
+    restarted = Provider(backend=FakeBackend())
+    restarted.snapshot_path = snapshot_path
+    fetch_mock = mocker.patch.object(restarted, "_fetch")
+    render_spy = mocker.spy(restarted, "_render_suggestions")
+    await restarted.initialize()
+    await restarted.shutdown()
+
+    fetch_mock.assert_not_awaited()
+    render_spy.assert_not_called()
+    assert restarted.last_fetch_at == 0
+    assert restarted._should_fetch()
+    assert restarted.collection_timestamp == "123"
+    assert restarted.is_ready()
+    assert restarted.updated_at == adm.updated_at
+    assert dict(restarted.suggestions.items()) == dict(adm.suggestions.items())
+    assert restarted.icons == adm.icons
+    assert list(restarted.results) == adm.results
+    assert list(restarted.full_keywords) == adm.full_keywords
+    assert list(restarted.rendered_suggestions) == adm.rendered_suggestions
+    assert await restarted.query(srequest("firefox")) == expected
+
+
+@pytest.mark.asyncio
+async def test_snapshot_other_rendering(tmp_path: Path) -> None:
+    """Test that a snapshot is not loaded if its suggestions were rendered with
+    other settings, e.g. another score.
+    """
+    snapshot_path = str(tmp_path / "adm.snapshot")
+    adm = Provider(backend=FakeBackend())
+    adm.snapshot_path = snapshot_path
+    await adm._fetch()
+
+    restarted = Provider(backend=FakeBackend())
+    restarted.snapshot_path = snapshot_path
+    restarted.score = adm.score / 2
+
+    assert not await restarted._load_snapshot()
+    assert not restarted.is_ready()
+
+
+@pytest.mark.asyncio
+async def test_resume(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test that resuming in a worker process elects the resyncing worker through
+    a lock file next to the snapshot.
+    """
+    start_mock = mocker.patch.object(Provider, "_start_cron_job")
+    adm = Provider(backend=FakeBackend())
+    adm.snapshot_path = str(tmp_path / "adm.snapshot")
+
+    await adm.resume()
+
+    start_mock.assert_called_once()
+    assert adm.leader_lock is not None
+    assert adm.leader_lock.path == f"{adm.snapshot_path}.lock"
+
+
+@pytest.mark.asyncio
+async def test_resync_coordination(
+    mocker: MockerFixture, tmp_path: Path, srequest: SuggestionRequestFixture
+) -> None:
+    """Test that only the leader resyncs from Remote Settings, that followers
+    reload the snapshots written by the leader, and that a follower takes over once
+    the leader is shut down.
+    """
+    mocker.patch.object(Provider, "_start_cron_job")
+    snapshot_path = str(tmp_path / "adm.snapshot")
+    leader, follower = Provider(backend=FakeBackend()), Provider(backend=FakeBackend())
+    for adm in [leader, follower]:
+        adm.snapshot_path = snapshot_path
+        adm.last_fetch_at = 0
+        await adm.resume()
+    follower_fetch_spy = mocker.spy(follower, "_fetch")
+
+    assert leader._should_resync() is True
+    assert follower._should_resync() is False
+
+    await leader._resync()
+
+    assert leader._should_resync() is False
+    assert follower._should_resync() is True
+
+    await follower._resync()
+
+    assert follower._should_resync() is False
+    follower_fetch_spy.assert_not_called()
+    assert follower.updated_at == leader.updated_at
+    assert await follower.query(srequest("firefox")) == await leader.query(
+        srequest("firefox")
+    )
+
+    # Unchanged collections only refresh the data age of the followers, which
+    # keep their data rather than reloading the same snapshot.
+    snapshot_mtime_ns = os.stat(snapshot_path).st_mtime_ns
+    updated_at = cast(float, leader.updated_at) + 60
+    mocker.patch("merino.providers.adm.time.time", return_value=updated_at)
+    leader.last_fetch_at = 0
+    await leader._resync()
+
+    assert os.stat(snapshot_path).st_mtime_ns == snapshot_mtime_ns
+    assert follower._should_resync() is False
+    assert follower.updated_at == pytest.approx(updated_at)
+    restarted = Provider(backend=FakeBackend())
+    restarted.snapshot_path = snapshot_path
+    assert await restarted._load_snapshot()
+    assert restarted.updated_at == pytest.approx(updated_at)
+
+    await leader.shutdown()
+
+    assert follower._is_leader() is True
+    await follower.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_publish_updated_at_other_snapshot(tmp_path: Path) -> None:
+    """Test that the leader doesn't report a snapshot it didn't write or load as
+    up to date, e.g. after failing to write its own.
+    """
+    adm = Provider(backend=FakeBackend())
+    adm.snapshot_path = str(tmp_path / "adm.snapshot")
+    await adm._fetch()
+    adm.snapshot_mtime_ns -= 1
+
+    adm._publish_updated_at(time.time())
+
+    assert not os.path.exists(adm.updated_at_path)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_invalid(
+    tmp_path: Path,
+    caplog: LogCaptureFixture,
+    filter_caplog: FilterCaplogFixture,
+) -> None:
+    """Test that the provider fetches from Remote Settings if the snapshot is
+    invalid, and then replaces the snapshot.
+    """
+    snapshot_path = tmp_path / "adm.snapshot"
+    snapshot_path.write_bytes(b"garbage")
+    adm = Provider(backend=FakeBackend())
+    adm.snapshot_path = str(snapshot_path)
+
+    await adm.initialize()
+    await adm.shutdown()
+
+    records = filter_caplog(caplog.records, "merino.providers.adm")
+    assert records[0].message == "Failed to load the snapshot of Remote Settings data"
+    assert len(adm.suggestions) == 7
+    snapshot = Snapshot(str(snapshot_path), SNAPSHOT_KIND)
+    assert [*StringTable.from_sections(snapshot.sections("results"))] == [
+        json.dumps(result) for result in adm.results
+    ]
+
+
+@pytest.mark.asyncio
+async def test_query_prerendered_suggestions(
+    mocker: MockerFixture, srequest: SuggestionRequestFixture, adm: Provider
+) -> None:
+    """Test that queries return the suggestions validated upon fetch with the full
+    keyword of the matched keyword filled in.
+    """
+    await adm.initialize()
+    validate_spy = mocker.spy(NonsponsoredSuggestion, "validate")
+    init_spy = mocker.spy(NonsponsoredSuggestion, "__init__")
+
+    [firefox] = await adm.query(srequest("firefox"))
+    [mozilla] = await adm.query(srequest("mozilla"))
+
+    init_spy.assert_not_called()
+    validate_spy.assert_not_called()
+    assert isinstance(firefox, NonsponsoredSuggestion)
+    assert isinstance(mozilla, NonsponsoredSuggestion)
+    assert firefox.full_keyword == "firefox accounts"
+    assert mozilla.full_keyword == "mozilla firefox accounts"
+    assert firefox.copy(update={"full_keyword": ""}) == adm.rendered_suggestions[0]
+
+
+@pytest.mark.asyncio
+async def test_fetch_invalid_suggestion(
+    mocker: MockerFixture,
+    srequest: SuggestionRequestFixture,
+    adm: Provider,
+    caplog: LogCaptureFixture,
+    filter_caplog: FilterCaplogFixture,
+) -> None:
+    """Test that invalid suggestions are logged upon fetch and never suggested."""
+    attachment = [
+        {
+            "id": 3,
+            "url": "not a URL",
+            "iab_category": "5 - Education",
+            "icon": "01",
+            "advertiser": "Example.org",
+            "title": "Invalid",
+            "keywords": ["invalid"],
+            "full_keywords": [("invalid", 1)],
+        }
+    ]
+    mocker.patch.object(
+        adm.backend,
+        "fetch_attachment",
+        return_value=httpx.Response(200, text=json.dumps(attachment)),
+    )
+
+    await adm._fetch()
+
+    records = filter_caplog(caplog.records, "merino.providers.adm")
+    assert records[0].message == "Invalid suggestion from Remote Settings"
+    assert records[0].__dict__["block_id"] == 3
+    assert adm.rendered_suggestions == [None]
+    assert await adm.query(srequest("invalid")) == []
@@ -18,6 +18,10 @@ from tests.unit.types import SuggestionRequestFixture
 class FakeBackend:
     """Fake Remote Settings backend that returns suggest data for tests."""
 
+    async def get_timestamp(self, bucket: str, collection: str) -> str:
+        """Return a fake collection timestamp."""
+        return "123"
+
     async def get(self, bucket: str, collection: str) -> list[dict[str, Any]]:
         """Return fake records."""
         return [
@@ -71,6 +75,10 @@ class FakeBackend:
         """Return a fake icon URL for the given URI."""
         return f"attachment-host/{icon_uri}"
 
+    async def close(self) -> None:
+        """Close the fake backend."""
+        ...
+
 
 @pytest.fixture(name="adm")
 def fixture_adm() -> Provider:
@@ -83,7 +91,7 @@ async def test_initialize(adm: Provider) -> None:
     """Test for the initialize() method of the adM provider."""
     await adm.initialize()
 
-    assert adm.suggestions == {"mozilla": (0, 0)}
+    assert dict(adm.suggestions.items()) == {"mozilla": (0, 0)}
     assert adm.results == [
         {
             "id": 1,
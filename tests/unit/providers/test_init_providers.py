@@ -7,9 +7,18 @@
 import pytest
 from pytest_mock import MockerFixture
 
+from merino import providers as providers_module
 from merino.config import settings
 from merino.exceptions import InvalidProviderError
-from merino.providers import ProviderType, get_providers, init_providers
+from merino.providers import (
+    ProviderType,
+    get_providers,
+    init_providers,
+    preload_providers,
+    resume_providers,
+    shutdown_providers,
+)
+from merino.providers.adm import Provider as AdmProvider
 
 
 @pytest.mark.asyncio
@@ -36,3 +45,45 @@ async def test_init_providers_unknown_provider_type(mocker: MockerFixture) -> No
         await init_providers()
 
     assert str(excinfo.value) == "Unknown provider type: unknown-provider"
+
+
+@pytest.mark.asyncio
+async def test_shutdown_providers(mocker: MockerFixture) -> None:
+    """Test for the `shutdown_providers` method of the Merino providers module."""
+    await init_providers()
+    providers, _ = get_providers()
+    spies = [mocker.spy(provider, "shutdown") for provider in providers.values()]
+
+    await shutdown_providers()
+
+    for spy in spies:
+        spy.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_preload_and_resume_providers(mocker: MockerFixture) -> None:
+    """Test that preloaded providers are shut down, and that resuming them replaces
+    the backend of the adM provider.
+    """
+    mocker.patch.object(providers_module, "preloaded", False)
+    shutdown_spy = mocker.spy(providers_module, "shutdown_providers")
+
+    await preload_providers()
+
+    shutdown_spy.assert_awaited_once()
+    assert providers_module.preloaded is True
+
+    providers, _ = get_providers()
+    adm = providers[ProviderType.ADM]
+    assert isinstance(adm, AdmProvider)
+    closed_backend = adm.backend
+    spies = [mocker.spy(provider, "resume") for provider in providers.values()]
+
+    try:
+        await resume_providers()
+
+        assert adm.backend is not closed_backend
+        for spy in spies:
+            spy.assert_awaited_once()
+    finally:
+        await shutdown_providers()
@@ -4,10 +4,13 @@
 
 """Unit tests for the top picks provider module."""
 
+import json
 import os
+from pathlib import Path
 
 import pytest
 from fastapi import APIRouter, FastAPI
+from pytest_mock import MockerFixture
 
 from merino.config import settings
 from merino.providers.top_picks import Provider, Suggestion
@@ -87,12 +90,12 @@ def test_build_indexes(top_picks: Provider) -> None:
     example_query = "example"
     for chars in range(QUERY_CHAR_LIMIT, len("example_query") + 1):
         assert example_query[:chars] in result["primary_index"]
-        assert results[primary_index[example_query[:chars]][0]]
+        assert results[primary_index.get(example_query[:chars])]
     #  secondary
     example_query = "fiirefox"
     for chars in range(QUERY_CHAR_LIMIT, len("example_query") + 1):
         assert example_query[:chars] in result["secondary_index"]
-        assert results[secondary_index[example_query[:chars]][0]]
+        assert results[secondary_index.get(example_query[:chars])]
 
 
 def test_build_indeces(top_picks: Provider) -> None:
@@ -107,7 +110,10 @@ def test_build_indeces(top_picks: Provider) -> None:
 @pytest.mark.asyncio
 async def test_initialize(top_picks: Provider) -> None:
     """Test initialization of top pick provider"""
+    assert top_picks.is_ready() is False
     await top_picks.initialize()
+    assert top_picks.is_ready() is True
+    assert top_picks.data_age_sec() is not None
     assert top_picks.primary_index
     assert top_picks.secondary_index
     assert top_picks.results
@@ -241,3 +247,41 @@ async def test_short_domain_query_similars_longer_than_domain(
 
     res = await top_picks.query(srequest(query))
     assert res == expected_suggestion
+
+
+def test_build_indices_snapshot(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test that the indices are loaded from the snapshot built from the current
+    Top Picks file, and that the snapshot is rebuilt when the file changes.
+    """
+    top_picks_file = tmp_path / "top_picks.json"
+    top_picks_file.write_text(
+        Path(settings.providers.top_picks.top_picks_file_path).read_text()
+    )
+    mocker.patch("merino.providers.top_picks.LOCAL_TOP_PICKS_FILE", str(top_picks_file))
+    mocker.patch(
+        "merino.providers.top_picks.SNAPSHOT_PATH", str(tmp_path / "top_picks.snapshot")
+    )
+    build_index_spy = mocker.spy(Provider, "build_index")
+
+    built = Provider.build_indices()
+    loaded = Provider.build_indices()
+
+    assert build_index_spy.call_count == 1
+    assert list(loaded["results"]) == built["results"]
+    assert loaded["index_char_range"] == built["index_char_range"]
+    for name in ["primary_index", "secondary_index", "short_domain_index"]:
+        assert len(loaded[name]) == len(built[name])
+    for query in ["exam", "example", "fiirefox", "ab", "abc", "zzzz"]:
+        assert loaded["primary_index"].get(query) == built["primary_index"].get(query)
+        assert loaded["secondary_index"].get(query) == built["secondary_index"].get(
+            query
+        )
+        assert loaded["short_domain_index"].get(query) == built[
+            "short_domain_index"
+        ].get(query)
+
+    top_picks_file.write_text(json.dumps({"domains": []}))
+    rebuilt = Provider.build_indices()
+
+    assert build_index_spy.call_count == 2
+    assert list(rebuilt["results"]) == []
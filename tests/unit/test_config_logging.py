@@ -4,10 +4,16 @@
 
 """Unit tests for the config_logging.py module."""
 
+import logging
+import os
+import subprocess
+import sys
+
 import pytest
 
 from merino.config import settings
-from merino.config_logging import configure_logging
+from merino.config_logging import LOGGERS, configure_logging
+from merino.utils.queue_logging import BoundedQueueHandler, stop_queue_logging
 
 
 def test_configure_logging_invalid_format():
@@ -39,3 +45,46 @@ def test_configure_logging_mozlog_production():
         assert "Log format must be 'mozlog' in production" in str(excinfo)
 
         settings.logging.format = old_format
+
+
+def test_configure_logging_queue():
+    """Test that configure_logging routes the records of Merino loggers through a
+    queue handler unless the queue size is 0.
+    """
+    old_queue_size = settings.logging.queue_size
+    try:
+        settings.logging.queue_size = 100
+        configure_logging()
+        for name in LOGGERS:
+            [handler] = logging.getLogger(name).handlers
+            assert isinstance(handler, BoundedQueueHandler)
+
+        settings.logging.queue_size = 0
+        configure_logging()
+        for name in LOGGERS:
+            [handler] = logging.getLogger(name).handlers
+            assert not isinstance(handler, BoundedQueueHandler)
+    finally:
+        settings.logging.queue_size = old_queue_size
+        stop_queue_logging()
+
+
+def test_configure_logging_mozlog_without_rich():
+    """Test that `rich.logging` isn't imported unless the pretty format is used.
+    It runs in a fresh interpreter, as other tests may have imported it already.
+    """
+    script = (
+        "import sys\n"
+        "from merino.config_logging import configure_logging\n"
+        "configure_logging()\n"
+        "print('rich.logging' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env={**os.environ, "MERINO_LOGGING__FORMAT": "mozlog"},
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    assert result.stdout.strip() == "False"
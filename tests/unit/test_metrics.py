@@ -4,12 +4,51 @@
 
 """Unit tests for the metrics.py module."""
 
+import asyncio
+import socket
+from typing import Any, Iterator
+
 import aiodogstatsd
 import pytest
+from aiodogstatsd.client import DatagramProtocol
 from pytest_mock import MockerFixture
 
 from merino.featureflags import FeatureFlags
-from merino.metrics import Client
+from merino.metrics import BufferedStatsdClient, Client
+
+
+class RecordingProtocol(DatagramProtocol):
+    """A datagram protocol that records the datagrams rather than sending them."""
+
+    datagrams: list[bytes]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.datagrams = []
+
+    def send(self, data: bytes) -> None:
+        """Record a datagram."""
+        self.datagrams.append(data)
+
+
+async def connect(**kwargs: Any) -> tuple[BufferedStatsdClient, RecordingProtocol]:
+    """Return a connected buffered client recording its datagrams."""
+    client = BufferedStatsdClient(
+        namespace="merino", constant_tags={"app": "test"}, **kwargs
+    )
+    recorder = RecordingProtocol()
+    client._protocol = recorder
+    await client.connect()
+    return client, recorder
+
+
+@pytest.fixture(name="udp_socket")
+def fixture_udp_socket() -> Iterator[socket.socket]:
+    """Return a non-blocking UDP socket listening on a free local port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.setblocking(False)
+        yield sock
 
 
 @pytest.fixture(name="statsd_mock")
@@ -41,3 +80,200 @@ def test_unsupported_method(metrics_client: Client, statsd_mock):
     statsd_mock.increment.assert_not_called()
     statsd_mock.timeit_task.assert_not_called()
     statsd_mock.timeit.assert_not_called()
+
+
+def test_record_calls(mocker: MockerFixture, metrics_client: Client, statsd_mock):
+    """Test that calls made to the metrics client are recorded when enabled."""
+    mocker.patch("merino.metrics.RECORD_CALLS", True)
+
+    metrics_client.increment("hello", tags={"foo": "bar"})
+
+    assert metrics_client.calls == [
+        {
+            "method_name": "increment",
+            "args": ("hello",),
+            "kwargs": {"tags": {"foo": "bar"}},
+        }
+    ]
+    statsd_mock.increment.assert_called_once_with("hello", tags={"foo": "bar"})
+
+
+def test_record_calls_disabled(
+    mocker: MockerFixture, metrics_client: Client, statsd_mock
+):
+    """Test that calls made to the metrics client aren't recorded when disabled."""
+    mocker.patch("merino.metrics.RECORD_CALLS", False)
+
+    metrics_client.increment("hello")
+
+    assert metrics_client.calls == []
+    statsd_mock.increment.assert_called_once_with("hello", tags={})
+
+
+def test_feature_flags_tags(statsd_mock):
+    """Test that feature flag tags are reused across metric calls and rebuilt upon
+    new decisions, and that manually added tags take precedence.
+    """
+    feature_flags = FeatureFlags(
+        {
+            "on": {"scheme": "random", "enabled": 1.0},
+            "off": {"scheme": "random", "enabled": 0.0},
+        }
+    )
+    metrics_client = Client(statsd_client=statsd_mock, feature_flags=feature_flags)
+
+    feature_flags.is_enabled("on")
+    metrics_client.increment("a")
+    metrics_client.increment("b")
+    feature_flags.is_enabled("off")
+    metrics_client.increment("c", tags={"feature_flag.on": 0, "foo": "bar"})
+
+    tags = [call.kwargs["tags"] for call in statsd_mock.increment.call_args_list]
+    assert tags == [
+        {"feature_flag.on": 1},
+        {"feature_flag.on": 1},
+        {"feature_flag.on": 0, "feature_flag.off": 0, "foo": "bar"},
+    ]
+    assert tags[0] is tags[1]
+
+
+@pytest.mark.asyncio
+async def test_buffered_client_packs_datagrams() -> None:
+    """Test that buffered metrics are packed into datagrams of a bounded size."""
+    client, recorder = await connect(
+        max_datagram_size=60, flush_interval_sec=10, flush_threshold=100
+    )
+
+    client.timing("a", value=1)
+    client.histogram("b", value=2)
+    client.gauge("c", value=3)
+    await asyncio.sleep(0.01)
+    assert recorder.datagrams == []
+
+    await client.close()
+
+    assert recorder.datagrams == [
+        b"merino.a:1|ms|#app:test\nmerino.b:2|h|#app:test",
+        b"merino.c:3|g|#app:test",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_buffered_client_unpacked_datagrams() -> None:
+    """Test that each metric is sent on its own when packing is disabled."""
+    client, recorder = await connect(max_datagram_size=0)
+
+    client.timing("a", value=1)
+    client.timing("b", value=2)
+    await client.close()
+
+    assert recorder.datagrams == [
+        b"merino.a:1|ms|#app:test",
+        b"merino.b:2|ms|#app:test",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_buffered_client_flush_threshold() -> None:
+    """Test that metrics are sent before the flush interval elapses once the
+    buffer holds `flush_threshold` metrics.
+    """
+    client, recorder = await connect(flush_interval_sec=10, flush_threshold=2)
+
+    client.timing("a", value=1)
+    await asyncio.sleep(0.01)
+    assert recorder.datagrams == []
+
+    client.timing("b", value=2)
+    await asyncio.sleep(0.01)
+    assert recorder.datagrams == [b"merino.a:1|ms|#app:test\nmerino.b:2|ms|#app:test"]
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_buffered_client_aggregates_counters() -> None:
+    """Test that counters with the same name and tags are sent once per flush."""
+    client, recorder = await connect(
+        flush_interval_sec=10, flush_threshold=100, aggregate_counters=True
+    )
+
+    client.increment("a")
+    client.increment("a", value=2)
+    client.increment("a", tags={"foo": "bar"})
+    client.decrement("b")
+    client.timing("c", value=1)
+    await client.close()
+
+    assert recorder.datagrams == [
+        b"merino.c:1|ms|#app:test\n"
+        b"merino.a:3|c|#app:test\n"
+        b"merino.a:1|c|#app:test,foo:bar\n"
+        b"merino.b:-1|c|#app:test"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_buffered_client_sample_rates(mocker: MockerFixture) -> None:
+    """Test that per-metric sample rates apply to metrics recorded without an
+    explicit sample rate.
+    """
+    mocker.patch("merino.metrics.random", side_effect=[0.9, 0.1])
+    mocker.patch("aiodogstatsd.client.random", side_effect=[0.9, 0.1])
+    client, recorder = await connect(
+        aggregate_counters=True, sample_rates={"a": 0.5, "b": 0.5}
+    )
+
+    for _ in range(2):
+        client.increment("a")
+        client.timing("b", value=1)
+    client.timing("c", value=1)
+    client.timing("b", value=1, sample_rate=1)
+    await client.close()
+
+    assert b"\n".join(recorder.datagrams).split(b"\n") == [
+        b"merino.b:1|ms|@0.5|#app:test",
+        b"merino.c:1|ms|#app:test",
+        b"merino.b:1|ms|#app:test",
+        b"merino.a:1|c|@0.5|#app:test",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_buffered_client_udp(udp_socket: socket.socket) -> None:
+    """Test the flushes of the buffered client against a real UDP socket, i.e.
+    without replacing any part of `aiodogstatsd.Client` that it builds on.
+
+    `BufferedStatsdClient` overrides internals of `aiodogstatsd.Client`, which is
+    why the dependency is pinned to an exact version. This test is what has to
+    pass before upgrading it.
+    """
+    host, port = udp_socket.getsockname()
+    client = BufferedStatsdClient(
+        host=host,
+        port=port,
+        namespace="merino",
+        constant_tags={"app": "test"},
+        flush_interval_sec=10,
+        flush_threshold=3,
+        aggregate_counters=True,
+    )
+    await client.connect()
+    loop = asyncio.get_running_loop()
+
+    async def receive() -> bytes:
+        return await asyncio.wait_for(loop.sock_recv(udp_socket, 1500), timeout=1)
+
+    # Flushed once the buffer holds `flush_threshold` metrics.
+    client.increment("a")
+    client.increment("a")
+    client.timing("b", value=1)
+    client.gauge("c", value=2)
+    assert await receive() == (
+        b"merino.b:1|ms|#app:test\nmerino.c:2|g|#app:test\nmerino.a:2|c|#app:test"
+    )
+
+    # Flushed upon closing.
+    client.increment("d", tags={"foo": "bar"})
+    await client.close()
+    assert await receive() == b"merino.d:1|c|#app:test,foo:bar"
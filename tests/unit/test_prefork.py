@@ -0,0 +1,30 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the prefork.py module."""
+
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from merino.prefork import default_snapshot_path
+from merino.providers.adm import Provider as AdmProvider
+
+
+def test_default_snapshot_path(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test that the adM snapshot is kept in the runtime directory by default."""
+    mocker.patch.object(AdmProvider, "snapshot_path", "")
+
+    default_snapshot_path(str(tmp_path))
+
+    assert AdmProvider.snapshot_path == str(tmp_path / "adm.snapshot")
+
+
+def test_configured_snapshot_path(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test that a configured adM snapshot path is kept as is."""
+    mocker.patch.object(AdmProvider, "snapshot_path", "/var/lib/merino/adm.snapshot")
+
+    default_snapshot_path(str(tmp_path))
+
+    assert AdmProvider.snapshot_path == "/var/lib/merino/adm.snapshot"
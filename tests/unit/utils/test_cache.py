@@ -0,0 +1,72 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the cache.py utility module."""
+
+from merino.utils.cache import TTLCache
+
+
+class FakeTimer:
+    """A fake monotonic clock that only moves when told to."""
+
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+def test_get_and_set() -> None:
+    """Test that cached values are returned and hits and misses are counted."""
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_sec=10)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_expiry() -> None:
+    """Test that entries expire after their TTL."""
+    timer = FakeTimer()
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_sec=10, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_sec=20)
+
+    timer.now = 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+    timer.now = 20
+    assert cache.get("b") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_sec=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_disabled_and_clear() -> None:
+    """Test that a zero sized cache caches nothing and that clear() empties it."""
+    disabled: TTLCache[str, int] = TTLCache(max_size=0, ttl_sec=10)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
+
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_sec=10)
+    cache.set("a", 1)
+    cache.clear()
+    assert len(cache) == 0
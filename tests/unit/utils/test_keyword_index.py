@@ -0,0 +1,165 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the keyword_index.py utility module."""
+
+import pytest
+
+from merino.utils.keyword_index import (
+    FENCE_INTERVAL,
+    KeywordIndex,
+    KeywordIndexBuilder,
+)
+
+
+@pytest.fixture(name="index")
+def fixture_index() -> KeywordIndex:
+    """Return a keyword index with a few entries."""
+    builder = KeywordIndexBuilder()
+    builder.add("mozilla firefox", 0, 1)
+    builder.add("firefox", 0, 0)
+    builder.add("café", 1, 2)
+    builder.add("mozilla", 0, 1)
+    return builder.build()
+
+
+def test_get(index: KeywordIndex) -> None:
+    """Test that all added keywords can be looked up."""
+    assert index.get("firefox") == (0, 0)
+    assert index.get("mozilla") == (0, 1)
+    assert index.get("mozilla firefox") == (0, 1)
+    assert index.get("café") == (1, 2)
+
+
+@pytest.mark.parametrize("keyword", ["", "fire", "firefoxes", "cafe", "zzz", "\ud800"])
+def test_get_missing(index: KeywordIndex, keyword: str) -> None:
+    """Test that lookups for missing keywords return None."""
+    assert index.get(keyword) is None
+    assert keyword not in index
+
+
+def test_get_across_blocks() -> None:
+    """Test lookups in indexes spanning multiple blocks between fences, where
+    keywords also occur as prefixes or substrings of other keywords. Indexes backed
+    by memoryviews, e.g. from snapshots, are looked up the same way.
+    """
+    keywords = [
+        keyword
+        for i in range(FENCE_INTERVAL * 5)
+        for keyword in (f"k{i:03}", f"k{i:03} ", f"k{i:03} x", f"xk{i:03}")
+    ]
+    builder = KeywordIndexBuilder()
+    for result_id, keyword in enumerate(keywords):
+        builder.add(keyword, result_id, 0)
+    index = builder.build()
+    mapped = KeywordIndex.from_sections(
+        {name: memoryview(buffer) for name, buffer in index.sections().items()}
+    )
+
+    for lookup_index in (index, mapped):
+        for result_id, keyword in enumerate(keywords):
+            assert lookup_index.get(keyword) == (result_id, 0)
+        for keyword in ["k", "k00", "k000 x ", "xk", "k999", "a", "~"]:
+            assert lookup_index.get(keyword) is None
+
+
+@pytest.mark.parametrize("keywords", [["", "a", "ab"], ["", "a"], ["a", ""]])
+def test_get_empty_keyword(keywords: list[str]) -> None:
+    """Test that an empty keyword doesn't hide the keyword starting at the same
+    offset of the blob, and can be looked up itself.
+    """
+    builder = KeywordIndexBuilder()
+    for position, keyword in enumerate(keywords):
+        builder.add(keyword, position, position)
+    index = builder.build()
+
+    for position, keyword in enumerate(keywords):
+        assert index.get(keyword) == (position, position)
+    assert index.get("b") is None
+
+
+def test_items(index: KeywordIndex) -> None:
+    """Test that items are iterated in the sorted keyword order."""
+    assert list(index.items()) == [
+        ("café", (1, 2)),
+        ("firefox", (0, 0)),
+        ("mozilla", (0, 1)),
+        ("mozilla firefox", (0, 1)),
+    ]
+    assert len(index) == 4
+
+
+def test_duplicate_keywords() -> None:
+    """Test that the last insertion wins for duplicate keywords."""
+    builder = KeywordIndexBuilder()
+    builder.add("firefox", 0, 0)
+    builder.add("mozilla", 1, 1)
+    builder.add("firefox", 2, 2)
+    index = builder.build()
+
+    assert dict(index.items()) == {"firefox": (2, 2), "mozilla": (1, 1)}
+
+
+def test_empty_index() -> None:
+    """Test lookups against an empty index."""
+    for index in (KeywordIndex(), KeywordIndexBuilder().build()):
+        assert len(index) == 0
+        assert index.get("firefox") is None
+        assert list(index.items()) == []
+
+
+def test_merge(index: KeywordIndex) -> None:
+    """Test that merged indexes are offset and the last part wins for duplicates."""
+    builder = KeywordIndexBuilder()
+    builder.add("firefox", 0, 0)
+    builder.add("thunderbird", 1, 1)
+    other = builder.build()
+
+    merged = KeywordIndex.merge([(index, 0, 0), (other, 2, 3)])
+
+    assert dict(merged.items()) == {
+        "café": (1, 2),
+        "firefox": (2, 3),
+        "mozilla": (0, 1),
+        "mozilla firefox": (0, 1),
+        "thunderbird": (3, 4),
+    }
+    assert KeywordIndex.merge([]).get("firefox") is None
+
+
+def test_partition(index: KeywordIndex) -> None:
+    """Test that partitioning a merged index restores the parts it was merged from,
+    dropping the entries of the IDs out of the ranges.
+    """
+    builder = KeywordIndexBuilder()
+    builder.add("thunderbird", 0, 0)
+    other = builder.build()
+    merged = KeywordIndex.merge([(index, 0, 0), (other, 2, 3)])
+
+    parts = merged.partition([(range(2, 3), range(3, 4)), (range(0, 2), range(0, 3))])
+
+    assert [dict(part.items()) for part in parts] == [
+        dict(other.items()),
+        dict(index.items()),
+    ]
+    assert len(merged.partition([(range(0, 1), range(0, 2))])[0]) == 3
+    assert merged.partition([]) == []
+
+
+def test_from_sections(index: KeywordIndex) -> None:
+    """Test that an index backed by read-only memoryviews behaves the same."""
+    restored = KeywordIndex.from_sections(
+        {
+            name: memoryview(buffer).toreadonly()
+            for name, buffer in index.sections().items()
+        }
+    )
+
+    assert dict(restored.items()) == dict(index.items())
+    assert restored.get("café") == (1, 2)
+    assert restored.get("fire") is None
+    assert dict(KeywordIndex.merge([(restored, 1, 1)]).items()) == {
+        keyword: (result_id + 1, fkw_id + 1)
+        for keyword, (result_id, fkw_id) in index.items()
+    }
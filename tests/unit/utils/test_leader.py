@@ -0,0 +1,32 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the leader.py utility module."""
+
+from pathlib import Path
+
+from merino.utils.leader import LeaderLock
+
+
+def test_leader_lock(tmp_path: Path) -> None:
+    """Test that a single lock holds the leadership at a time, and that another one
+    takes over once it's released.
+
+    Note that locks are held by open files, so two locks of the same process
+    compete like locks of different processes.
+    """
+    path = str(tmp_path / "locks" / "leader.lock")
+    leader, follower = LeaderLock(path), LeaderLock(path)
+
+    assert leader.acquire() is True
+    assert leader.acquire() is True
+    assert follower.acquire() is False
+
+    leader.release()
+
+    assert follower.acquire() is True
+    assert leader.acquire() is False
+
+    follower.release()
+    follower.release()
@@ -0,0 +1,87 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the prefix_index.py utility module."""
+
+import pytest
+
+from merino.utils.prefix_index import PrefixIndex
+
+
+@pytest.fixture(name="index")
+def fixture_index() -> PrefixIndex:
+    """Return a prefix index with a few entries."""
+    return PrefixIndex(
+        [("firefox", 2), ("fire", 3), ("firefox", 1), ("mozilla", 0), ("moz", 4)],
+        min_prefix_len=2,
+    )
+
+
+@pytest.mark.parametrize(
+    ["prefix", "expected"],
+    [
+        ("fi", 1),
+        ("fire", 1),
+        ("firef", 1),
+        ("firefox", 1),
+        ("mo", 0),
+        ("mozi", 0),
+        ("mozilla", 0),
+    ],
+)
+def test_get(index: PrefixIndex, prefix: str, expected: int) -> None:
+    """Test that the smallest ID among the keys with the prefix is returned."""
+    assert index.get(prefix) == expected
+    assert prefix in index
+
+
+@pytest.mark.parametrize("prefix", ["", "f", "firefoxes", "fx", "mozz", "zzz"])
+def test_get_missing(index: PrefixIndex, prefix: str) -> None:
+    """Test that unmatched or too short prefixes return None."""
+    assert index.get(prefix) is None
+    assert prefix not in index
+
+
+def test_get_ranges_of_any_length() -> None:
+    """Test that the smallest ID is returned for ranges of keys of any length,
+    whether or not they're a power of two.
+    """
+    keys = [f"{'a' * length}{'b' * (20 - length)}" for length in range(21)]
+    ids = [(7 * position) % 23 for position in range(len(keys))]
+    index = PrefixIndex(zip(keys, ids))
+
+    for length in range(1, 21):
+        expected = min(id for key, id in zip(keys, ids) if key.startswith("a" * length))
+        assert index.get("a" * length) == expected
+
+
+def test_empty_index() -> None:
+    """Test lookups against an empty index."""
+    index = PrefixIndex()
+
+    assert len(index) == 0
+    assert index.get("firefox") is None
+
+
+def test_from_sections(index: PrefixIndex) -> None:
+    """Test that an index restored from its sections behaves the same."""
+    sections = {
+        name: memoryview(buffer).toreadonly()
+        for name, buffer in index.sections().items()
+    }
+    restored = PrefixIndex.from_sections(sections, min_prefix_len=2)
+
+    assert len(restored) == len(index)
+    for prefix in ["f", "fi", "fire", "firefox", "moz", "mozilla", "zzz"]:
+        assert restored.get(prefix) == index.get(prefix)
+    assert PrefixIndex.from_sections(restored.sections()).get("fire") == 1
+
+
+def test_from_sections_missing_min_ids(index: PrefixIndex) -> None:
+    """Test that restoring an index without its sparse table fails."""
+    sections = index.sections()
+    del sections["min_ids.2"]
+
+    with pytest.raises(KeyError):
+        PrefixIndex.from_sections(sections)
@@ -0,0 +1,124 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the queue_logging.py utility module."""
+
+import logging
+import threading
+from typing import Iterator
+
+import aiodogstatsd
+import pytest
+from pytest_mock import MockerFixture
+
+from merino.utils.queue_logging import (
+    BoundedQueueHandler,
+    start_queue_logging,
+    stop_queue_logging,
+)
+
+LOGGER_NAMES: list[str] = ["test.queue_logging.a", "test.queue_logging.b"]
+
+
+class RecordingHandler(logging.Handler):
+    """A handler that records the records it handles and the handling threads.
+    It blocks until `unblocked` is set.
+    """
+
+    records: list[logging.LogRecord]
+    threads: set[str]
+    unblocked: threading.Event
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+        self.threads = set()
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Record a record once unblocked."""
+        self.unblocked.wait()
+        self.records.append(record)
+        self.threads.add(threading.current_thread().name)
+
+
+@pytest.fixture(name="recording_handler")
+def fixture_recording_handler() -> Iterator[RecordingHandler]:
+    """Attach a recording handler to the test loggers."""
+    handler = RecordingHandler()
+    loggers = [logging.getLogger(name) for name in LOGGER_NAMES]
+    for logger in loggers:
+        logger.handlers = [handler]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.disabled = False
+    yield handler
+    handler.unblocked.set()
+    stop_queue_logging()
+    for logger in loggers:
+        logger.handlers = []
+
+
+def test_queue_logging(recording_handler: RecordingHandler) -> None:
+    """Test that records of all the loggers are written in a background thread,
+    with their message arguments merged and their extra fields kept.
+    """
+    start_queue_logging(LOGGER_NAMES, 10)
+    args = {"foo": "bar"}
+
+    logging.getLogger(LOGGER_NAMES[0]).info("a %s", args, extra={"spam": "eggs"})
+    args["foo"] = "baz"
+    logging.getLogger(LOGGER_NAMES[1]).info("b")
+    stop_queue_logging()
+
+    assert [record.getMessage() for record in recording_handler.records] == [
+        "a {'foo': 'bar'}",
+        "b",
+    ]
+    assert recording_handler.records[0].__dict__["spam"] == "eggs"
+    assert threading.current_thread().name not in recording_handler.threads
+
+
+def test_stop_queue_logging(recording_handler: RecordingHandler) -> None:
+    """Test that stopping routes the loggers back to their handlers."""
+    start_queue_logging(LOGGER_NAMES, 10)
+    stop_queue_logging()
+
+    logging.getLogger(LOGGER_NAMES[0]).info("a")
+
+    for name in LOGGER_NAMES:
+        assert logging.getLogger(name).handlers == [recording_handler]
+    assert recording_handler.threads == {threading.current_thread().name}
+
+
+def test_queue_logging_drops(
+    mocker: MockerFixture, recording_handler: RecordingHandler
+) -> None:
+    """Test that records are dropped and counted rather than blocking the logging
+    call when the queue is full, and that queued records are written upon stopping.
+    """
+    increment_mock = mocker.patch.object(aiodogstatsd.Client, "increment")
+    recording_handler.unblocked.clear()
+    queue_handler: BoundedQueueHandler = start_queue_logging(LOGGER_NAMES, 1)
+    logger = logging.getLogger(LOGGER_NAMES[0])
+
+    # The first record is taken by the blocked listener thread, the second one
+    # fills the queue, the others are dropped.
+    logger.info("1")
+    while not queue_handler.queue.empty():
+        pass
+    for message in ["2", "3", "4"]:
+        logger.info(message)
+
+    assert queue_handler.dropped == 2
+    assert increment_mock.call_args_list == [
+        mocker.call("logging.queue.dropped", value=1),
+        mocker.call("logging.queue.dropped", value=1),
+    ]
+
+    recording_handler.unblocked.set()
+    stop_queue_logging()
+
+    assert [record.getMessage() for record in recording_handler.records] == ["1", "2"]
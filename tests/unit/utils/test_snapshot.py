@@ -0,0 +1,122 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the snapshot.py utility module."""
+
+import os
+import struct
+from array import array
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from merino.exceptions import InvalidSnapshotError
+from merino.utils.snapshot import MAGIC, PREAMBLE, VERSION, Snapshot, write_snapshot
+
+
+@pytest.fixture(name="path")
+def fixture_path(tmp_path: Path) -> str:
+    """Return the path of a snapshot file with a few sections."""
+    path = str(tmp_path / "snapshots" / "test.snapshot")
+    write_snapshot(
+        path,
+        "test",
+        {"timestamp": "123", "results": [{"id": 1}]},
+        {
+            "index.blob": b"firefoxmozilla",
+            "index.ids": array("I", [1, 2, 3]),
+            "index.empty": array("I"),
+            "raw": b"abc",
+        },
+    )
+    return path
+
+
+def test_round_trip(path: str) -> None:
+    """Test that metadata and sections are read back as written."""
+    snapshot = Snapshot(path, "test")
+
+    assert snapshot.metadata == {"timestamp": "123", "results": [{"id": 1}]}
+    assert bytes(snapshot.section("raw")) == b"abc"
+    assert snapshot.section("index.ids").tolist() == [1, 2, 3]
+    assert {
+        name: view.tolist() for name, view in snapshot.sections("index").items()
+    } == {
+        "blob": list(b"firefoxmozilla"),
+        "ids": [1, 2, 3],
+        "empty": [],
+    }
+    with pytest.raises(TypeError):
+        snapshot.section("index.ids")[0] = 0
+
+
+def test_overwrite(path: str) -> None:
+    """Test that rewriting a snapshot doesn't affect an already loaded one."""
+    snapshot = Snapshot(path, "test")
+
+    write_snapshot(path, "test", {}, {"raw": b"xyz"})
+
+    assert bytes(snapshot.section("raw")) == b"abc"
+    assert bytes(Snapshot(path, "test").section("raw")) == b"xyz"
+
+
+def test_write_failure(mocker: MockerFixture, path: str) -> None:
+    """Test that failed writes leave neither the temporary file behind nor the
+    previous snapshot changed.
+    """
+    # Fail writing the file, i.e. after it's created.
+    mocker.patch("merino.utils.snapshot.VERSION", -1)
+    with pytest.raises(struct.error):
+        write_snapshot(path, "test", {}, {"raw": b"xyz"})
+    mocker.stopall()
+    # Fail replacing the previous snapshot.
+    mocker.patch("os.replace", side_effect=OSError("Cannot replace"))
+    with pytest.raises(OSError, match="Cannot replace"):
+        write_snapshot(path, "test", {}, {"raw": b"xyz"})
+    mocker.stopall()
+
+    assert os.listdir(os.path.dirname(path)) == ["test.snapshot"]
+    assert bytes(Snapshot(path, "test").section("raw")) == b"abc"
+
+
+def test_unexpected_kind(path: str) -> None:
+    """Test that snapshots of another kind are rejected."""
+    with pytest.raises(InvalidSnapshotError, match="Unexpected snapshot kind"):
+        Snapshot(path, "other")
+
+
+@pytest.mark.parametrize(
+    ["content", "error"],
+    [
+        (b"", "Truncated snapshot"),
+        (b"not a snapshot file", "Not a snapshot"),
+        (PREAMBLE.pack(MAGIC, VERSION + 1, 0), "Unsupported snapshot version"),
+        (PREAMBLE.pack(MAGIC, VERSION, 3) + b"{{{", "Invalid snapshot header"),
+    ],
+    ids=["empty", "bad_magic", "bad_version", "bad_header"],
+)
+def test_invalid_snapshot(tmp_path: Path, content: bytes, error: str) -> None:
+    """Test that malformed snapshot files are rejected."""
+    path = tmp_path / "invalid.snapshot"
+    path.write_bytes(content)
+
+    with pytest.raises(InvalidSnapshotError, match=error):
+        Snapshot(str(path), "test")
+
+
+def test_truncated_sections(path: str) -> None:
+    """Test that snapshots with truncated sections are rejected."""
+    with open(path, "r+b") as file:
+        _, _, header_length = PREAMBLE.unpack(file.read(PREAMBLE.size))
+        file.truncate(PREAMBLE.size + header_length + struct.calcsize("I"))
+
+    with pytest.raises(InvalidSnapshotError, match="Truncated snapshot"):
+        Snapshot(path, "test")
+
+
+def test_missing_file(tmp_path: Path) -> None:
+    """Test that loading a missing snapshot raises `FileNotFoundError`."""
+    with pytest.raises(FileNotFoundError):
+        Snapshot(str(tmp_path / "missing.snapshot"), "test")
@@ -0,0 +1,77 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Unit tests for the string_table.py utility module."""
+
+import json
+from typing import Any
+
+import pytest
+
+from merino.utils.string_table import DecodedTable, StringTable
+
+STRINGS: list[str] = ["firefox", "", "café", "\ud800", "mozilla"]
+
+
+@pytest.fixture(name="table")
+def fixture_table() -> StringTable:
+    """Return a string table with a few strings."""
+    return StringTable(STRINGS)
+
+
+def test_get(table: StringTable) -> None:
+    """Test that strings are read back as stored, including by slices and
+    negative indexes.
+    """
+    assert len(table) == len(STRINGS)
+    assert list(table) == STRINGS
+    assert table[2] == "café"
+    assert table[-1] == "mozilla"
+    assert table[1:3] == ["", "café"]
+    with pytest.raises(IndexError):
+        table[len(STRINGS)]
+
+
+def test_empty_table() -> None:
+    """Test that an empty table behaves like an empty list."""
+    table = StringTable()
+
+    assert len(table) == 0
+    assert list(table) == []
+    assert table[:] == []
+
+
+def test_from_sections(table: StringTable) -> None:
+    """Test that a table backed by read-only memoryviews behaves the same."""
+    restored = StringTable.from_sections(
+        {
+            name: memoryview(buffer).toreadonly()
+            for name, buffer in table.sections().items()
+        }
+    )
+
+    assert list(restored) == STRINGS
+
+
+def test_decoded_table() -> None:
+    """Test that items are decoded upon their first access only, and that encoding
+    a decoded table reuses its strings.
+    """
+    items: list[dict[str, Any]] = [{"id": 1}, {"id": 2}, {"id": 3}]
+    strings = StringTable(json.dumps(item) for item in items)
+    decoded: list[str] = []
+
+    def decode(string: str) -> Any:
+        decoded.append(string)
+        return json.loads(string)
+
+    table = DecodedTable(strings, decode)
+
+    assert table[1] == {"id": 2}
+    assert table[1] is table[1]
+    assert table[-1] == {"id": 3}
+    assert table[:2] == items[:2]
+    assert decoded == ['{"id": 2}', '{"id": 3}', '{"id": 1}']
+    assert DecodedTable.encode(table, json.dumps) is strings
+    assert list(DecodedTable.encode(items, json.dumps)) == list(strings)
@@ -11,7 +11,7 @@ import pytest_asyncio
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
 
-from merino.utils.task_runner import gather
+from merino.utils.task_runner import SingleFlight, gather
 from tests.types import FilterCaplogFixture
 
 # The duration of the slow coroutine (500 ms).
@@ -183,3 +183,120 @@ async def test_gather_tasks_without_timeout_callback(
         records[1].__dict__["msg"]
         == "Cancelling the task: timedout-task due to timeout"
     )
+
+
+@pytest.mark.asyncio
+async def test_gather_tasks_with_per_task_timeouts(mocker: MockerFixture) -> None:
+    """Test that each task is cancelled upon its own timeout and that the results
+    are returned as soon as the remaining tasks finish.
+    """
+    stub = mocker.stub(name="timeout_callback")
+
+    async def sleep(duration: float) -> float:
+        await asyncio.sleep(duration)
+        return duration
+
+    fast_task = asyncio.create_task(sleep(0.01), name="fast-task")
+    slow_task = asyncio.create_task(sleep(SLOW_COROUTINE_DURATION), name="slow-task")
+    tolerant_task = asyncio.create_task(sleep(0.1), name="tolerant-task")
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+
+    done_tasks, timedout_tasks = await gather(
+        [fast_task, slow_task, tolerant_task],
+        timeout=SLOW_COROUTINE_DURATION * 2,
+        timeouts=[0.05, 0.05, SLOW_COROUTINE_DURATION * 2],
+        timeout_cb=stub,
+    )
+
+    # The tolerant task doesn't wait for the slow task, which times out first.
+    assert loop.time() - started_at < SLOW_COROUTINE_DURATION
+    assert set(done_tasks) == {fast_task, tolerant_task}
+    assert timedout_tasks == [slow_task]
+    assert slow_task.cancelled()
+    stub.assert_called_once_with([slow_task])
+
+
+@pytest.mark.asyncio
+async def test_gather_tasks_with_request_budget(mocker: MockerFixture) -> None:
+    """Test that the overall timeout caps the per-task timeouts."""
+    stub = mocker.stub(name="timeout_callback")
+    loop = asyncio.get_running_loop()
+    tasks = [
+        asyncio.create_task(asyncio.sleep(SLOW_COROUTINE_DURATION), name=name)
+        for name in ["task-a", "task-b"]
+    ]
+    started_at = loop.time()
+
+    done_tasks, timedout_tasks = await gather(
+        tasks,
+        timeout=0.05,
+        timeouts=[SLOW_COROUTINE_DURATION * 2, None],
+        timeout_cb=stub,
+    )
+
+    assert loop.time() - started_at < SLOW_COROUTINE_DURATION
+    assert done_tasks == []
+    assert set(timedout_tasks) == set(tasks)
+    stub.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls() -> None:
+    """Test that concurrent calls for the same key share a single call."""
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    calls: list[str] = []
+
+    async def call(key: str) -> int:
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    results = await asyncio.gather(
+        single_flight.do("a", lambda: call("a")),
+        single_flight.do("a", lambda: call("a")),
+        single_flight.do("b", lambda: call("b")),
+    )
+
+    assert results == [2, 2, 2]
+    assert calls == ["a", "b"]
+    assert len(single_flight) == 0
+
+    # A new call is made once the previous one is done.
+    assert await single_flight.do("a", lambda: call("a")) == 3
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_caller() -> None:
+    """Test that a cancelled caller doesn't cancel the call for other callers."""
+    single_flight: SingleFlight[str, bool] = SingleFlight()
+
+    async def call() -> bool:
+        await asyncio.sleep(0.01)
+        return True
+
+    cancelled = asyncio.create_task(single_flight.do("a", call))
+    waiting = asyncio.create_task(single_flight.do("a", call))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await waiting
+    assert cancelled.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_exception() -> None:
+    """Test that the exception of a call is raised to all its callers."""
+    single_flight: SingleFlight[str, None] = SingleFlight()
+
+    async def call() -> None:
+        await asyncio.sleep(0)
+        raise RuntimeError("error")
+
+    results = await asyncio.gather(
+        single_flight.do("a", call),
+        single_flight.do("a", call),
+        return_exceptions=True,
+    )
+
+    assert [str(result) for result in results] == ["error", "error"]